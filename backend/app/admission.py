@@ -0,0 +1,267 @@
+"""Priority admission control for /api requests.
+
+Every API request is put in one of three classes, highest priority first:
+
+- interactive: live draft actions (/api/draft/*, except the Monte Carlo
+  /draft/simulate)
+- read: page loads and other reads
+- batch: upstream syncs (/api/sync/*, ?refresh=true), alliance optimization,
+  weight sweeps, pick simulations and bundle builds
+
+All classes share ADMISSION_MAX_CONCURRENT running slots. Each class also has
+its own cap, and the last ADMISSION_INTERACTIVE_RESERVED slots are kept for
+draft traffic, so syncs and optimizations can never fill the server. When a
+slot frees up, the highest-priority class with waiters gets it. Within a
+class, waiters are served round-robin by client, so one client queueing many
+requests cannot starve the rest. A request is shed with 503 and Retry-After
+if its class queue is full or it waited longer than the class allows.
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from urllib.parse import parse_qs
+
+from app.config import settings
+from app.metrics import admission_active, admission_queued, admission_requests, admission_wait
+
+INTERACTIVE = "interactive"
+READ = "read"
+BATCH = "batch"
+PRIORITY = (INTERACTIVE, READ, BATCH)
+
+_BATCH_POSTS = (
+    "/api/predict/",
+    "/api/bundles/",
+    "/api/draft/simulate",
+)
+_TRUE = ("1", "true", "yes", "on")
+
+
+def classify(method: str, path: str, query_string: bytes = b"") -> str | None:
+    """Priority class of a request, None for paths outside /api."""
+    if not path.startswith("/api/"):
+        return None
+    if path.startswith("/api/sync/"):
+        return BATCH
+    if method == "POST" and path.startswith(_BATCH_POSTS):
+        return BATCH
+    if path.startswith("/api/draft/"):
+        return INTERACTIVE
+    if b"refresh" in query_string:
+        refresh = parse_qs(query_string.decode("latin-1")).get("refresh", [""])[-1]
+        if refresh.lower() in _TRUE:
+            return BATCH
+    return READ
+
+
+@dataclass
+class ClassBudget:
+    limit: int  # max requests of the class running at once
+    max_queue: int  # waiters beyond this are shed on arrival
+    max_wait: float  # seconds a waiter may queue before it is shed
+
+
+class Shed(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _ClassState:
+    def __init__(self, budget: ClassBudget):
+        self.budget = budget
+        self.active = 0
+        self.queued = 0
+        # client -> its waiters; rotated so clients take turns
+        self.waiting: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+
+    def pop(self) -> asyncio.Future:
+        client, waiters = next(iter(self.waiting.items()))
+        fut = waiters.popleft()
+        if waiters:
+            self.waiting.move_to_end(client)
+        else:
+            del self.waiting[client]
+        self.queued -= 1
+        return fut
+
+    def discard(self, client: str, fut: asyncio.Future):
+        waiters = self.waiting.get(client)
+        if waiters is None or fut not in waiters:
+            return
+        waiters.remove(fut)
+        if not waiters:
+            del self.waiting[client]
+        self.queued -= 1
+
+
+class Scheduler:
+    """Shared concurrency budget with per-class caps, priorities and queues.
+
+    Runs on the event loop only, so no locking is needed.
+    """
+
+    def __init__(self, total: int, reserved: int, budgets: dict[str, ClassBudget]):
+        self.total = total
+        self.reserved = reserved
+        self.active = 0
+        self._classes = {name: _ClassState(budgets[name]) for name in PRIORITY}
+
+    def _can_run(self, name: str) -> bool:
+        state = self._classes[name]
+        if state.active >= state.budget.limit or self.active >= self.total:
+            return False
+        if name == INTERACTIVE:
+            return True
+        # Draft requests run in the reserved slots first, so only the other
+        # classes count against the rest
+        others = self.active - self._classes[INTERACTIVE].active
+        return others < self.total - self.reserved
+
+    def _waiting_ahead(self, name: str) -> bool:
+        for other in PRIORITY:
+            if self._classes[other].queued:
+                return True
+            if other == name:
+                return False
+        return False
+
+    def _grant(self, name: str):
+        self.active += 1
+        self._classes[name].active += 1
+
+    def _publish(self, name: str):
+        state = self._classes[name]
+        admission_active.set(state.active, priority=name)
+        admission_queued.set(state.queued, priority=name)
+
+    def _dispatch(self):
+        for name in PRIORITY:
+            state = self._classes[name]
+            while state.queued and self._can_run(name):
+                fut = state.pop()
+                if fut.done():  # waiter gave up
+                    continue
+                self._grant(name)
+                fut.set_result(None)
+            self._publish(name)
+
+    async def acquire(self, name: str, client: str) -> float:
+        """Wait for a slot in the class; returns seconds spent queued."""
+        state = self._classes[name]
+        if self._can_run(name) and not self._waiting_ahead(name):
+            self._grant(name)
+            self._publish(name)
+            return 0.0
+        if state.queued >= state.budget.max_queue:
+            raise Shed("queue_full", retry_after=max(1, round(state.budget.max_wait / 2)))
+
+        fut = asyncio.get_running_loop().create_future()
+        state.waiting.setdefault(client, deque()).append(fut)
+        state.queued += 1
+        self._publish(name)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), state.budget.max_wait)
+        except asyncio.TimeoutError:
+            if fut.done() and not fut.cancelled():
+                return time.perf_counter() - start
+            fut.cancel()
+            state.discard(client, fut)
+            self._publish(name)
+            raise Shed("timeout", retry_after=max(1, round(state.budget.max_wait)))
+        except asyncio.CancelledError:
+            # Client went away; hand back a slot granted in the meantime
+            if fut.done() and not fut.cancelled():
+                self.release(name)
+            else:
+                fut.cancel()
+                state.discard(client, fut)
+                self._publish(name)
+            raise
+        return time.perf_counter() - start
+
+    def release(self, name: str):
+        self.active -= 1
+        self._classes[name].active -= 1
+        self._dispatch()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {
+            name: {"active": state.active, "queued": state.queued}
+            for name, state in self._classes.items()
+        }
+
+
+def default_scheduler() -> Scheduler | None:
+    total = settings.ADMISSION_MAX_CONCURRENT
+    if total <= 0:
+        return None
+    return Scheduler(
+        total=total,
+        reserved=min(settings.ADMISSION_INTERACTIVE_RESERVED, total - 1),
+        budgets={
+            INTERACTIVE: ClassBudget(limit=total, max_queue=1000, max_wait=60.0),
+            READ: ClassBudget(
+                limit=settings.ADMISSION_READ_LIMIT,
+                max_queue=settings.ADMISSION_READ_QUEUE,
+                max_wait=settings.ADMISSION_READ_MAX_WAIT,
+            ),
+            BATCH: ClassBudget(
+                limit=settings.ADMISSION_BATCH_LIMIT,
+                max_queue=settings.ADMISSION_BATCH_QUEUE,
+                max_wait=settings.ADMISSION_BATCH_MAX_WAIT,
+            ),
+        },
+    )
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware holding a scheduler slot for each /api request.
+
+    The slot is held until the response has been fully sent, including
+    streamed bodies.
+    """
+
+    def __init__(self, app, scheduler: Scheduler | None = None):
+        self.app = app
+        self.scheduler = scheduler or default_scheduler()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.scheduler is None:
+            return await self.app(scope, receive, send)
+        name = classify(scope["method"], scope["path"], scope.get("query_string", b""))
+        if name is None or scope["method"] == "OPTIONS":
+            return await self.app(scope, receive, send)
+
+        client = (scope.get("client") or ("unknown",))[0]
+        try:
+            waited = await self.scheduler.acquire(name, client)
+        except Shed as e:
+            admission_requests.inc(priority=name, result=f"shed_{e.reason}")
+            return await self._shed(send, e)
+        admission_requests.inc(priority=name, result="admitted")
+        admission_wait.observe(waited, priority=name)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.scheduler.release(name)
+
+    @staticmethod
+    async def _shed(send, e: Shed):
+        body = json.dumps({"detail": f"Server busy ({e.reason}), retry later"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(e.retry_after).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
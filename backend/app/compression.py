@@ -0,0 +1,127 @@
+"""Per-request gzip/brotli response compression.
+
+Brotli is used when the client accepts it and the optional ``brotli``
+package is installed, otherwise gzip. Bodies are compressed as they stream
+(each chunk is flushed), so NDJSON and other streamed responses still
+arrive incrementally. Responses that already carry a Content-Encoding, such
+as precompressed cached bytes, pass through untouched.
+"""
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+MIN_SIZE = 500
+COMPRESSIBLE = (b"application/json", b"application/x-ndjson", b"text/")
+
+
+def _accepted(accept_encoding: str) -> dict[str, float]:
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip()] = q
+    return accepted
+
+
+def accepts(accept_encoding: str, coding: str) -> bool:
+    accepted = _accepted(accept_encoding)
+    return accepted.get(coding, accepted.get("*", 0.0)) > 0
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """Best supported coding from an Accept-Encoding header, honouring q=0."""
+    for coding in (("br", "gzip") if brotli else ("gzip",)):
+        if accepts(accept_encoding, coding):
+            return coding
+    return None
+
+
+class _Compressor:
+    def __init__(self, coding: str):
+        self.coding = coding
+        if coding == "br":
+            self._br = brotli.Compressor(quality=5)
+        else:
+            self._gz = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.coding == "br":
+            out = self._br.process(data) if data else b""
+            return out + (self._br.finish() if final else self._br.flush())
+        out = self._gz.compress(data)
+        return out + self._gz.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def compress(data: bytes, coding: str) -> bytes:
+    return _Compressor(coding).compress(data, final=True)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, min_size: int = MIN_SIZE):
+        self.app = app
+        self.min_size = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = dict(scope["headers"])
+        coding = negotiate(headers.get(b"accept-encoding", b"").decode())
+        if coding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+        compressor: _Compressor | None = None
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                return await send(message)
+
+            if start_message is not None:
+                # First body chunk: decide now, while headers can still change
+                start, start_message = start_message, None
+                response_headers = dict(start["headers"])
+                more = message.get("more_body", False)
+                body = message.get("body", b"")
+                length = response_headers.get(b"content-length")
+                skip = (
+                    b"content-encoding" in response_headers
+                    or not response_headers.get(b"content-type", b"").startswith(COMPRESSIBLE)
+                    or (not more and len(body) < self.min_size)
+                    or (length is not None and int(length) < self.min_size)
+                )
+                if not skip:
+                    compressor = _Compressor(coding)
+                    start["headers"] = [
+                        (k, v) for k, v in start["headers"] if k != b"content-length"
+                    ] + [(b"content-encoding", coding.encode()), (b"vary", b"Accept-Encoding")]
+                    if not more:
+                        data = compressor.compress(body, final=True)
+                        start["headers"].append((b"content-length", str(len(data)).encode()))
+                        await send(start)
+                        return await send({"type": "http.response.body", "body": data})
+                await send(start)
+
+            if compressor is None:
+                return await send(message)
+            more = message.get("more_body", False)
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": compressor.compress(message.get("body", b""), final=not more),
+                    "more_body": more,
+                }
+            )
+
+        await self.app(scope, receive, send_wrapper)
@@ -4,9 +4,36 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     TBA_API_KEY: str = ""
     DATABASE_URL: str = "sqlite:///./data/scout.db"
+    # Connection pool (ignored for SQLite)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_NOTIFY_CHANNEL: str = "scout_data_version"
     TBA_BASE_URL: str = "https://www.thebluealliance.com/api/v3"
     STATBOTICS_BASE_URL: str = "https://api.statbotics.io/v3"
     CACHE_TTL_SECONDS: int = 3600
+    UPSTREAM_ARCHIVE_DIR: str = ""
+    UPSTREAM_ARCHIVE_MAX_BYTES: int = 512 * 1024 * 1024
+    UPSTREAM_OFFLINE: bool = False
+    UPSTREAM_RECORD_DIR: str = ""
+    TBA_WEBHOOK_SECRET: str = ""
+    TBA_WEBHOOK_RECORD_PATH: str = ""
+    RESULT_CACHE_MAX_ENTRIES: int = 512
+    RESULT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    TRACE_JSONL_PATH: str = ""
+    TRACE_OTLP_ENDPOINT: str = ""
+    TRACE_SAMPLE_RATE: float = 1.0
+    ADMIN_TOKEN: str = ""
+    # Admission control (see app.admission); 0 disables it
+    ADMISSION_MAX_CONCURRENT: int = 32
+    ADMISSION_INTERACTIVE_RESERVED: int = 4
+    ADMISSION_READ_LIMIT: int = 24
+    ADMISSION_READ_QUEUE: int = 200
+    ADMISSION_READ_MAX_WAIT: float = 10.0
+    ADMISSION_BATCH_LIMIT: int = 2
+    ADMISSION_BATCH_QUEUE: int = 8
+    ADMISSION_BATCH_MAX_WAIT: float = 30.0
 
     model_config = {"env_file": ".env"}
 
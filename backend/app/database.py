@@ -1,12 +1,32 @@
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.config import settings
+from app import metrics, tracing
+
+
+def _engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        # Drop connections the server or a proxy may have closed while idle
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": True,
+    }
+    if url.startswith("postgresql"):
+        # DateTime columns hold naive UTC, as they do on SQLite
+        options["connect_args"] = {"options": "-c timezone=utc"}
+    return options
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
+metrics.instrument_engine(engine)
+tracing.instrument_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -21,3 +41,50 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Arbitrary app-wide key for pg_advisory_lock
+SCHEMA_LOCK_KEY = 0x5C0A7
+
+
+@contextmanager
+def schema_lock():
+    """Serialize schema changes and one-off migrations across app nodes.
+
+    Holds a Postgres session advisory lock; a no-op on SQLite, where only
+    one node runs.
+    """
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEMA_LOCK_KEY})
+            conn.commit()
+
+
+def sync_schema():
+    """Create missing tables, columns and indexes on an existing database.
+
+    create_all never alters existing tables, so new nullable columns are
+    added with ALTER TABLE ... ADD COLUMN and new indexes created one by one.
+    """
+    with schema_lock():
+        Base.metadata.create_all(bind=engine)
+        inspector = inspect(engine)
+        with engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                existing = {c["name"] for c in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in existing:
+                        continue
+                    col_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(
+                        text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}")
+                    )
+                for index in table.indexes:
+                    index.create(bind=conn, checkfirst=True)
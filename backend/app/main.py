@@ -1,47 +1,128 @@
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.orm import Session
 
-from app.database import Base, SessionLocal, engine
-from app.models import CacheMeta, TeamEvent
-from app.routers import complement, draft, events, matches, predictions
+from app.admission import AdmissionMiddleware
+from app.compression import CompressionMiddleware
+from app.database import SessionLocal, schema_lock, sync_schema
+from app.metrics import MetricsMiddleware
+from app.tracing import TracingMiddleware
+from app.models import CacheMeta, Match, SchemaMigration, TeamEvent
+from app.services.invalidation import start_listener
+from app.services.result_cache import bump_data_version
+from app.services.sync_service import SyncService
+from app.services.team_search import team_index
+from app.routers import (
+    bundles,
+    complement,
+    draft,
+    events,
+    history,
+    matches,
+    metrics,
+    predictions,
+    search,
+    sync,
+    webhooks,
+)
+
+
+RESET_TEAM_EVENTS = "reset_team_events_for_epa"
+
+
+def _reset_team_events(db: Session) -> list[str]:
+    """Clear team_events synced before EPA columns existed so they re-fetch.
+
+    Returns the affected event keys.
+    """
+    stale = (
+        db.query(CacheMeta)
+        .filter(CacheMeta.cache_key.like("team_events_%"))
+        .all()
+    )
+    if not stale:
+        return []
+    for entry in stale:
+        db.delete(entry)
+    # The EPA markers would otherwise vouch for the rows deleted below
+    db.query(CacheMeta).filter(
+        CacheMeta.cache_key.like("team_event_epa_%")
+    ).delete(synchronize_session=False)
+    team_events = db.query(TeamEvent).all()
+    # Search rebuilds attendance from team_attendance, so keep it
+    SyncService(db).record_attendance(
+        [
+            {
+                "team_key": te.team_key,
+                "event_key": te.event_key,
+                "team_number": te.team_number,
+                "nickname": te.nickname,
+            }
+            for te in team_events
+        ]
+    )
+    # Also clear the team_event rows so they get re-populated
+    db.query(TeamEvent).delete()
+    # Match stats live on TeamEvent, so they must be re-applied too
+    db.query(Match).update({Match.stats_applied: False})
+    return sorted({te.event_key for te in team_events})
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
-    # One-time: clear stale team_events cache so EPA data re-fetches
+    sync_schema()
+    # Started first so the migration's bumps reach the other nodes
+    listener = start_listener()
     db = SessionLocal()
     try:
-        stale = (
-            db.query(CacheMeta)
-            .filter(CacheMeta.cache_key.like("team_events_%"))
-            .all()
-        )
-        if stale:
-            for entry in stale:
-                db.delete(entry)
-            # Also clear the team_event rows so they get re-populated
-            db.query(TeamEvent).delete()
-            db.commit()
+        # Once per database, not per boot: with a shared Postgres every node
+        # restart would otherwise wipe the rows the other nodes are serving
+        with schema_lock():
+            if db.get(SchemaMigration, RESET_TEAM_EVENTS) is None:
+                wiped = _reset_team_events(db)
+                db.add(
+                    SchemaMigration(
+                        name=RESET_TEAM_EVENTS, applied_at=datetime.now(timezone.utc)
+                    )
+                )
+                db.commit()
+                for event_key in wiped:
+                    bump_data_version(event_key)
+        team_index.rebuild(db)
     finally:
         db.close()
     yield
+    if listener is not None:
+        listener.stop()
 
 
 app = FastAPI(title="FRC Alliance Scout", version="1.0.0", lifespan=lifespan)
 
+# Innermost, so shed 503s still get CORS headers
+app.add_middleware(AdmissionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 
 app.include_router(events.router, prefix="/api")
+app.include_router(history.router, prefix="/api")
+app.include_router(search.router, prefix="/api")
 app.include_router(predictions.router, prefix="/api")
 app.include_router(draft.router, prefix="/api")
 app.include_router(complement.router, prefix="/api")
 app.include_router(matches.router, prefix="/api")
+app.include_router(webhooks.router, prefix="/api")
+app.include_router(sync.router, prefix="/api")
+app.include_router(bundles.router, prefix="/api")
+app.include_router(metrics.router)
@@ -0,0 +1,321 @@
+"""In-process metrics registry rendered in the Prometheus text format.
+
+Counters and histograms keep one small float array per label set behind a
+lock, so recording costs a dict lookup and a few additions. GET /metrics
+renders everything registered here.
+"""
+import bisect
+import functools
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+
+from app.tracing import span
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str] | None) -> tuple[str, ...]:
+        labels = labels or {}
+        return tuple(str(labels.get(n, "")) for n in self.labels)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> Iterator[str]:
+        yield from super().render()
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_label_str(self.labels, key)} {value:g}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts + [+Inf, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            counts[idx] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        counts = self._values.get(self._key(labels))
+        return int(sum(counts[:-1])) if counts else 0
+
+    def render(self) -> Iterator[str]:
+        yield from super().render()
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        for key, counts in items:
+            cumulative = 0.0
+            bounds = [f"{b:g}" for b in self.buckets] + ["+Inf"]
+            for bound, n in zip(bounds, counts):
+                cumulative += n
+                le = _label_str(self.labels, key, f'le="{bound}"')
+                yield f"{self.name}_bucket{le} {cumulative:g}"
+            yield f"{self.name}_sum{_label_str(self.labels, key)} {counts[-1]:g}"
+            yield f"{self.name}_count{_label_str(self.labels, key)} {cumulative:g}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "scout_http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+)
+http_duration = registry.histogram(
+    "scout_http_request_duration_seconds", "HTTP request latency", ("method", "route")
+)
+http_db_queries = registry.histogram(
+    "scout_http_db_queries",
+    "SQL statements executed per HTTP request",
+    ("method", "route"),
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+db_queries = registry.counter("scout_db_queries_total", "SQL statements executed")
+upstream_requests = registry.counter(
+    "scout_upstream_requests_total",
+    "Upstream API requests by endpoint and status",
+    ("service", "endpoint", "status"),
+)
+upstream_duration = registry.histogram(
+    "scout_upstream_request_duration_seconds",
+    "Upstream API latency, including streaming the body",
+    ("service", "endpoint"),
+)
+cache_lookups = registry.counter(
+    "scout_cache_lookups_total",
+    "Sync cache freshness checks by key family (hit, miss, stale)",
+    ("family", "result"),
+)
+result_cache_lookups = registry.counter(
+    "scout_result_cache_lookups_total",
+    "Computed-result cache lookups by key family (hit, miss)",
+    ("family", "result"),
+)
+solver_duration = registry.histogram(
+    "scout_solver_duration_seconds", "Time spent in scoring/optimization code", ("solver",)
+)
+solver_iterations = registry.counter(
+    "scout_solver_iterations_total",
+    "Solver work units (swap attempts, candidates scored, simulations)",
+    ("solver",),
+)
+data_version_notifications = registry.counter(
+    "scout_data_version_notifications_total",
+    "Cross-node data version notifications (sent, received)",
+    ("direction",),
+)
+admission_requests = registry.counter(
+    "scout_admission_requests_total",
+    "Admission decisions by priority class (admitted, shed_queue_full, shed_timeout)",
+    ("priority", "result"),
+)
+admission_wait = registry.histogram(
+    "scout_admission_wait_seconds", "Time requests spent queued for admission", ("priority",)
+)
+admission_active = registry.gauge(
+    "scout_admission_active", "Requests currently running by priority class", ("priority",)
+)
+admission_queued = registry.gauge(
+    "scout_admission_queued", "Requests waiting for admission by priority class", ("priority",)
+)
+
+
+def timed(solver: str):
+    """Decorator recording a function's wall time under solver_duration.
+
+    The call is also traced as a "solver <name>" span.
+    """
+
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                with span(f"solver {solver}"):
+                    return fn(*args, **kwargs)
+            finally:
+                solver_duration.observe(time.perf_counter() - start, solver=solver)
+
+        return wrapper
+
+    return decorate
+
+
+_NUMERIC = re.compile(r"\d")
+
+
+def key_family(key: str) -> str:
+    """Strip the per-entity suffix: team_matches_frc254_2024 -> team_matches."""
+    parts = []
+    for part in key.split("_"):
+        if _NUMERIC.search(part):
+            break
+        parts.append(part)
+    return "_".join(parts) or key
+
+
+def endpoint_template(path: str) -> str:
+    """Collapse ids in an upstream path: /event/2024casj/teams -> /event/{}/teams."""
+    return "/".join("{}" if _NUMERIC.search(p) else p for p in path.split("/"))
+
+
+# SQL statement count for the request being handled
+_query_count: ContextVar[list[int] | None] = ContextVar("query_count", default=None)
+
+
+def instrument_engine(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        db_queries.inc()
+        counter = _query_count.get()
+        if counter is not None:
+            counter[0] += 1
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency, status and query count.
+
+    Routes are labelled by their template (/api/events/{event_key}/teams) so
+    label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+        counter = [0]
+        token = _query_count.set(counter)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _query_count.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_requests.inc(method=method, route=path, status=str(status))
+            http_duration.observe(elapsed, method=method, route=path)
+            http_db_queries.observe(counter[0], method=method, route=path)
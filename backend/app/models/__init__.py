@@ -1,6 +1,22 @@
 from app.models.event import Event
-from app.models.team import Team
+from app.models.team import Team, TeamAttendance
 from app.models.team_event import TeamEvent
-from app.models.cache_meta import CacheMeta
+from app.models.cache_meta import CacheMeta, SchemaMigration
+from app.models.match import Match, TeamMatch, TeamVideoSummary
+from app.models.bundle import EventBundle, EventBundleDiff
+from app.models.epa_history import EpaHistory
 
-__all__ = ["Event", "Team", "TeamEvent", "CacheMeta"]
+__all__ = [
+    "Event",
+    "Team",
+    "TeamAttendance",
+    "TeamEvent",
+    "CacheMeta",
+    "SchemaMigration",
+    "Match",
+    "TeamMatch",
+    "TeamVideoSummary",
+    "EventBundle",
+    "EventBundleDiff",
+    "EpaHistory",
+]
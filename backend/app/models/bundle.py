@@ -0,0 +1,26 @@
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+
+from app.database import Base
+
+
+class EventBundle(Base):
+    """A versioned, gzipped JSON snapshot of everything a pit tablet needs."""
+
+    __tablename__ = "event_bundles"
+
+    event_key = Column(String, primary_key=True)
+    version = Column(Integer, primary_key=True)
+    content_hash = Column(String, nullable=False)
+    created_at = Column(DateTime)
+    data = Column(LargeBinary, nullable=False)
+
+
+class EventBundleDiff(Base):
+    """Gzipped JSON diff from an older bundle version to the latest one."""
+
+    __tablename__ = "event_bundle_diffs"
+
+    event_key = Column(String, primary_key=True)
+    from_version = Column(Integer, primary_key=True)
+    to_version = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
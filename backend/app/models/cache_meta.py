@@ -9,3 +9,12 @@ class CacheMeta(Base):
     cache_key = Column(String, primary_key=True)
     last_fetched = Column(DateTime)
     ttl_seconds = Column(Integer, default=3600)
+
+
+class SchemaMigration(Base):
+    """One-off data migrations already applied to this database."""
+
+    __tablename__ = "schema_migrations"
+
+    name = Column(String, primary_key=True)
+    applied_at = Column(DateTime)
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Float, Index, Integer, String
+
+from app.database import Base
+
+
+class EpaHistory(Base):
+    """Append-only EPA change log for a team at an event.
+
+    Each row holds only the columns that changed since the team's previous
+    row (flagged in the changed bitmask over EPA_COLUMNS); the first row for
+    a team/event holds them all.
+    """
+
+    __tablename__ = "epa_history"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_key = Column(String, nullable=False)
+    team_key = Column(String, nullable=False)
+    ts = Column(Integer, nullable=False)  # epoch seconds
+    changed = Column(Integer, nullable=False)
+    epa = Column(Float, nullable=True)
+    auto_epa = Column(Float, nullable=True)
+    teleop_epa = Column(Float, nullable=True)
+    endgame_epa = Column(Float, nullable=True)
+    rp_1_epa = Column(Float, nullable=True)
+    rp_2_epa = Column(Float, nullable=True)
+
+    __table_args__ = (
+        Index("ix_epa_history_event_team_ts", "event_key", "team_key", "ts"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String
 
 from app.database import Base
 
@@ -16,3 +16,11 @@ class Event(Base):
     start_date = Column(String)
     end_date = Column(String)
     week = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        # Keyset pagination order for GET /api/events
+        Index("ix_events_year_start_key", "year", "start_date", "key"),
+        Index("ix_events_year_week", "year", "week"),
+        Index("ix_events_year_state", "year", "state_prov"),
+        Index("ix_events_year_type", "year", "event_type"),
+    )
@@ -0,0 +1,61 @@
+from sqlalchemy import Boolean, Column, Index, Integer, String, UniqueConstraint
+
+from app.database import Base
+
+
+class Match(Base):
+    __tablename__ = "matches"
+
+    key = Column(String, primary_key=True)
+    event_key = Column(String, index=True)
+    year = Column(Integer, index=True)
+    comp_level = Column(String)
+    set_number = Column(Integer, default=1)
+    match_number = Column(Integer)
+    time = Column(Integer, nullable=True)
+
+    # Comma-separated team keys
+    red_teams = Column(String)
+    blue_teams = Column(String)
+    red_score = Column(Integer, nullable=True)
+    blue_score = Column(Integer, nullable=True)
+
+    youtube_key = Column(String, nullable=True)
+
+    # Whether this match has been folded into TeamEvent contribution stats
+    stats_applied = Column(Boolean, default=False)
+
+
+class TeamMatch(Base):
+    """One row per (team, match), denormalized for per-team lookups."""
+
+    __tablename__ = "team_matches"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    team_key = Column(String, nullable=False)
+    year = Column(Integer, nullable=False)
+    match_key = Column(String, nullable=False)
+    event_key = Column(String, index=True)
+    comp_level = Column(String)
+    match_number = Column(Integer)
+    alliance_color = Column(String)
+    alliance_score = Column(Integer, nullable=True)
+    opponent_score = Column(Integer, nullable=True)
+    youtube_key = Column(String, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("team_key", "match_key", name="uq_team_match"),
+        Index("ix_team_matches_team_year", "team_key", "year"),
+    )
+
+
+class TeamVideoSummary(Base):
+    """Best and worst scored video match per team and year, kept at ingest."""
+
+    __tablename__ = "team_video_summaries"
+
+    team_key = Column(String, primary_key=True)
+    year = Column(Integer, primary_key=True)
+    video_count = Column(Integer, default=0)
+    best_match_id = Column(Integer, nullable=True)
+    worst_match_id = Column(Integer, nullable=True)
@@ -14,3 +14,14 @@ class Team(Base):
     state_prov = Column(String, nullable=True)
     country = Column(String, nullable=True)
     rookie_year = Column(Integer, nullable=True)
+
+
+class TeamAttendance(Base):
+    """Which events a team is registered for; survives TeamEvent resets."""
+
+    __tablename__ = "team_attendance"
+
+    team_key = Column(String, primary_key=True)
+    event_key = Column(String, primary_key=True, index=True)
+    team_number = Column(Integer)
+    nickname = Column(String, nullable=True)
@@ -25,6 +25,12 @@ class TeamEvent(Base):
     rp_1_epa = Column(Float, nullable=True)
     rp_2_epa = Column(Float, nullable=True)
 
+    # Per-match alliance contribution (running Welford stats over matches)
+    match_count = Column(Integer, default=0)
+    contribution_mean = Column(Float, nullable=True)
+    contribution_m2 = Column(Float, nullable=True)
+    consistency = Column(Float, nullable=True)
+
     # Team info (denormalized for convenience)
     nickname = Column(String, nullable=True)
 
@@ -0,0 +1,113 @@
+"""Sampling profiler for single-request profiling (see TracingMiddleware).
+
+A daemon thread snapshots every other thread's stack with
+sys._current_frames() at a fixed interval. Threads parked in the event
+loop's selector or a pool's queue are skipped, so samples reflect work
+being done. Concurrent requests share the process, so profile on a quiet
+instance for a clean report.
+"""
+import sys
+import threading
+import time
+from collections import Counter
+
+# Frames that mean "waiting", not working
+_IDLE = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+MAX_DEPTH = 64
+
+# The switch interval is process-global: lowered while any profiler runs and
+# restored when the last one stops
+_switch_lock = threading.Lock()
+_switch_users = 0
+_saved_switch_interval = sys.getswitchinterval()
+
+
+def _lower_switch_interval(interval: float):
+    global _switch_users, _saved_switch_interval
+    with _switch_lock:
+        if _switch_users == 0:
+            _saved_switch_interval = sys.getswitchinterval()
+        _switch_users += 1
+        sys.setswitchinterval(min(sys.getswitchinterval(), interval))
+
+
+def _restore_switch_interval():
+    global _switch_users
+    with _switch_lock:
+        _switch_users -= 1
+        if _switch_users == 0:
+            sys.setswitchinterval(_saved_switch_interval)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename.rsplit("/", 1)[-1]
+    return f"{code.co_name} ({filename}:{frame.f_lineno})"
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+        self._elapsed = 0.0
+
+    def start(self):
+        # The sampler needs the GIL; the default 5ms switch interval would
+        # cap it far below the sampling rate while Python code is running.
+        _lower_switch_interval(self.interval / 2)
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            _restore_switch_interval()
+        self._elapsed = time.perf_counter() - self._started
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                code = frame.f_code
+                if (code.co_filename.rsplit("/", 1)[-1], code.co_name) in _IDLE:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_DEPTH:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.stacks[tuple(reversed(stack))] += 1
+                self.samples += 1
+
+    def report(self, top: int = 30) -> dict:
+        """Hottest functions by self and total samples, plus folded stacks."""
+        own: Counter[str] = Counter()
+        total: Counter[str] = Counter()
+        for stack, n in self.stacks.items():
+            own[stack[-1]] += n
+            for label in set(stack):
+                total[label] += n
+        return {
+            "interval_ms": self.interval * 1000,
+            "elapsed_ms": round(self._elapsed * 1000, 3),
+            "samples": self.samples,
+            "self": [{"function": f, "samples": n} for f, n in own.most_common(top)],
+            "total": [{"function": f, "samples": n} for f, n in total.most_common(top)],
+            # Flamegraph-ready "a;b;c count" lines
+            "folded": [
+                f"{';'.join(stack)} {n}" for stack, n in self.stacks.most_common(top * 5)
+            ],
+        }
@@ -0,0 +1,63 @@
+import gzip
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from app.compression import accepts
+from app.database import get_db
+from app.models import EventBundleDiff
+from app.services.bundles import build_bundle, latest_bundle
+from app.tracing import TracedRoute
+
+router = APIRouter(route_class=TracedRoute)
+
+
+@router.post("/bundles/{event_key}")
+async def export_bundle(event_key: str, db: Session = Depends(get_db)):
+    """Build the event's offline bundle; a new version only if data changed."""
+    try:
+        bundle, created = await build_bundle(db, event_key)
+    except LookupError as e:
+        raise HTTPException(404, str(e))
+    return {
+        "event_key": event_key,
+        "version": bundle.version,
+        "created": created,
+        "bytes": len(bundle.data),
+    }
+
+
+@router.get("/bundles/{event_key}")
+async def download_bundle(
+    event_key: str,
+    request: Request,
+    since: int | None = None,
+    db: Session = Depends(get_db),
+):
+    """Latest offline bundle, or with since=N a diff from version N.
+
+    Falls back to the full bundle when no diff from N is kept; the body's
+    "kind" says which. 304 when since is already the latest version.
+    """
+    bundle = latest_bundle(db, event_key)
+    if bundle is None:
+        raise HTTPException(404, f"No bundle built for event {event_key}")
+
+    etag = f'"bundle-{event_key}-{bundle.version}"'
+    headers = {"ETag": etag, "X-Bundle-Version": str(bundle.version)}
+    if since == bundle.version or request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    data = bundle.data
+    if since is not None:
+        patch = db.get(EventBundleDiff, (event_key, since))
+        if patch is not None and patch.to_version == bundle.version:
+            data = patch.data
+            headers["ETag"] = f'"bundle-{event_key}-{since}-{bundle.version}"'
+
+    # Stored gzipped; only clients that can't take gzip cost a decompress
+    if not accepts(request.headers.get("accept-encoding", ""), "gzip"):
+        return Response(gzip.decompress(data), media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = "gzip"
+    headers["Vary"] = "Accept-Encoding"
+    return Response(data, media_type="application/json", headers=headers)
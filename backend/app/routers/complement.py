@@ -1,31 +1,62 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.team_event import TeamEvent
 from app.schemas.prediction import ComplementResponse
+from app.services.cached_response import cached_json
 from app.services.complement_finder import ComplementFinder
+from app.tracing import TracedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
+
+
+@router.get("/complement/{event_key}", response_model=list[ComplementResponse])
+async def find_all_complements(
+    event_key: str,
+    request: Request,
+    top_n: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    def build():
+        team_events = (
+            db.query(TeamEvent)
+            .filter(TeamEvent.event_key == event_key)
+            .all()
+        )
+        if not team_events:
+            raise HTTPException(404, f"No teams found for event {event_key}")
+
+        finder = ComplementFinder()
+        return finder.find_all_complements(team_events, top_n)
+
+    return await cached_json(
+        request, event_key, ("complements", top_n), build, list[ComplementResponse]
+    )
 
 
 @router.get(
     "/complement/{event_key}/{team_key}", response_model=ComplementResponse
 )
 async def find_complements(
-    event_key: str, team_key: str, db: Session = Depends(get_db)
+    event_key: str, team_key: str, request: Request, db: Session = Depends(get_db)
 ):
-    team_events = (
-        db.query(TeamEvent)
-        .filter(TeamEvent.event_key == event_key)
-        .all()
-    )
+    def build():
+        team_events = (
+            db.query(TeamEvent)
+            .filter(TeamEvent.event_key == event_key)
+            .all()
+        )
 
-    target = next(
-        (te for te in team_events if te.team_key == team_key), None
-    )
-    if not target:
-        raise HTTPException(404, f"Team {team_key} not found at event {event_key}")
+        target = next(
+            (te for te in team_events if te.team_key == team_key), None
+        )
+        if not target:
+            raise HTTPException(404, f"Team {team_key} not found at event {event_key}")
 
-    finder = ComplementFinder()
-    return finder.find_complements(target, team_events)
+        finder = ComplementFinder()
+        return finder.find_complements(target, team_events)
+
+    return await cached_json(
+        request, event_key, ("complement", team_key), build, ComplementResponse
+    )
@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
@@ -8,10 +10,15 @@ from app.schemas.prediction import (
     DraftPickRequest,
     DraftStartRequest,
     DraftStateResponse,
+    PickSimulationRequest,
+    PickSimulationResponse,
+    PickSlotProbabilities,
 )
-from app.services.draft_simulator import create_session, get_session
+from app.services.draft_simulator import create_session, fork_session, get_session
+from app.services.pick_simulator import simulate_picks
+from app.tracing import TracedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 
 
 @router.post("/draft/start", response_model=DraftStateResponse)
@@ -65,6 +72,84 @@ async def auto_complete(req: DraftAutoPickRequest):
     return session.to_response()
 
 
+@router.post("/draft/fork", response_model=DraftStateResponse)
+async def fork_draft(req: DraftAutoPickRequest):
+    session = get_session(req.session_id)
+    if not session:
+        raise HTTPException(404, "Draft session not found")
+    return fork_session(session).to_response()
+
+
+@router.post("/draft/undo", response_model=DraftStateResponse)
+async def undo_pick(req: DraftAutoPickRequest):
+    session = get_session(req.session_id)
+    if not session:
+        raise HTTPException(404, "Draft session not found")
+    try:
+        session.undo()
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    return session.to_response()
+
+
+@router.post("/draft/redo", response_model=DraftStateResponse)
+async def redo_pick(req: DraftAutoPickRequest):
+    session = get_session(req.session_id)
+    if not session:
+        raise HTTPException(404, "Draft session not found")
+    try:
+        session.redo()
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    return session.to_response()
+
+
+@router.post("/draft/simulate", response_model=PickSimulationResponse)
+async def simulate_draft(req: PickSimulationRequest, db: Session = Depends(get_db)):
+    team_events = (
+        db.query(TeamEvent)
+        .filter(TeamEvent.event_key == req.event_key)
+        .all()
+    )
+    if len(team_events) < 8:
+        raise HTTPException(400, "Not enough teams for a draft")
+
+    result = await asyncio.to_thread(
+        simulate_picks,
+        team_events,
+        num_simulations=req.num_simulations,
+        num_rounds=req.num_rounds,
+        weights=req.weights,
+        temperature=req.temperature,
+        decline_rates=req.decline_rates,
+        seed=req.seed,
+    )
+
+    # Captains are never available, so only report the pick pool.
+    num_alliances = len(result.slots) // req.num_rounds
+    pool = list(enumerate(result.team_keys))[num_alliances:]
+    slots = [
+        PickSlotProbabilities(
+            pick_number=i + 1,
+            round=rnd,
+            alliance_number=alliance_num,
+            availability={
+                key: round(float(result.availability[i, j]), 4) for j, key in pool
+            },
+            pick_probability={
+                key: round(float(result.pick_probability[i, j]), 4)
+                for j, key in pool
+            },
+        )
+        for i, (rnd, alliance_num) in enumerate(result.slots)
+    ]
+    return PickSimulationResponse(
+        event_key=req.event_key,
+        num_simulations=result.num_simulations,
+        slots=slots,
+    )
+
+
 @router.get("/draft/{session_id}", response_model=DraftStateResponse)
 async def get_draft_state(session_id: str):
     session = get_session(session_id)
@@ -1,27 +1,180 @@
-from fastapi import APIRouter, Depends
+import base64
+import binascii
+import json
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.schemas.event import EventResponse
+from app.schemas.prediction import DashboardRequest, DashboardResponse
 from app.schemas.team import TeamEventResponse
+from app.services.cached_response import Page, cached_json
+from app.services.dashboard import (
+    assemble,
+    compute_sections,
+    load_snapshot,
+    ndjson_line,
+    validate_sections,
+)
 from app.services.sync_service import SyncService
+from app.tracing import TracedRoute
+
+router = APIRouter(route_class=TracedRoute)
+
+MAX_PAGE = 500
+DEFAULT_PAGE = 100
+
+
+def _parse_fields(fields: str | None, model: type[BaseModel], key: str) -> list[str] | None:
+    """?fields=a,b -> validated column list, always including the row key."""
+    if not fields:
+        return None
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = sorted(set(names) - set(model.model_fields))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return [key] + [n for n in dict.fromkeys(names) if n != key]
+
+
+def _encode_cursor(event) -> str:
+    raw = json.dumps([event.start_date, event.key]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
 
-router = APIRouter()
+
+def _decode_cursor(cursor: str) -> tuple[str | None, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        start_date, key = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(key, str) or not isinstance(start_date, (str, type(None))):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return start_date, key
 
 
 @router.get("/events", response_model=list[EventResponse])
-async def list_events(year: int, db: Session = Depends(get_db)):
+async def list_events(
+    year: int,
+    request: Request,
+    fields: str | None = None,
+    week: int | None = None,
+    state_prov: str | None = None,
+    event_type: int | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE),
+    db: Session = Depends(get_db),
+):
+    """Season events, optionally filtered, projected and paginated.
+
+    Without limit or cursor the whole season is returned. Otherwise pages are
+    ordered by (start_date, key) and X-Next-Cursor holds the cursor for the
+    next page, absent on the last one.
+    """
+    columns = _parse_fields(fields, EventResponse, "key")
+    after = _decode_cursor(cursor) if cursor else None
+    if after is not None and limit is None:
+        limit = DEFAULT_PAGE
+
     svc = SyncService(db)
-    events = await svc.get_events(year)
-    return events
+    await svc.ensure_events(year)
+
+    def build():
+        query_columns = columns
+        if limit is not None and columns is not None and "start_date" not in columns:
+            # The cursor is built from start_date, so it has to be selected
+            query_columns = columns + ["start_date"]
+        rows = svc.query_events(
+            year,
+            fields=query_columns,
+            week=week,
+            state_prov=state_prov,
+            event_type=event_type,
+            after=after,
+            limit=None if limit is None else limit + 1,
+        )
+        if columns is not None:
+            items = [{c: getattr(r, c) for c in columns} for r in rows]
+        else:
+            items = rows
+        if limit is None:
+            return items
+        more = len(rows) > limit
+        return Page(items[:limit], _encode_cursor(rows[limit - 1]) if more else None)
+
+    return await cached_json(
+        request,
+        f"events_{year}",
+        ("events", columns and tuple(columns), week, state_prov, event_type, cursor, limit),
+        build,
+        list[EventResponse] if columns is None else list[dict[str, Any]],
+    )
 
 
 @router.get("/events/{event_key}/teams", response_model=list[TeamEventResponse])
 async def list_teams(
-    event_key: str, refresh: bool = False, db: Session = Depends(get_db)
+    event_key: str,
+    request: Request,
+    refresh: bool = False,
+    fields: str | None = None,
+    db: Session = Depends(get_db),
 ):
+    columns = _parse_fields(fields, TeamEventResponse, "team_key")
     svc = SyncService(db)
     if refresh:
         svc.invalidate_cache(f"team_events_{event_key}")
-    teams = await svc.get_teams_for_event(event_key)
-    return teams
+    await svc.ensure_teams_for_event(event_key)
+
+    def build():
+        rows = svc.query_teams_for_event(event_key, fields=columns)
+        if columns is None:
+            return rows
+        return [row._asdict() for row in rows]
+
+    return await cached_json(
+        request,
+        event_key,
+        ("teams", columns and tuple(columns)),
+        build,
+        list[TeamEventResponse] if columns is None else list[dict[str, Any]],
+    )
+
+
+@router.post("/events/{event_key}/dashboard", response_model=DashboardResponse)
+async def event_dashboard(
+    event_key: str, req: DashboardRequest, db: Session = Depends(get_db)
+):
+    """Teams, optimal alliances and complements for an event in one response.
+
+    The event's teams are synced and loaded once; the sections are computed
+    concurrently from that snapshot. With stream=true the response is NDJSON,
+    one {"section", "data"|"error"} line per section as soon as it is ready.
+    """
+    try:
+        names = validate_sections(req)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    svc = SyncService(db)
+    await svc.ensure_teams_for_event(event_key)
+    version, snapshot = load_snapshot(svc, event_key)
+    if not snapshot:
+        raise HTTPException(404, f"No teams found for event {event_key}")
+
+    sections = compute_sections(event_key, version, snapshot, req, names)
+    if req.stream:
+
+        async def lines():
+            async for name, body, error in sections:
+                yield ndjson_line(name, body, error)
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    results = {}
+    async for name, body, error in sections:
+        results[name] = (body, error)
+    body = assemble(event_key, {n: results[n] for n in names})
+    return Response(body, media_type="application/json")
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.schemas.team import EpaHistoryResponse, EpaTrend
+from app.services.epa_history import downsample, event_trends, team_history
+from app.tracing import TracedRoute
+
+router = APIRouter(route_class=TracedRoute)
+
+
+@router.get(
+    "/events/{event_key}/teams/{team_key}/epa-history",
+    response_model=EpaHistoryResponse,
+)
+async def get_epa_history(
+    event_key: str,
+    team_key: str,
+    start: int | None = None,
+    end: int | None = None,
+    resolution: int | None = Query(None, ge=60),
+    db: Session = Depends(get_db),
+):
+    """A team's EPA trajectory at an event between epoch-second bounds.
+
+    initial is the state carried in at start. With resolution (seconds) the
+    points are also rolled up into buckets of that width.
+    """
+    initial, points = team_history(db, event_key, team_key, start, end)
+    return EpaHistoryResponse(
+        team_key=team_key,
+        event_key=event_key,
+        initial=initial,
+        points=points,
+        rollups=downsample(points, resolution) if resolution else [],
+    )
+
+
+@router.get("/events/{event_key}/epa-trends", response_model=list[EpaTrend])
+async def get_epa_trends(
+    event_key: str, since: int | None = None, db: Session = Depends(get_db)
+):
+    """EPA change per team since an epoch second, most improved first."""
+    return event_trends(db, event_key, since)
@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends
+import asyncio
+from collections import Counter
+
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -6,25 +9,118 @@ from app.models.team_event import TeamEvent
 from app.schemas.prediction import (
     OptimalAlliancesRequest,
     OptimalAlliancesResponse,
+    SweepAlliance,
+    TeamStability,
+    WeightSweepRequest,
+    WeightSweepResponse,
+    WeightSweepResult,
 )
 from app.services.alliance_optimizer import AllianceOptimizer
+from app.services.cached_response import cached_json
+from app.services.result_cache import normalize_weights
+from app.services.weight_sweep import (
+    captain_assignments,
+    expand_weight_grid,
+    sweep_weights,
+)
+from app.tracing import TracedRoute
 
-router = APIRouter()
+MAX_SWEEP_WEIGHTS = 2000
+
+router = APIRouter(route_class=TracedRoute)
 
 
 @router.post("/predict/optimal-alliances", response_model=OptimalAlliancesResponse)
 async def predict_alliances(
-    req: OptimalAlliancesRequest, db: Session = Depends(get_db)
+    req: OptimalAlliancesRequest, request: Request, db: Session = Depends(get_db)
 ):
-    team_events = (
-        db.query(TeamEvent)
-        .filter(TeamEvent.event_key == req.event_key)
-        .all()
+    def compute():
+        team_events = (
+            db.query(TeamEvent)
+            .filter(TeamEvent.event_key == req.event_key)
+            .all()
+        )
+
+        optimizer = AllianceOptimizer(req.weights)
+        alliances = optimizer.compute_optimal_alliances(
+            team_events, req.alliance_size
+        )
+
+        return OptimalAlliancesResponse(
+            event_key=req.event_key, alliances=alliances
+        )
+
+    async def build():
+        # Off the event loop, so a running optimization can't stall drafts
+        return await asyncio.to_thread(compute)
+
+    cache_key = (
+        "optimal-alliances",
+        normalize_weights(req.weights),
+        req.alliance_size,
     )
+    return await cached_json(
+        request, req.event_key, cache_key, build, OptimalAlliancesResponse
+    )
+
+
+@router.post("/predict/weight-sweep", response_model=WeightSweepResponse)
+async def sweep_alliance_weights(
+    req: WeightSweepRequest, db: Session = Depends(get_db)
+):
+    weights = list(req.weights)
+    if req.grid:
+        try:
+            weights += expand_weight_grid(req.grid, MAX_SWEEP_WEIGHTS - len(weights))
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+    if not weights:
+        raise HTTPException(400, "Provide weights or a grid")
+    if len(weights) > MAX_SWEEP_WEIGHTS:
+        raise HTTPException(400, f"At most {MAX_SWEEP_WEIGHTS} weight vectors")
+
+    def compute():
+        team_events = (
+            db.query(TeamEvent)
+            .filter(TeamEvent.event_key == req.event_key)
+            .all()
+        )
+        return sweep_weights(team_events, weights, req.alliance_size)
+
+    results = await asyncio.to_thread(compute)
 
-    optimizer = AllianceOptimizer(req.weights)
-    alliances = optimizer.compute_optimal_alliances(team_events)
+    assignments = captain_assignments(results)
+    stability = []
+    for team_key, captains in assignments.items():
+        counts = Counter(captains)
+        modal_captain, modal_count = counts.most_common(1)[0]
+        stability.append(
+            TeamStability(
+                team_key=team_key,
+                modal_captain=modal_captain,
+                modal_share=round(modal_count / len(captains), 4),
+                distinct_alliances=len(counts),
+            )
+        )
+    stability.sort(key=lambda s: (s.modal_share, s.team_key))
 
-    return OptimalAlliancesResponse(
-        event_key=req.event_key, alliances=alliances
+    return WeightSweepResponse(
+        event_key=req.event_key,
+        results=[
+            WeightSweepResult(
+                weights=r.weights,
+                alliances=[
+                    SweepAlliance(
+                        rank=i + 1,
+                        team_keys=[t.team_key for t in alliance],
+                        combined_epa=round(sum(t.epa for t in alliance), 2),
+                        total_score=round(score, 2),
+                    )
+                    for i, (alliance, score) in enumerate(zip(r.alliances, r.scores))
+                ],
+            )
+            for r in results
+        ],
+        stability=stability,
+        changed_teams=[s.team_key for s in stability if s.distinct_alliances > 1],
     )
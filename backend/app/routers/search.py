@@ -0,0 +1,34 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from app.schemas.team import TeamEventRef, TeamSearchResult
+from app.services.team_search import team_index
+from app.tracing import TracedRoute
+
+router = APIRouter(route_class=TracedRoute)
+
+
+@router.get("/search/teams", response_model=list[TeamSearchResult])
+async def search_teams(
+    q: str, limit: int = Query(10, ge=1, le=50), year: int | None = None
+):
+    """Autocomplete by team number or nickname prefix, from the in-memory index."""
+    return [
+        TeamSearchResult(
+            team_key=t.key,
+            team_number=t.number,
+            nickname=t.nickname,
+            event_count=team_index.event_count(t.key),
+        )
+        for t in team_index.search(q, limit, year)
+    ]
+
+
+@router.get("/teams/{team_key}/events", response_model=list[TeamEventRef])
+async def team_events(team_key: str, year: int | None = None):
+    """Every synced event a team attends, in date order."""
+    if team_index.get_team(team_key) is None:
+        raise HTTPException(404, f"Team {team_key} not found")
+    return [
+        TeamEventRef(event_key=e.key, name=e.name, year=e.year, start_date=e.start_date)
+        for e in team_index.events_for_team(team_key, year)
+    ]
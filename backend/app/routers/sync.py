@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.services.sync_service import SyncService
+from app.tracing import TracedRoute
+
+router = APIRouter(route_class=TracedRoute)
+
+
+@router.post("/sync/epa/{year}")
+async def ingest_year_epa(year: int, db: Session = Depends(get_db)):
+    """Warm EPA for every event in a season from Statbotics in bulk."""
+    svc = SyncService(db)
+    return await svc.ingest_year_epa(year)
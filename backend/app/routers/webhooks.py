@@ -0,0 +1,85 @@
+import hashlib
+import hmac
+import json
+import logging
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import get_db
+from app.services.sync_service import SyncService
+from app.tracing import TracedRoute
+
+router = APIRouter(route_class=TracedRoute)
+logger = logging.getLogger(__name__)
+
+
+def sign_payload(secret: str, body: bytes) -> str:
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _record(body: bytes, signature: str):
+    with open(settings.TBA_WEBHOOK_RECORD_PATH, "a") as f:
+        f.write(
+            json.dumps(
+                {
+                    "received_at": time.time(),
+                    "signature": signature,
+                    "body": body.decode(),
+                }
+            )
+            + "\n"
+        )
+
+
+@router.post("/webhooks/tba")
+async def tba_webhook(request: Request, db: Session = Depends(get_db)):
+    """Receive TBA push notifications and apply targeted updates."""
+    if not settings.TBA_WEBHOOK_SECRET:
+        raise HTTPException(503, "Webhook secret is not configured")
+
+    body = await request.body()
+    signature = request.headers.get("X-TBA-HMAC", "")
+    expected = sign_payload(settings.TBA_WEBHOOK_SECRET, body)
+    if not hmac.compare_digest(signature, expected):
+        raise HTTPException(401, "Invalid webhook signature")
+
+    if settings.TBA_WEBHOOK_RECORD_PATH:
+        _record(body, signature)
+
+    try:
+        payload = json.loads(body)
+        message_type = payload["message_type"]
+        data = payload.get("message_data") or {}
+        if not isinstance(data, dict):
+            raise TypeError
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise HTTPException(400, "Malformed webhook payload")
+
+    svc = SyncService(db)
+    updated: set[str] = set()
+
+    if message_type == "verification":
+        logger.info("TBA webhook verification key: %s", data.get("verification_key"))
+    elif message_type == "match_score":
+        match = data.get("match")
+        if not isinstance(match, dict):
+            raise HTTPException(400, "match_score without a match")
+        event_key = data.get("event_key") or match.get("event_key")
+        if not event_key or "key" not in match:
+            raise HTTPException(400, "match_score without a match")
+        updated = await svc.apply_match_result(event_key, match)
+    elif message_type in ("schedule_updated", "alliance_selection"):
+        event_key = data.get("event_key")
+        if not isinstance(event_key, str) or not event_key:
+            raise HTTPException(400, f"{message_type} without an event_key")
+        if message_type == "schedule_updated":
+            await svc.refresh_event_matches(event_key)
+        else:
+            # Intentionally only a rankings refresh: the app predicts alliances
+            # rather than storing TBA's, and selection marks final rankings
+            updated = await svc.refresh_rankings(event_key)
+
+    return {"message_type": message_type, "updated_teams": sorted(updated)}
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+
+from app.models.match import TeamMatch
+
+
+class MatchVideoResponse(BaseModel):
+    match_key: str
+    event_key: str
+    comp_level: str
+    match_number: int
+    alliance_color: str
+    alliance_score: int
+    opponent_score: int
+    youtube_key: str
+    youtube_url: str
+
+    @classmethod
+    def from_team_match(cls, tm: TeamMatch) -> "MatchVideoResponse":
+        return cls(
+            match_key=tm.match_key,
+            event_key=tm.event_key or "",
+            comp_level=tm.comp_level or "",
+            match_number=tm.match_number or 0,
+            alliance_color=tm.alliance_color,
+            alliance_score=tm.alliance_score,
+            opponent_score=tm.opponent_score or 0,
+            youtube_key=tm.youtube_key,
+            youtube_url=f"https://www.youtube.com/watch?v={tm.youtube_key}",
+        )
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.team import TeamEventResponse
 
@@ -14,6 +14,7 @@ class AllianceWeights(BaseModel):
 class OptimalAlliancesRequest(BaseModel):
     event_key: str
     weights: AllianceWeights | None = None
+    alliance_size: int = Field(3, ge=2, le=4)
 
 
 class PredictedAlliance(BaseModel):
@@ -32,6 +33,39 @@ class OptimalAlliancesResponse(BaseModel):
     alliances: list[PredictedAlliance]
 
 
+class WeightSweepRequest(BaseModel):
+    event_key: str
+    weights: list[AllianceWeights] = []
+    grid: dict[str, list[float]] | None = None
+    alliance_size: int = Field(3, ge=2, le=4)
+
+
+class SweepAlliance(BaseModel):
+    rank: int
+    team_keys: list[str]
+    combined_epa: float
+    total_score: float
+
+
+class WeightSweepResult(BaseModel):
+    weights: AllianceWeights
+    alliances: list[SweepAlliance]
+
+
+class TeamStability(BaseModel):
+    team_key: str
+    modal_captain: str | None = None
+    modal_share: float
+    distinct_alliances: int
+
+
+class WeightSweepResponse(BaseModel):
+    event_key: str
+    results: list[WeightSweepResult]
+    stability: list[TeamStability]
+    changed_teams: list[str]
+
+
 class DraftStartRequest(BaseModel):
     event_key: str
     num_rounds: int = 2
@@ -46,6 +80,31 @@ class DraftAutoPickRequest(BaseModel):
     session_id: str
 
 
+class PickSimulationRequest(BaseModel):
+    event_key: str
+    num_simulations: int = Field(10000, ge=1, le=200000)
+    num_rounds: int = Field(2, ge=1, le=3)
+    weights: AllianceWeights | None = None
+    temperature: float = Field(10.0, gt=0)
+    # Same as pick_simulator.DEFAULT_DECLINE_RATES
+    decline_rates: list[float] = [0.05]
+    seed: int | None = None
+
+
+class PickSlotProbabilities(BaseModel):
+    pick_number: int
+    round: int
+    alliance_number: int
+    availability: dict[str, float]
+    pick_probability: dict[str, float]
+
+
+class PickSimulationResponse(BaseModel):
+    event_key: str
+    num_simulations: int
+    slots: list[PickSlotProbabilities]
+
+
 class DraftPick(BaseModel):
     round: int
     alliance_number: int
@@ -62,6 +121,9 @@ class DraftStateResponse(BaseModel):
     available_teams: list[TeamEventResponse]
     pick_history: list[DraftPick]
     is_complete: bool
+    parent_session_id: str | None = None
+    can_undo: bool = False
+    can_redo: bool = False
 
 
 class ComplementCandidate(BaseModel):
@@ -76,3 +138,21 @@ class ComplementCandidate(BaseModel):
 class ComplementResponse(BaseModel):
     target_team: TeamEventResponse
     complements: list[ComplementCandidate]
+
+
+class DashboardRequest(BaseModel):
+    sections: list[str] = ["teams", "alliances", "complements"]
+    team_key: str | None = None
+    weights: AllianceWeights | None = None
+    alliance_size: int = Field(3, ge=2, le=4)
+    top_n: int = Field(10, ge=1, le=50)
+    stream: bool = False
+
+
+class DashboardResponse(BaseModel):
+    event_key: str
+    teams: list[TeamEventResponse] | None = None
+    alliances: OptimalAlliancesResponse | None = None
+    complements: list[ComplementResponse] | None = None
+    complement: ComplementResponse | None = None
+    errors: dict[str, str] = {}
@@ -16,5 +16,60 @@ class TeamEventResponse(BaseModel):
     endgame_epa: float | None = None
     rp_1_epa: float | None = None
     rp_2_epa: float | None = None
+    consistency: float | None = None
 
     model_config = {"from_attributes": True}
+
+
+class EpaPoint(BaseModel):
+    ts: int
+    epa: float | None = None
+    auto_epa: float | None = None
+    teleop_epa: float | None = None
+    endgame_epa: float | None = None
+    rp_1_epa: float | None = None
+    rp_2_epa: float | None = None
+
+
+class EpaRollup(BaseModel):
+    """EPA over one bucket: open/close/min/max total, closing components."""
+
+    start: int
+    samples: int
+    epa_open: float | None = None
+    epa_close: float | None = None
+    epa_min: float | None = None
+    epa_max: float | None = None
+    auto_epa: float | None = None
+    teleop_epa: float | None = None
+    endgame_epa: float | None = None
+
+
+class EpaHistoryResponse(BaseModel):
+    team_key: str
+    event_key: str
+    initial: EpaPoint | None = None
+    points: list[EpaPoint] = []
+    rollups: list[EpaRollup] = []
+
+
+class EpaTrend(BaseModel):
+    team_key: str
+    start_epa: float | None = None
+    end_epa: float | None = None
+    change: float | None = None
+    samples: int
+
+
+class TeamSearchResult(BaseModel):
+    team_key: str
+    team_number: int
+    nickname: str
+    event_count: int
+
+
+class TeamEventRef(BaseModel):
+    event_key: str
+    name: str
+    year: int | None = None
+    start_date: str | None = None
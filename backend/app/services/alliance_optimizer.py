@@ -1,11 +1,21 @@
 import random
 from dataclasses import dataclass
+from itertools import combinations
 
+import numpy as np
+
+from app.metrics import solver_iterations, timed
 from app.models.team_event import TeamEvent
 from app.schemas.prediction import AllianceWeights, PredictedAlliance
 from app.schemas.team import TeamEventResponse
 
 
+# Consistency is unset only until some team at the event has played enough
+# matches (then apply_prior gives every team a value), so this is shared by
+# all teams at once and ranks none above another
+NO_DATA_CONSISTENCY = 0.5
+
+
 @dataclass
 class TeamScore:
     team_key: str
@@ -30,7 +40,7 @@ def score_team(te: TeamEvent) -> TeamScore:
         auto_epa=te.auto_epa or 0.0,
         teleop_epa=te.teleop_epa or 0.0,
         endgame_epa=te.endgame_epa or 0.0,
-        consistency=1.0,
+        consistency=te.consistency if te.consistency is not None else NO_DATA_CONSISTENCY,
         rp_potential=(te.rp_1_epa or 0.0) + (te.rp_2_epa or 0.0),
         _source=te,
     )
@@ -74,9 +84,38 @@ def _team_to_response(ts: TeamScore) -> TeamEventResponse:
     )
 
 
+def _prune_dominated(pool: list[TeamScore], n: int) -> list[TeamScore]:
+    """Drop teams dominated by at least n others with the same leading component.
+
+    Such a team can always be swapped for an unused dominator without
+    lowering the alliance score (for non-negative weights).
+    """
+    if len(pool) <= n:
+        return list(pool)
+    stats = np.array(
+        [
+            [t.auto_epa, t.teleop_epa, t.endgame_epa, t.epa, t.consistency]
+            for t in pool
+        ],
+        dtype=np.float64,
+    )
+    leader = np.argmax(stats[:, :3], axis=1)
+    ge = (stats[:, None, :] >= stats[None, :, :]).all(axis=2)
+    gt = (stats[:, None, :] > stats[None, :, :]).any(axis=2)
+    # dominates[j, i]: j is at least as good everywhere and either strictly
+    # better somewhere or an identical team listed earlier
+    idx = np.arange(len(pool))
+    dominates = ge & (gt | (idx[:, None] < idx[None, :])) & (leader[:, None] == leader[None, :])
+    np.fill_diagonal(dominates, False)
+    keep = dominates.sum(axis=0) < n
+    return [t for t, k in zip(pool, keep) if k]
+
+
 class AllianceOptimizer:
-    def __init__(self, weights: AllianceWeights | None = None):
+    def __init__(self, weights: AllianceWeights | None = None, seed: int | None = None):
         self.w = weights or AllianceWeights()
+        # Local search swaps are random; a seed makes results reproducible
+        self.rng = random.Random(seed)
 
     def score_alliance(self, teams: list[TeamScore]) -> float:
         auto_sum = sum(t.auto_epa for t in teams)
@@ -94,23 +133,26 @@ class AllianceOptimizer:
             + self.w.synergy * synergy * combined_epa
         )
 
+    @timed("optimal_alliances")
     def compute_optimal_alliances(
-        self, team_events: list[TeamEvent]
+        self, team_events: list[TeamEvent], alliance_size: int = 3
     ) -> list[PredictedAlliance]:
         scores = [
             score_team(te) for te in team_events if te.epa is not None and te.epa > 0
         ]
         scores.sort(key=lambda t: t.epa, reverse=True)
 
-        if len(scores) < 6:
+        if len(scores) < 2 * alliance_size:
             return []
 
-        num_alliances = min(8, len(scores) // 3)
+        num_alliances = min(8, len(scores) // alliance_size)
         captains = scores[:num_alliances]
         pool = scores[num_alliances:]
 
-        alliances_td = self._greedy_assign(captains, list(pool))
-        alliances_bu = self._greedy_assign(list(reversed(captains)), list(pool))
+        alliances_td = self._greedy_assign(captains, list(pool), alliance_size)
+        alliances_bu = self._greedy_assign(
+            list(reversed(captains)), list(pool), alliance_size
+        )
 
         best = max(
             [alliances_td, alliances_bu], key=self._total_score
@@ -121,50 +163,111 @@ class AllianceOptimizer:
         return [self._to_response(i + 1, a) for i, a in enumerate(ranked)]
 
     def _greedy_assign(
-        self, captains: list[TeamScore], pool: list[TeamScore]
+        self,
+        captains: list[TeamScore],
+        pool: list[TeamScore],
+        alliance_size: int = 3,
     ) -> list[list[TeamScore]]:
         alliances = []
         remaining = list(pool)
 
         for captain in captains:
-            best_pair: tuple[int, int] | None = None
-            best_score = -float("inf")
-
-            for i in range(len(remaining)):
-                for j in range(i + 1, len(remaining)):
-                    trio = [captain, remaining[i], remaining[j]]
-                    s = self.score_alliance(trio)
-                    if s > best_score:
-                        best_score = s
-                        best_pair = (i, j)
-
-            if best_pair is not None:
-                p1 = remaining[best_pair[0]]
-                p2 = remaining[best_pair[1]]
-                alliances.append([captain, p1, p2])
-                used = {p1.team_key, p2.team_key}
+            partners = self._best_partners(captain, remaining, alliance_size - 1)
+            if partners:
+                alliances.append([captain] + partners)
+                used = {p.team_key for p in partners}
                 remaining = [t for t in remaining if t.team_key not in used]
             else:
                 alliances.append([captain])
 
         return alliances
 
+    def _best_partners(
+        self, captain: TeamScore, pool: list[TeamScore], n: int
+    ) -> list[TeamScore]:
+        """Highest-scoring set of n partners for a captain.
+
+        With non-negative weights, score_alliance is monotone in every team
+        stat, so a team dominated by n others of the same leading component
+        is never needed, and each team's linear stats plus its EPA times the
+        largest possible consistency/synergy multiplier bound its
+        contribution. Candidates are searched in order of that bound and a
+        branch is cut once its bound can't beat the best set found.
+        """
+        if n <= 0 or len(pool) < n:
+            return []
+
+        w = self.w
+        if min(w.auto, w.teleop, w.endgame, w.consistency, w.synergy) < 0:
+            best_combo = max(
+                combinations(pool, n),
+                key=lambda combo: self.score_alliance([captain, *combo]),
+            )
+            return list(best_combo)
+
+        candidates = _prune_dominated(pool, n)
+        max_consistency = max(t.consistency for t in [captain, *candidates])
+        max_synergy = 3.0 + 0.5 * min(n + 1, 3)
+        multiplier = w.consistency * max_consistency + w.synergy * max_synergy
+
+        def bound(t: TeamScore) -> float:
+            return (
+                w.auto * t.auto_epa
+                + w.teleop * t.teleop_epa
+                + w.endgame * t.endgame_epa
+                + multiplier * t.epa
+            )
+
+        candidates.sort(key=bound, reverse=True)
+        bounds = [bound(t) for t in candidates]
+        prefix = [0.0]
+        for b in bounds:
+            prefix.append(prefix[-1] + b)
+
+        base = bound(captain)
+        best_score = -float("inf")
+        best: list[TeamScore] = []
+        chosen: list[TeamScore] = []
+
+        def search(start: int, partial: float):
+            nonlocal best_score, best
+            left = n - len(chosen)
+            if left == 0:
+                s = self.score_alliance([captain, *chosen])
+                if s > best_score:
+                    best_score = s
+                    best = list(chosen)
+                return
+            for i in range(start, len(candidates) - left + 1):
+                # bounds are sorted, so no later start can do better either
+                if base + partial + prefix[i + left] - prefix[i] <= best_score:
+                    break
+                chosen.append(candidates[i])
+                search(i + 1, partial + bounds[i])
+                chosen.pop()
+
+        search(0, 0.0)
+        return best
+
+    @timed("local_search")
     def _local_search(
         self, alliances: list[list[TeamScore]], max_iterations: int = 500
     ) -> list[list[TeamScore]]:
         best_total = self._total_score(alliances)
         no_improvement = 0
+        attempts = 0
 
         for _ in range(max_iterations):
             if len(alliances) < 2:
                 break
+            attempts += 1
 
-            a1_idx, a2_idx = random.sample(range(len(alliances)), 2)
+            a1_idx, a2_idx = self.rng.sample(range(len(alliances)), 2)
             if len(alliances[a1_idx]) < 2 or len(alliances[a2_idx]) < 2:
                 continue
 
-            pos1 = random.randint(1, len(alliances[a1_idx]) - 1)
-            pos2 = random.randint(1, len(alliances[a2_idx]) - 1)
+            pos1 = self.rng.randint(1, len(alliances[a1_idx]) - 1)
+            pos2 = self.rng.randint(1, len(alliances[a2_idx]) - 1)
 
             alliances[a1_idx][pos1], alliances[a2_idx][pos2] = (
                 alliances[a2_idx][pos2],
@@ -185,6 +288,7 @@ class AllianceOptimizer:
             if no_improvement > 100:
                 break
 
+        solver_iterations.inc(attempts, solver="local_search")
         return alliances
 
     def _total_score(self, alliances: list[list[TeamScore]]) -> float:
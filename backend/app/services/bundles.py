@@ -0,0 +1,214 @@
+"""Versioned offline event bundles for pit tablets.
+
+A bundle is gzipped JSON holding everything the tablet UI shows for one
+event: the team list, optimal alliances under default weights, complement
+rankings for every team and each team's best/worst match video of the
+season. Each section maps a stable key (team key, or "default") to a value,
+so a diff between two versions is just the keys set and deleted per section:
+
+    {"kind": "diff", "from_version": 3, "version": 5,
+     "sections": {"teams": {"set": {...}, "delete": [...]}, ...}}
+
+Building a bundle stores the new version plus a diff to it from each of the
+last KEEP_VERSIONS versions, so serving a download is a single row read.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.compression import compress
+from app.models import EventBundle, EventBundleDiff, TeamMatch, TeamVideoSummary
+from app.schemas.match import MatchVideoResponse
+from app.schemas.team import TeamEventResponse
+from app.services.alliance_optimizer import AllianceOptimizer
+from app.services.complement_finder import ComplementFinder
+from app.services.sync_service import SyncService
+from app.tracing import span
+
+BUNDLE_FORMAT = 1
+KEEP_VERSIONS = 10
+
+
+def _json(value) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _video(tm: TeamMatch | None) -> dict | None:
+    if tm is None or not tm.youtube_key:
+        return None
+    return MatchVideoResponse.from_team_match(tm).model_dump(mode="json")
+
+
+def _videos(db: Session, team_keys: list[str], year: int) -> dict[str, dict]:
+    """Stored best/worst videos per team, as kept by match ingest.
+
+    Teams without video data have no entry.
+    """
+    summaries = (
+        db.query(TeamVideoSummary)
+        .filter(
+            TeamVideoSummary.team_key.in_(team_keys),
+            TeamVideoSummary.year == year,
+            TeamVideoSummary.video_count > 0,
+        )
+        .all()
+    )
+    ids = {s.best_match_id for s in summaries} | {s.worst_match_id for s in summaries}
+    ids.discard(None)
+    matches = {tm.id: tm for tm in db.query(TeamMatch).filter(TeamMatch.id.in_(ids))}
+    return {
+        s.team_key: {
+            "best": _video(matches.get(s.best_match_id)),
+            "worst": _video(matches.get(s.worst_match_id)),
+            "count": s.video_count,
+        }
+        for s in summaries
+    }
+
+
+async def collect_sections(db: Session, event_key: str) -> dict[str, dict]:
+    """Sync the event and compute every bundle section from one snapshot."""
+    svc = SyncService(db)
+    await svc.ensure_teams_for_event(event_key)
+    snapshot = svc.query_teams_for_event(event_key)
+    if not snapshot:
+        raise LookupError(f"No teams found for event {event_key}")
+
+    with span("bundle videos"):
+        videos = _videos(db, [te.team_key for te in snapshot], int(event_key[:4]))
+
+    # Seeded so unchanged data rebuilds to the same bundle (and no new version)
+    alliances = await asyncio.to_thread(
+        AllianceOptimizer(None, seed=0).compute_optimal_alliances, snapshot
+    )
+    complements = await asyncio.to_thread(ComplementFinder().find_all_complements, snapshot)
+    return {
+        "teams": {
+            te.team_key: TeamEventResponse.model_validate(te).model_dump(mode="json")
+            for te in snapshot
+        },
+        "alliances": {
+            "default": [a.model_dump(mode="json") for a in alliances],
+        },
+        "complements": {
+            c.target_team.team_key: c.model_dump(mode="json") for c in complements
+        },
+        "videos": videos,
+    }
+
+
+def diff(old: dict, new: dict) -> dict:
+    """Diff between two full bundles; apply_diff(old, diff) == new sections."""
+    sections = {}
+    for name in sorted(old["sections"].keys() | new["sections"].keys()):
+        before = old["sections"].get(name, {})
+        after = new["sections"].get(name, {})
+        changed = {k: v for k, v in after.items() if before.get(k) != v}
+        deleted = sorted(before.keys() - after.keys())
+        if changed or deleted:
+            sections[name] = {"set": changed, "delete": deleted}
+    return {
+        "format": BUNDLE_FORMAT,
+        "kind": "diff",
+        "event_key": new["event_key"],
+        "from_version": old["version"],
+        "version": new["version"],
+        "sections": sections,
+    }
+
+
+def apply_diff(bundle: dict, patch: dict) -> dict:
+    if patch["from_version"] != bundle["version"]:
+        raise ValueError(
+            f"Diff is from version {patch['from_version']}, bundle is {bundle['version']}"
+        )
+    sections = {name: dict(entries) for name, entries in bundle["sections"].items()}
+    for name, change in patch["sections"].items():
+        entries = sections.setdefault(name, {})
+        for key in change["delete"]:
+            entries.pop(key, None)
+        entries.update(change["set"])
+    return {**bundle, "version": patch["version"], "sections": sections}
+
+
+def load(row: EventBundle | EventBundleDiff) -> dict:
+    return json.loads(gzip.decompress(row.data))
+
+
+def latest_bundle(db: Session, event_key: str) -> EventBundle | None:
+    return (
+        db.query(EventBundle)
+        .filter(EventBundle.event_key == event_key)
+        .order_by(EventBundle.version.desc())
+        .first()
+    )
+
+
+async def build_bundle(db: Session, event_key: str) -> tuple[EventBundle, bool]:
+    """Store a new bundle version if the event's data changed.
+
+    Returns (latest bundle, whether a new version was created). When a
+    concurrent build stores the same version first, its bundle is returned.
+    """
+    sections = await collect_sections(db, event_key)
+    content_hash = hashlib.sha256(_json(sections)).hexdigest()
+    previous = latest_bundle(db, event_key)
+    if previous is not None and previous.content_hash == content_hash:
+        return previous, False
+
+    version = previous.version + 1 if previous else 1
+    now = datetime.now(timezone.utc)
+    full = {
+        "format": BUNDLE_FORMAT,
+        "kind": "full",
+        "event_key": event_key,
+        "version": version,
+        "generated_at": now.isoformat(),
+        "sections": sections,
+    }
+    bundle = EventBundle(
+        event_key=event_key,
+        version=version,
+        content_hash=content_hash,
+        created_at=now,
+        data=compress(_json(full), "gzip"),
+    )
+
+    older = (
+        db.query(EventBundle)
+        .filter(EventBundle.event_key == event_key)
+        .order_by(EventBundle.version.desc())
+        .limit(KEEP_VERSIONS - 1)
+        .all()
+    )
+    # Only diffs to the newest version are ever served. Bulk deletes, so a
+    # concurrent build that already removed the rows isn't an error.
+    db.query(EventBundleDiff).filter(EventBundleDiff.event_key == event_key).delete()
+    if len(older) == KEEP_VERSIONS - 1:
+        db.query(EventBundle).filter(
+            EventBundle.event_key == event_key,
+            EventBundle.version < older[-1].version,
+        ).delete()
+    with span("bundle diffs"):
+        for old in older:
+            db.add(
+                EventBundleDiff(
+                    event_key=event_key,
+                    from_version=old.version,
+                    to_version=version,
+                    data=compress(_json(diff(load(old), full)), "gzip"),
+                )
+            )
+    db.add(bundle)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another build took this version number first
+        db.rollback()
+        return latest_bundle(db, event_key), False
+    return bundle, True
@@ -0,0 +1,131 @@
+import hashlib
+import inspect
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.compression import MIN_SIZE, compress, negotiate
+from app.services.result_cache import data_version, result_cache
+from app.tracing import span
+
+
+@dataclass
+class Page:
+    """One page of a keyset-paginated list; next_cursor is None on the last."""
+
+    items: list
+    next_cursor: str | None
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def encode(value: Any, response_type: Any) -> tuple[bytes, str]:
+    """Serialize ORM rows or models to JSON bytes plus a strong ETag.
+
+    Validation and encoding both run in pydantic-core, skipping FastAPI's
+    jsonable_encoder + json.dumps pass.
+    """
+    adapter = _adapter(response_type)
+    with span("serialize"):
+        body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+    return body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    base = etag.strip('"')
+    for tag in header.split(","):
+        # If-None-Match uses weak comparison, so W/ prefixes are ignored;
+        # compressed variants ("<hash>-gzip") match their identity ETag
+        tag = tag.strip().removeprefix("W/").strip('"')
+        if tag.partition("-")[0] == base:
+            return True
+    return False
+
+
+async def cached_body(
+    scope: str,
+    key: tuple,
+    build: Callable[[], Any] | Callable[[], Awaitable[Any]],
+    response_type: Any,
+    version: int | None = None,
+) -> tuple[bytes, str, dict[str, str]]:
+    """(JSON bytes, ETag, extra headers) for build()'s result, cached per
+    data version of scope. If build returns a Page, its items are the body
+    and its cursor goes in X-Next-Cursor.
+
+    If build() works from rows the caller read beforehand, pass the data
+    version recorded before that read.
+    """
+    cache_key = (*key, "json")
+    # Captured before build() reads anything, so a concurrent bump can't
+    # label what it read as current
+    if version is None:
+        version = data_version(scope)
+    cached = result_cache.get(scope, cache_key)
+    if cached is None:
+        value = build()
+        if inspect.isawaitable(value):
+            value = await value
+        extra = {}
+        if isinstance(value, Page):
+            if value.next_cursor is not None:
+                extra["X-Next-Cursor"] = value.next_cursor
+            value = value.items
+        cached = (*encode(value, response_type), extra)
+        result_cache.put(scope, cache_key, cached, version)
+    return cached
+
+
+async def cached_json(
+    request: Request,
+    scope: str,
+    key: tuple,
+    build: Callable[[], Any] | Callable[[], Awaitable[Any]],
+    response_type: Any,
+) -> Response:
+    """Serve build()'s result as JSON bytes cached per data version of scope.
+
+    The bytes are computed once per (scope version, key); GET requests whose
+    If-None-Match carries the current ETag get a bodyless 304. key[0] names
+    the result family, as for other result_cache keys.
+
+    Bodies worth compressing are also cached gzip/brotli-encoded per coding,
+    so repeat requests skip both serialization and compression.
+    """
+    version = data_version(scope)
+    body, etag, extra = await cached_body(scope, key, build, response_type)
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache", **extra}
+    coding = None
+    if len(body) >= MIN_SIZE:
+        coding = negotiate(request.headers.get("accept-encoding", ""))
+    if coding is not None:
+        headers["ETag"] = f'{etag[:-1]}-{coding}"'
+        headers["Vary"] = "Accept-Encoding"
+
+    if_none_match = request.headers.get("if-none-match")
+    if (
+        if_none_match
+        and request.method in ("GET", "HEAD")
+        and _etag_matches(if_none_match, etag)
+    ):
+        return Response(status_code=304, headers=headers)
+
+    if coding is not None:
+        encoded_key = (*key, "json", coding)
+        encoded = result_cache.get(scope, encoded_key)
+        if encoded is None:
+            with span("compress", coding=coding):
+                encoded = compress(body, coding)
+            result_cache.put(scope, encoded_key, encoded, version)
+        headers["Content-Encoding"] = coding
+        body = encoded
+    return Response(body, media_type="application/json", headers=headers)
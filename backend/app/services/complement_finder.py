@@ -1,10 +1,40 @@
+import heapq
+
+import numpy as np
+
+from app.metrics import timed
 from app.models.team_event import TeamEvent
 from app.schemas.prediction import ComplementCandidate, ComplementResponse
 from app.schemas.team import TeamEventResponse
-from app.services.alliance_optimizer import compute_synergy, score_team
+from app.services.alliance_optimizer import TeamScore, compute_synergy, score_team
+
+COMPONENTS = ("auto", "teleop", "endgame")
+_POPCOUNT = np.array([0, 1, 1, 2, 1, 2, 2, 3], dtype=np.float64)
+
+
+def _component_values(ts: TeamScore) -> tuple[float, float, float]:
+    return ts.auto_epa, ts.teleop_epa, ts.endgame_epa
+
+
+def _weaknesses(ts: TeamScore) -> list[str]:
+    values = _component_values(ts)
+    total = sum(values) or 1.0
+    return [k for k, v in zip(COMPONENTS, values) if v / total < 0.25]
+
+
+def _coverage(target: TeamScore, weaknesses: list[str], c: TeamScore) -> list[str]:
+    comp_map = dict(zip(COMPONENTS, _component_values(c)))
+    return [w for w in weaknesses if comp_map.get(w, 0) > target.epa * 0.3]
+
+
+def _strength_areas(c: TeamScore) -> list[str]:
+    values = _component_values(c)
+    c_total = sum(values) or 1.0
+    return [k for k, v in zip(COMPONENTS, values) if v / c_total >= 0.35]
 
 
 class ComplementFinder:
+    @timed("find_complements")
     def find_complements(
         self,
         target: TeamEvent,
@@ -12,59 +42,93 @@ class ComplementFinder:
         top_n: int = 10,
     ) -> ComplementResponse:
         target_score = score_team(target)
-        components = {
-            "auto": target_score.auto_epa,
-            "teleop": target_score.teleop_epa,
-            "endgame": target_score.endgame_epa,
-        }
-        total = sum(components.values()) or 1.0
-        normalized = {k: v / total for k, v in components.items()}
-        weaknesses = [k for k, v in normalized.items() if v < 0.25]
-
-        candidates: list[ComplementCandidate] = []
-
-        for te in available:
-            if te.team_key == target.team_key:
-                continue
-
-            c = score_team(te)
-            combined_epa = target_score.epa + c.epa
-            synergy = compute_synergy([target_score, c])
-
-            coverage = []
-            comp_map = {
-                "auto": c.auto_epa,
-                "teleop": c.teleop_epa,
-                "endgame": c.endgame_epa,
-            }
-            for w in weaknesses:
-                if comp_map.get(w, 0) > target_score.epa * 0.3:
-                    coverage.append(w)
-
-            c_total = c.auto_epa + c.teleop_epa + c.endgame_epa or 1.0
-            c_normalized = {
-                "auto": c.auto_epa / c_total if c_total else 0,
-                "teleop": c.teleop_epa / c_total if c_total else 0,
-                "endgame": c.endgame_epa / c_total if c_total else 0,
-            }
-            strength_areas = [k for k, v in c_normalized.items() if v >= 0.35]
-
-            coverage_bonus = len(coverage) * 2.0
-            fit_score = combined_epa + synergy * 3.0 + coverage_bonus
-
-            candidates.append(
+        weaknesses = _weaknesses(target_score)
+
+        def fits():
+            for te in available:
+                if te.team_key == target.team_key:
+                    continue
+                c = score_team(te)
+                combined_epa = target_score.epa + c.epa
+                synergy = compute_synergy([target_score, c])
+                coverage = _coverage(target_score, weaknesses, c)
+                fit_score = combined_epa + synergy * 3.0 + len(coverage) * 2.0
+                yield round(fit_score, 2), combined_epa, synergy, coverage, c
+
+        # nlargest keeps input order among ties, same as a stable sort
+        top = heapq.nlargest(top_n, fits(), key=lambda f: f[0])
+
+        return ComplementResponse(
+            target_team=TeamEventResponse.model_validate(target),
+            complements=[
                 ComplementCandidate(
-                    team=TeamEventResponse.model_validate(te),
+                    team=TeamEventResponse.model_validate(c._source),
                     combined_epa=round(combined_epa, 2),
                     synergy_score=round(synergy, 2),
-                    strength_areas=strength_areas,
+                    strength_areas=_strength_areas(c),
                     weakness_coverage=coverage,
-                    overall_fit_score=round(fit_score, 2),
+                    overall_fit_score=fit_score,
                 )
-            )
+                for fit_score, combined_epa, synergy, coverage, c in top
+            ],
+        )
 
-        candidates.sort(key=lambda c: c.overall_fit_score, reverse=True)
-        return ComplementResponse(
-            target_team=TeamEventResponse.model_validate(target),
-            complements=candidates[:top_n],
+    @timed("find_all_complements")
+    def find_all_complements(
+        self, team_events: list[TeamEvent], top_n: int = 10
+    ) -> list[ComplementResponse]:
+        """Complement rankings for every team at an event.
+
+        Builds the full N x N fit matrix (row = target, column = candidate)
+        in one pass and only materializes responses for each row's top_n.
+        """
+        if not team_events:
+            return []
+
+        scores = [score_team(te) for te in team_events]
+        comps = np.array([_component_values(s) for s in scores], dtype=np.float64)
+        epa = np.array([s.epa for s in scores], dtype=np.float64)
+
+        positive = comps > 0
+        positive_mask = positive[:, 0] | positive[:, 1] << 1 | positive[:, 2] << 2
+        leader_bit = 1 << np.argmax(comps, axis=1)
+        synergy = _POPCOUNT[positive_mask[:, None] | positive_mask[None, :]] + 0.5 * (
+            _POPCOUNT[leader_bit[:, None] | leader_bit[None, :]]
         )
+
+        totals = comps.sum(axis=1)
+        totals[totals == 0] = 1.0
+        weak = comps / totals[:, None] < 0.25
+        covers = comps[None, :, :] > (epa * 0.3)[:, None, None]
+        coverage = (weak[:, None, :] & covers).sum(axis=2)
+
+        combined = epa[:, None] + epa[None, :]
+        fit = np.round(combined + synergy * 3.0 + coverage * 2.0, 2)
+        np.fill_diagonal(fit, -np.inf)
+
+        k = min(top_n, len(scores) - 1)
+        order = np.argsort(-fit, axis=1, kind="stable")[:, :k]
+
+        responses = []
+        for i, target in enumerate(scores):
+            weaknesses = _weaknesses(target)
+            complements = []
+            for j in order[i]:
+                c = scores[j]
+                complements.append(
+                    ComplementCandidate(
+                        team=TeamEventResponse.model_validate(team_events[j]),
+                        combined_epa=round(float(combined[i, j]), 2),
+                        synergy_score=round(float(synergy[i, j]), 2),
+                        strength_areas=_strength_areas(c),
+                        weakness_coverage=_coverage(target, weaknesses, c),
+                        overall_fit_score=float(fit[i, j]),
+                    )
+                )
+            responses.append(
+                ComplementResponse(
+                    target_team=TeamEventResponse.model_validate(team_events[i]),
+                    complements=complements,
+                )
+            )
+        return responses
@@ -0,0 +1,116 @@
+import math
+import statistics
+from typing import Iterable
+
+from app.models.match import Match
+from app.models.team_event import TeamEvent
+
+# Fewer matches than this and the spread says more about the schedule than
+# the robot, so the team gets the event prior instead of its own score.
+MIN_MATCHES = 3
+# Weight of the event prior, in matches, when shrinking a measured score
+PRIOR_MATCHES = 3
+
+
+def welford_update(
+    count: int, mean: float, m2: float, value: float
+) -> tuple[int, float, float]:
+    count += 1
+    delta = value - mean
+    mean += delta / count
+    m2 += delta * (value - mean)
+    return count, mean, m2
+
+
+def consistency_score(count: int, mean: float, m2: float) -> float | None:
+    """1 / (1 + coefficient of variation) of a team's match contributions.
+
+    None below MIN_MATCHES; 0.0, the lowest score, for a team that
+    contributed nothing on average.
+    """
+    if count < MIN_MATCHES:
+        return None
+    if mean <= 0:
+        return 0.0
+    std = math.sqrt(m2 / (count - 1))
+    return 1.0 / (1.0 + std / mean)
+
+
+def alliance_contributions(
+    match: Match, epa_by_team: dict[str, float]
+) -> dict[str, float]:
+    """Split each alliance's score across its teams in proportion to EPA."""
+    contributions = {}
+    for teams_str, score in (
+        (match.red_teams, match.red_score),
+        (match.blue_teams, match.blue_score),
+    ):
+        teams = [t for t in (teams_str or "").split(",") if t]
+        if score is None or not teams:
+            continue
+        epas = [max(epa_by_team.get(t) or 0.0, 0.0) for t in teams]
+        total = sum(epas)
+        for team_key, epa in zip(teams, epas):
+            share = epa / total if total > 0 else 1.0 / len(teams)
+            contributions[team_key] = score * share
+    return contributions
+
+
+def apply_matches(
+    team_events: dict[str, TeamEvent], matches: list[Match]
+) -> set[str]:
+    """Fold newly played matches into each team's running stats.
+
+    Only touches the teams in those matches; returns their keys. A match with
+    a team that has no TeamEvent row yet (e.g. a webhook result arriving
+    before the event's teams are synced) stays unapplied for a later update.
+    """
+    epa_by_team = {k: te.epa for k, te in team_events.items()}
+    touched: set[str] = set()
+    for match in matches:
+        contributions = alliance_contributions(match, epa_by_team)
+        if any(team_key not in team_events for team_key in contributions):
+            continue
+        for team_key, value in contributions.items():
+            te = team_events[team_key]
+            te.match_count, te.contribution_mean, te.contribution_m2 = welford_update(
+                te.match_count or 0,
+                te.contribution_mean or 0.0,
+                te.contribution_m2 or 0.0,
+                value,
+            )
+            touched.add(team_key)
+        match.stats_applied = True
+    return touched
+
+
+def apply_prior(team_events: Iterable[TeamEvent]) -> set[str]:
+    """Set each team's consistency, shrunk toward the event median.
+
+    A measured score is blended with the median of the event's measured
+    scores, weighted by match count against PRIOR_MATCHES; an unmeasured
+    team gets the median itself. Until some team is measured, every team
+    stays unset. Returns the keys whose value changed.
+    """
+    team_events = list(team_events)
+    measured = {
+        te.team_key: consistency_score(
+            te.match_count or 0, te.contribution_mean or 0.0, te.contribution_m2 or 0.0
+        )
+        for te in team_events
+    }
+    scores = [s for s in measured.values() if s is not None]
+    prior = statistics.median(scores) if scores else None
+
+    changed = set()
+    for te in team_events:
+        score = measured[te.team_key]
+        if score is None:
+            value = prior
+        else:
+            n = te.match_count
+            value = (n * score + PRIOR_MATCHES * prior) / (n + PRIOR_MATCHES)
+        if value != te.consistency:
+            te.consistency = value
+            changed.add(te.team_key)
+    return changed
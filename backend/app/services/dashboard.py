@@ -0,0 +1,155 @@
+"""Composite event dashboard: several result sections from one snapshot.
+
+Each section is cached under the same result_cache key as its standalone
+endpoint (/events/{key}/teams, /predict/optimal-alliances, /complement/...),
+so the dashboard and the individual endpoints warm each other. Sections that
+miss the cache are computed concurrently in worker threads from a single
+TeamEvent snapshot and handed back in completion order. The snapshot is
+copied off the request's Session first, since the threads read it at once.
+"""
+import asyncio
+import json
+from typing import Any, AsyncIterator, Callable
+
+from app.models.team_event import TeamEvent
+from app.schemas.prediction import (
+    ComplementResponse,
+    DashboardRequest,
+    OptimalAlliancesResponse,
+)
+from app.schemas.team import TeamEventResponse
+from app.services.alliance_optimizer import AllianceOptimizer
+from app.services.cached_response import cached_body
+from app.services.complement_finder import ComplementFinder
+from app.services.result_cache import data_version, normalize_weights
+from app.services.sync_service import SyncService
+from app.tracing import span
+
+
+def load_snapshot(svc: SyncService, event_key: str) -> tuple[int, list[TeamEvent]]:
+    """(data version, the event's TeamEvent rows), the version recorded
+    before the read. The rows are unattached copies of the loaded ones."""
+    version = data_version(event_key)
+    rows = svc.query_teams_for_event(event_key)
+    columns = [c.key for c in TeamEvent.__table__.columns]
+    return version, [TeamEvent(**{c: getattr(te, c) for c in columns}) for te in rows]
+
+
+def _teams(event_key: str, snapshot: list[TeamEvent], req: DashboardRequest):
+    return snapshot
+
+
+def _alliances(event_key: str, snapshot: list[TeamEvent], req: DashboardRequest):
+    optimizer = AllianceOptimizer(req.weights)
+    return OptimalAlliancesResponse(
+        event_key=event_key,
+        alliances=optimizer.compute_optimal_alliances(snapshot, req.alliance_size),
+    )
+
+
+def _complements(event_key: str, snapshot: list[TeamEvent], req: DashboardRequest):
+    return ComplementFinder().find_all_complements(snapshot, req.top_n)
+
+
+def _complement(event_key: str, snapshot: list[TeamEvent], req: DashboardRequest):
+    target = next((te for te in snapshot if te.team_key == req.team_key), None)
+    if target is None:
+        raise LookupError(f"Team {req.team_key} not found at event {event_key}")
+    return ComplementFinder().find_complements(target, snapshot)
+
+
+# name -> (result_cache key, builder, response type)
+SECTIONS: dict[str, tuple[Callable[[DashboardRequest], tuple], Callable, Any]] = {
+    "teams": (lambda req: ("teams", None), _teams, list[TeamEventResponse]),
+    "alliances": (
+        lambda req: ("optimal-alliances", normalize_weights(req.weights), req.alliance_size),
+        _alliances,
+        OptimalAlliancesResponse,
+    ),
+    "complements": (
+        lambda req: ("complements", req.top_n),
+        _complements,
+        list[ComplementResponse],
+    ),
+    "complement": (
+        lambda req: ("complement", req.team_key),
+        _complement,
+        ComplementResponse,
+    ),
+}
+
+
+def validate_sections(req: DashboardRequest) -> list[str]:
+    """Requested section names, deduplicated; raises ValueError if invalid."""
+    names = list(dict.fromkeys(req.sections))
+    unknown = [n for n in names if n not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(unknown)}")
+    if not names:
+        raise ValueError("Request at least one section")
+    if "complement" in names and not req.team_key:
+        raise ValueError("The complement section needs team_key")
+    return names
+
+
+async def _section(
+    name: str,
+    event_key: str,
+    version: int,
+    snapshot: list[TeamEvent],
+    req: DashboardRequest,
+) -> tuple[str, bytes | None, str | None]:
+    key_of, builder, response_type = SECTIONS[name]
+
+    async def build():
+        return await asyncio.to_thread(builder, event_key, snapshot, req)
+
+    with span(f"section {name}"):
+        try:
+            body, _, _ = await cached_body(
+                event_key, key_of(req), build, response_type, version
+            )
+        except LookupError as e:
+            return name, None, str(e)
+    return name, body, None
+
+
+async def compute_sections(
+    event_key: str,
+    version: int,
+    snapshot: list[TeamEvent],
+    req: DashboardRequest,
+    names: list[str],
+) -> AsyncIterator[tuple[str, bytes | None, str | None]]:
+    """Yield (name, JSON bytes, None) or (name, None, error) as sections finish.
+
+    version is the data version load_snapshot recorded for snapshot.
+    """
+    tasks = [
+        asyncio.create_task(_section(n, event_key, version, snapshot, req)) for n in names
+    ]
+    try:
+        for done in asyncio.as_completed(tasks):
+            yield await done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def ndjson_line(name: str, body: bytes | None, error: str | None) -> bytes:
+    if error is not None:
+        return json.dumps({"section": name, "error": error}).encode() + b"\n"
+    return b'{"section":' + json.dumps(name).encode() + b',"data":' + body + b"}\n"
+
+
+def assemble(event_key: str, results: dict[str, tuple[bytes | None, str | None]]) -> bytes:
+    """Splice cached section bytes into one JSON object without re-encoding."""
+    parts = [b'{"event_key":' + json.dumps(event_key).encode()]
+    errors = {}
+    for name, (body, error) in results.items():
+        if error is not None:
+            errors[name] = error
+        else:
+            parts.append(json.dumps(name).encode() + b":" + body)
+    parts.append(b'"errors":' + json.dumps(errors).encode())
+    return b",".join(parts) + b"}"
@@ -1,6 +1,8 @@
 import uuid
+from dataclasses import dataclass, replace
 from enum import Enum
 
+from app.metrics import solver_iterations, timed
 from app.models.team_event import TeamEvent
 from app.schemas.prediction import DraftPick, DraftStateResponse
 from app.schemas.team import TeamEventResponse
@@ -14,28 +16,146 @@ class DraftPhase(Enum):
     COMPLETE = "complete"
 
 
+@dataclass(frozen=True)
+class DraftSnapshot:
+    """Immutable team list shared by every branch of a draft."""
+
+    event_key: str
+    num_rounds: int
+    num_alliances: int
+    teams: tuple[TeamEvent, ...]
+    index: dict[str, int]
+
+
+@dataclass(frozen=True)
+class _PickNode:
+    round: int
+    alliance_number: int
+    team_idx: int
+    prev: "_PickNode | None"
+
+
+@dataclass(frozen=True)
+class DraftState:
+    """One point in a draft. States are never mutated, so branches share them.
+
+    ``alliances`` holds snapshot indices, ``taken`` is a bitmask over the
+    snapshot and the pick history is a linked list, so a new state only
+    allocates the alliance tuple it changes.
+    """
+
+    alliances: tuple[tuple[int, ...], ...]
+    taken: int
+    phase: DraftPhase
+    current_idx: int
+    last_pick: _PickNode | None = None
+
+
+@dataclass(frozen=True)
+class _Frame:
+    state: DraftState
+    prev: "_Frame | None"
+
+
+def draft_order(team_events: list[TeamEvent]) -> list[TeamEvent]:
+    """Seed order for a draft: ranked teams first, then by EPA."""
+    return sorted(
+        team_events,
+        key=lambda te: (te.rank if te.rank else 999, -(te.epa or 0)),
+    )
+
+
+def _pick_order(phase: DraftPhase, num_alliances: int) -> list[int]:
+    if phase == DraftPhase.ROUND_2_REVERSE:
+        return list(range(num_alliances, 0, -1))
+    return list(range(1, num_alliances + 1))
+
+
 class DraftSession:
     def __init__(
         self, event_key: str, team_events: list[TeamEvent], num_rounds: int = 2
     ):
-        self.session_id = str(uuid.uuid4())
-        self.event_key = event_key
-        self.num_rounds = num_rounds
+        sorted_teams = draft_order(team_events)
+        num_alliances = min(8, len(sorted_teams))
 
-        sorted_teams = sorted(
-            team_events,
-            key=lambda te: (te.rank if te.rank else 999, -(te.epa or 0)),
+        self.session_id = str(uuid.uuid4())
+        self.parent_id: str | None = None
+        self.snapshot = DraftSnapshot(
+            event_key=event_key,
+            num_rounds=num_rounds,
+            num_alliances=num_alliances,
+            teams=tuple(sorted_teams),
+            index={te.team_key: i for i, te in enumerate(sorted_teams)},
+        )
+        self.state = DraftState(
+            alliances=tuple((i,) for i in range(num_alliances)),
+            taken=(1 << num_alliances) - 1,
+            phase=DraftPhase.ROUND_1_FORWARD,
+            current_idx=0,
         )
+        self._undo: _Frame | None = None
+        self._redo: _Frame | None = None
 
-        num_alliances = min(8, len(sorted_teams))
-        self.alliances: dict[int, list[TeamEvent]] = {
-            i: [sorted_teams[i - 1]] for i in range(1, num_alliances + 1)
+    @property
+    def event_key(self) -> str:
+        return self.snapshot.event_key
+
+    @property
+    def num_rounds(self) -> int:
+        return self.snapshot.num_rounds
+
+    @property
+    def phase(self) -> DraftPhase:
+        return self.state.phase
+
+    @property
+    def current_idx(self) -> int:
+        return self.state.current_idx
+
+    @property
+    def pick_order(self) -> list[int]:
+        return _pick_order(self.state.phase, self.snapshot.num_alliances)
+
+    @property
+    def alliances(self) -> dict[int, list[TeamEvent]]:
+        teams = self.snapshot.teams
+        return {
+            i + 1: [teams[idx] for idx in members]
+            for i, members in enumerate(self.state.alliances)
         }
-        self.available = sorted_teams[num_alliances:]
-        self.phase = DraftPhase.ROUND_1_FORWARD
-        self.current_idx = 0
-        self.pick_order = list(range(1, num_alliances + 1))
-        self.pick_history: list[dict] = []
+
+    @property
+    def available(self) -> list[TeamEvent]:
+        taken = self.state.taken
+        return [
+            te
+            for i, te in enumerate(self.snapshot.teams)
+            if not (taken >> i) & 1
+        ]
+
+    @property
+    def pick_history(self) -> list[dict]:
+        history = []
+        node = self.state.last_pick
+        while node is not None:
+            history.append(
+                {
+                    "round": node.round,
+                    "alliance_number": node.alliance_number,
+                    "team_key": self.snapshot.teams[node.team_idx].team_key,
+                }
+            )
+            node = node.prev
+        history.reverse()
+        return history
+
+    @property
+    def can_undo(self) -> bool:
+        return self._undo is not None
+
+    @property
+    def can_redo(self) -> bool:
+        return self._redo is not None
 
     @property
     def current_picking_alliance(self) -> int:
@@ -53,37 +173,70 @@ class DraftSession:
             return 3
         return 0
 
+    def fork(self) -> "DraftSession":
+        """Branch this session. The branch shares all state with its parent."""
+        branch = object.__new__(DraftSession)
+        branch.session_id = str(uuid.uuid4())
+        branch.parent_id = self.session_id
+        branch.snapshot = self.snapshot
+        branch.state = self.state
+        branch._undo = self._undo
+        branch._redo = self._redo
+        return branch
+
+    def undo(self) -> "DraftSession":
+        if self._undo is None:
+            raise ValueError("Nothing to undo")
+        self._redo = _Frame(self.state, self._redo)
+        self.state = self._undo.state
+        self._undo = self._undo.prev
+        return self
+
+    def redo(self) -> "DraftSession":
+        if self._redo is None:
+            raise ValueError("Nothing to redo")
+        self._undo = _Frame(self.state, self._undo)
+        self.state = self._redo.state
+        self._redo = self._redo.prev
+        return self
+
     def make_pick(self, team_key: str) -> "DraftSession":
         if self.phase == DraftPhase.COMPLETE:
             raise ValueError("Draft is complete")
 
-        picked = next(
-            (t for t in self.available if t.team_key == team_key), None
-        )
-        if not picked:
+        idx = self.snapshot.index.get(team_key)
+        if idx is None or (self.state.taken >> idx) & 1:
             raise ValueError(f"Team {team_key} is not available")
 
         alliance_num = self.current_picking_alliance
-        self.alliances[alliance_num].append(picked)
-        self.available = [t for t in self.available if t.team_key != team_key]
-
-        self.pick_history.append(
-            {
-                "round": self.current_round,
-                "alliance_number": alliance_num,
-                "team_key": team_key,
-            }
+        alliances = list(self.state.alliances)
+        alliances[alliance_num - 1] = alliances[alliance_num - 1] + (idx,)
+
+        picked = replace(
+            self.state,
+            alliances=tuple(alliances),
+            taken=self.state.taken | (1 << idx),
+            last_pick=_PickNode(
+                round=self.current_round,
+                alliance_number=alliance_num,
+                team_idx=idx,
+                prev=self.state.last_pick,
+            ),
         )
 
-        self._advance()
+        self._undo = _Frame(self.state, self._undo)
+        self._redo = None
+        self.state = self._advance(picked)
         return self
 
+    @timed("auto_pick")
     def auto_pick(self) -> "DraftSession":
         if self.phase == DraftPhase.COMPLETE:
             raise ValueError("Draft is complete")
 
         alliance_num = self.current_picking_alliance
         current_members = self.alliances[alliance_num]
+        available = self.available
         optimizer = AllianceOptimizer(AllianceWeights())
 
         best_team = None
@@ -95,10 +248,10 @@ class DraftSession:
             # Round 1: picking 1st partner. Look ahead - for each candidate,
             # find the best possible 3rd pick from remaining pool and score
             # the full 3-team alliance.
-            for candidate in self.available:
+            for candidate in available:
                 cand_score = score_team(candidate)
                 remaining = [
-                    t for t in self.available if t.team_key != candidate.team_key
+                    t for t in available if t.team_key != candidate.team_key
                 ]
                 # Find the best 3rd team to pair with this candidate
                 best_third_score = -float("inf")
@@ -114,35 +267,39 @@ class DraftSession:
             # Round 2+: picking to complete the alliance. Score the full
             # alliance with synergy, complement coverage, etc.
             current_scores = [score_team(t) for t in current_members]
-            for candidate in self.available:
+            for candidate in available:
                 trial = current_scores + [score_team(candidate)]
                 s = optimizer.score_alliance(trial)
                 if s > best_score:
                     best_score = s
                     best_team = candidate
 
+        scored = len(available) ** 2 if len(current_members) == 1 else len(available)
+        solver_iterations.inc(scored, solver="auto_pick")
         if best_team:
             return self.make_pick(best_team.team_key)
         raise ValueError("No available teams")
 
-    def _advance(self):
-        self.current_idx += 1
-        if self.current_idx >= len(self.pick_order):
-            self.current_idx = 0
-            num = len(self.alliances)
-            if self.phase == DraftPhase.ROUND_1_FORWARD:
-                self.phase = DraftPhase.ROUND_2_REVERSE
-                self.pick_order = list(range(num, 0, -1))
-            elif self.phase == DraftPhase.ROUND_2_REVERSE:
-                if self.num_rounds >= 3:
-                    self.phase = DraftPhase.ROUND_3_FORWARD
-                    self.pick_order = list(range(1, num + 1))
-                else:
-                    self.phase = DraftPhase.COMPLETE
-            elif self.phase == DraftPhase.ROUND_3_FORWARD:
-                self.phase = DraftPhase.COMPLETE
+    def _advance(self, state: DraftState) -> DraftState:
+        current_idx = state.current_idx + 1
+        if current_idx < self.snapshot.num_alliances:
+            return replace(state, current_idx=current_idx)
+
+        phase = state.phase
+        if phase == DraftPhase.ROUND_1_FORWARD:
+            phase = DraftPhase.ROUND_2_REVERSE
+        elif phase == DraftPhase.ROUND_2_REVERSE:
+            if self.num_rounds >= 3:
+                phase = DraftPhase.ROUND_3_FORWARD
+            else:
+                phase = DraftPhase.COMPLETE
+        elif phase == DraftPhase.ROUND_3_FORWARD:
+            phase = DraftPhase.COMPLETE
+        return replace(state, phase=phase, current_idx=0)
 
     def to_response(self) -> DraftStateResponse:
+        teams = self.snapshot.teams
+
         def te_to_resp(te: TeamEvent) -> TeamEventResponse:
             return TeamEventResponse.model_validate(te)
 
@@ -155,14 +312,7 @@ class DraftSession:
             DraftPick(
                 round=p["round"],
                 alliance_number=p["alliance_number"],
-                team=te_to_resp(
-                    next(
-                        t
-                        for alliance in self.alliances.values()
-                        for t in alliance
-                        if t.team_key == p["team_key"]
-                    )
-                ),
+                team=te_to_resp(teams[self.snapshot.index[p["team_key"]]]),
             )
             for p in self.pick_history
         ]
@@ -181,6 +331,9 @@ class DraftSession:
             available_teams=[te_to_resp(t) for t in self.available],
             pick_history=history,
             is_complete=self.phase == DraftPhase.COMPLETE,
+            parent_session_id=self.parent_id,
+            can_undo=self.can_undo,
+            can_redo=self.can_redo,
         )
 
 
@@ -196,5 +349,11 @@ def create_session(
     return session
 
 
+def fork_session(session: DraftSession) -> DraftSession:
+    branch = session.fork()
+    _sessions[branch.session_id] = branch
+    return branch
+
+
 def get_session(session_id: str) -> DraftSession | None:
     return _sessions.get(session_id)
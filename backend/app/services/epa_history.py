@@ -0,0 +1,205 @@
+"""Delta-encoded EPA history per team and event.
+
+SyncService overwrites TeamEvent EPA in place; before it does, it passes the
+old and new values here and only the columns that changed are appended to
+epa_history in one bulk INSERT. Every KEYFRAME_INTERVAL rows a team's
+history gets a full row (a keyframe, changed == ALL_CHANGED), so a range
+read folds the deltas back into full states starting from the last keyframe
+at or before the range, not from the first row. Results can be downsampled
+into fixed-width rollup buckets.
+"""
+import time
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.models import EpaHistory
+from app.schemas.team import EpaPoint, EpaRollup, EpaTrend
+
+EPA_COLUMNS = ("epa", "auto_epa", "teleop_epa", "endgame_epa", "rp_1_epa", "rp_2_epa")
+ALL_CHANGED = (1 << len(EPA_COLUMNS)) - 1
+KEYFRAME_INTERVAL = 32
+
+
+def epa_delta(old: dict | None, new: dict) -> tuple[int, dict] | None:
+    """(changed bitmask, column values) from old to new, None if unchanged.
+
+    old=None starts a history, so every column is recorded.
+    """
+    if old is None:
+        if all(new.get(col) is None for col in EPA_COLUMNS):
+            return None
+        return ALL_CHANGED, {col: new.get(col) for col in EPA_COLUMNS}
+    mask = 0
+    values = dict.fromkeys(EPA_COLUMNS)
+    for i, col in enumerate(EPA_COLUMNS):
+        if old.get(col) != new.get(col):
+            mask |= 1 << i
+            values[col] = new.get(col)
+    return (mask, values) if mask else None
+
+
+def record_changes(
+    db: Session,
+    changes: list[tuple[str, str, dict | None, dict]],
+    ts: int | None = None,
+) -> int:
+    """Append (team_key, event_key, old, new) EPA changes; returns rows added.
+
+    Runs inside the caller's transaction.
+    """
+    if not changes:
+        return 0
+    ts = int(time.time()) if ts is None else ts
+    since_keyframe = _rows_since_keyframe(db, sorted({c[1] for c in changes}))
+    rows = []
+    for team_key, event_key, old, new in changes:
+        pair = (team_key, event_key)
+        # Pairs with no history yet (e.g. rows synced before this table
+        # existed) start with a full row, so folding never misses a column
+        delta = epa_delta(old if pair in since_keyframe else None, new)
+        if delta is None:
+            continue
+        mask, values = delta
+        if since_keyframe.get(pair, 0) >= KEYFRAME_INTERVAL:
+            mask, values = ALL_CHANGED, {col: new.get(col) for col in EPA_COLUMNS}
+        rows.append(
+            {"event_key": event_key, "team_key": team_key, "ts": ts, "changed": mask, **values}
+        )
+    if rows:
+        db.execute(insert(EpaHistory), rows)
+    return len(rows)
+
+
+def _rows_since_keyframe(db: Session, event_keys: list[str]) -> dict[tuple[str, str], int]:
+    """(team_key, event_key) -> rows from its latest keyframe on, inclusive."""
+    latest = (
+        db.query(
+            EpaHistory.team_key,
+            EpaHistory.event_key,
+            func.max(EpaHistory.id).label("keyframe_id"),
+        )
+        .filter(EpaHistory.event_key.in_(event_keys), EpaHistory.changed == ALL_CHANGED)
+        .group_by(EpaHistory.team_key, EpaHistory.event_key)
+        .subquery()
+    )
+    counts = (
+        db.query(EpaHistory.team_key, EpaHistory.event_key, func.count())
+        .join(
+            latest,
+            (EpaHistory.team_key == latest.c.team_key)
+            & (EpaHistory.event_key == latest.c.event_key)
+            & (EpaHistory.id >= latest.c.keyframe_id),
+        )
+        .group_by(EpaHistory.team_key, EpaHistory.event_key)
+    )
+    return {(team_key, event_key): n for team_key, event_key, n in counts}
+
+
+def _fold(rows: list[EpaHistory]) -> list[EpaPoint]:
+    """Full EPA state after each delta row (rows for one team, in order)."""
+    state = dict.fromkeys(EPA_COLUMNS)
+    points = []
+    for row in rows:
+        for i, col in enumerate(EPA_COLUMNS):
+            if row.changed & (1 << i):
+                state[col] = getattr(row, col)
+        points.append(EpaPoint(ts=row.ts, **state))
+    return points
+
+
+def _load(
+    db: Session,
+    event_key: str,
+    team_key: str | None,
+    start: int | None,
+    end: int | None,
+) -> dict[str, list[EpaPoint]]:
+    """Folded points per team up to end, from each team's last keyframe at or
+    before start (so the state carried into the range is still complete)."""
+    q = db.query(EpaHistory).filter(EpaHistory.event_key == event_key)
+    if team_key is not None:
+        q = q.filter(EpaHistory.team_key == team_key)
+    if start is not None:
+        keyframes = (
+            db.query(EpaHistory.team_key, func.max(EpaHistory.ts).label("ts"))
+            .filter(
+                EpaHistory.event_key == event_key,
+                EpaHistory.changed == ALL_CHANGED,
+                EpaHistory.ts <= start,
+            )
+            .group_by(EpaHistory.team_key)
+            .subquery()
+        )
+        # Rows sharing the keyframe's ts but written before it are harmless:
+        # the keyframe overwrites every column
+        q = q.outerjoin(keyframes, EpaHistory.team_key == keyframes.c.team_key).filter(
+            keyframes.c.ts.is_(None) | (EpaHistory.ts >= keyframes.c.ts)
+        )
+    if end is not None:
+        q = q.filter(EpaHistory.ts <= end)
+    by_team: dict[str, list[EpaHistory]] = {}
+    for row in q.order_by(EpaHistory.team_key, EpaHistory.ts, EpaHistory.id):
+        by_team.setdefault(row.team_key, []).append(row)
+    return {key: _fold(rows) for key, rows in by_team.items()}
+
+
+def _split(points: list[EpaPoint], start: int | None) -> tuple[EpaPoint | None, list[EpaPoint]]:
+    """(state carried in at start, points inside the range)."""
+    if start is None:
+        return None, points
+    before = [p for p in points if p.ts < start]
+    return (before[-1] if before else None), [p for p in points if p.ts >= start]
+
+
+def downsample(points: list[EpaPoint], resolution: int) -> list[EpaRollup]:
+    """Bucket points into resolution-second windows aligned to the epoch."""
+    rollups: list[EpaRollup] = []
+    for p in points:
+        bucket = p.ts - p.ts % resolution
+        if not rollups or rollups[-1].start != bucket:
+            rollups.append(EpaRollup(start=bucket, samples=0, epa_open=p.epa))
+        r = rollups[-1]
+        r.samples += 1
+        r.epa_close = p.epa
+        if p.epa is not None:
+            r.epa_min = p.epa if r.epa_min is None else min(r.epa_min, p.epa)
+            r.epa_max = p.epa if r.epa_max is None else max(r.epa_max, p.epa)
+        r.auto_epa, r.teleop_epa, r.endgame_epa = p.auto_epa, p.teleop_epa, p.endgame_epa
+    return rollups
+
+
+def team_history(
+    db: Session,
+    event_key: str,
+    team_key: str,
+    start: int | None = None,
+    end: int | None = None,
+) -> tuple[EpaPoint | None, list[EpaPoint]]:
+    points = _load(db, event_key, team_key, start, end).get(team_key, [])
+    return _split(points, start)
+
+
+def event_trends(db: Session, event_key: str, since: int | None = None) -> list[EpaTrend]:
+    """EPA change per team since a time (default: first record), biggest first."""
+    trends = []
+    for team_key, points in _load(db, event_key, None, since, None).items():
+        initial, inside = _split(points, since)
+        first = initial or (inside[0] if inside else None)
+        last = inside[-1] if inside else initial
+        start_epa = first.epa if first else None
+        end_epa = last.epa if last else None
+        change = None
+        if start_epa is not None and end_epa is not None:
+            change = round(end_epa - start_epa, 4)
+        trends.append(
+            EpaTrend(
+                team_key=team_key,
+                start_epa=start_epa,
+                end_epa=end_epa,
+                change=change,
+                samples=len(inside),
+            )
+        )
+    trends.sort(key=lambda t: (t.change is None, -(t.change or 0.0), t.team_key))
+    return trends
@@ -0,0 +1,138 @@
+"""Cross-node cache invalidation over Postgres LISTEN/NOTIFY.
+
+Each app node keeps its own result_cache, keyed by per-scope data versions.
+With a Postgres DATABASE_URL, every local bump_data_version() is published
+on DB_NOTIFY_CHANNEL, and the other nodes bump the same scope when they hear
+it. A node that loses its listening connection clears its result cache on
+reconnect, because notifications sent in the meantime are lost.
+
+Bumps only queue their scope: a publisher thread sends whatever has queued
+up in one round-trip, so the event loop never waits on Postgres and a season
+ingest bumping hundreds of events costs a handful of transactions.
+"""
+import logging
+import os
+import queue
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.database import engine
+from app.metrics import data_version_notifications
+from app.services.result_cache import bump_data_version, bump_listeners, result_cache
+
+logger = logging.getLogger(__name__)
+
+# Distinguishes this process's own notifications from other nodes'
+NODE_ID = os.urandom(4).hex()
+
+
+def publish(scopes: list[str]):
+    """Notify every scope in one transaction."""
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "SELECT pg_notify(:channel, :node || ':' || scope)"
+                    " FROM unnest(CAST(:scopes AS text[])) AS scope"
+                ),
+                {"channel": settings.DB_NOTIFY_CHANNEL, "node": NODE_ID, "scopes": scopes},
+            )
+    except SQLAlchemyError as e:
+        # Other nodes keep serving their cached results for these scopes
+        logger.warning("Could not publish data versions for %s: %s", ", ".join(scopes), e)
+        return
+    data_version_notifications.inc(len(scopes), direction="sent")
+
+
+def handle(payload: str):
+    node, _, scope = payload.partition(":")
+    if node == NODE_ID or not scope:
+        return
+    data_version_notifications.inc(direction="received")
+    bump_data_version(scope, notify=False)
+
+
+class InvalidationListener:
+    """Daemon threads holding a dedicated LISTEN connection, with reconnects,
+    and publishing queued local bumps."""
+
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn
+        self.channel = channel
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Scopes to publish; None tells the publisher to finish
+        self._pending: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+        self._publisher: threading.Thread | None = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._publisher = threading.Thread(target=self._publish_pending, daemon=True)
+        self._publisher.start()
+
+    def stop(self):
+        if self.submit in bump_listeners:
+            bump_listeners.remove(self.submit)
+        self._stop.set()
+        # Queued last, so bumps made before shutdown are still sent
+        self._pending.put(None)
+        for thread in (self._thread, self._publisher):
+            if thread is not None:
+                thread.join(timeout=5)
+
+    def submit(self, scope: str):
+        """bump_listeners hook; returns at once."""
+        self._pending.put(scope)
+
+    def _publish_pending(self):
+        while True:
+            item = self._pending.get()
+            scopes: dict[str, None] = {}
+            while item is not None:
+                scopes[item] = None
+                try:
+                    item = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+            if scopes:
+                publish(list(scopes))
+            if item is None:
+                return
+
+    def _run(self):
+        import psycopg
+        from psycopg import sql
+
+        backoff = 1.0
+        connected_before = False
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self.dsn, autocommit=True) as conn:
+                    conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                    if connected_before:
+                        result_cache.clear()
+                    connected_before = True
+                    backoff = 1.0
+                    while not self._stop.is_set():
+                        for notify in conn.notifies(timeout=1.0):
+                            handle(notify.payload)
+            except psycopg.Error as e:
+                logger.warning("Invalidation listener disconnected: %s", e)
+                if self._stop.wait(backoff):
+                    return
+                backoff = min(backoff * 2, 30.0)
+
+
+def start_listener() -> InvalidationListener | None:
+    """Publish local bumps and listen for other nodes' (Postgres only)."""
+    if engine.dialect.name != "postgresql":
+        return None
+    dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    listener = InvalidationListener(dsn, settings.DB_NOTIFY_CHANNEL)
+    listener.start()
+    bump_listeners.append(listener.submit)
+    return listener
@@ -0,0 +1,199 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.metrics import solver_iterations, timed
+from app.models.team_event import TeamEvent
+from app.schemas.prediction import AllianceWeights
+from app.services.alliance_optimizer import score_team
+from app.services.draft_simulator import draft_order
+
+# Number of set bits for each 3-bit component mask (auto, teleop, endgame).
+_POPCOUNT = np.array([0, 1, 1, 2, 1, 2, 2, 3], dtype=np.float64)
+
+# Per-round chance that a picked team declines; later rounds never decline
+DEFAULT_DECLINE_RATES = [0.05]
+
+
+@dataclass
+class PickSimulationResult:
+    team_keys: list[str]
+    slots: list[tuple[int, int]]
+    availability: np.ndarray
+    pick_probability: np.ndarray
+    num_simulations: int
+
+
+@dataclass
+class _EventArrays:
+    """Per-team features in draft order, as flat arrays."""
+
+    num_alliances: int
+    auto: np.ndarray
+    teleop: np.ndarray
+    endgame: np.ndarray
+    epa: np.ndarray
+    consistency: np.ndarray
+    positive_mask: np.ndarray
+    leader_bit: np.ndarray
+
+
+def _event_arrays(team_events: list[TeamEvent], num_alliances: int) -> _EventArrays:
+    scores = [score_team(te) for te in team_events]
+    comps = np.array(
+        [[s.auto_epa, s.teleop_epa, s.endgame_epa] for s in scores],
+        dtype=np.float64,
+    ).reshape(-1, 3)
+    positive = (comps > 0).astype(np.int64)
+    # argmax returns the first maximum, matching max() in compute_synergy
+    leaders = np.argmax(comps, axis=1) if len(scores) else np.zeros(0, np.int64)
+    return _EventArrays(
+        num_alliances=num_alliances,
+        auto=comps[:, 0],
+        teleop=comps[:, 1],
+        endgame=comps[:, 2],
+        epa=np.array([s.epa for s in scores], dtype=np.float64),
+        consistency=np.array([s.consistency for s in scores], dtype=np.float64),
+        positive_mask=positive[:, 0] | positive[:, 1] << 1 | positive[:, 2] << 2,
+        leader_bit=(1 << leaders).astype(np.int64),
+    )
+
+
+def pick_slots(num_alliances: int, num_rounds: int) -> list[tuple[int, int]]:
+    """(round, alliance_number) for every pick, in serpentine order."""
+    slots = []
+    for rnd in range(1, num_rounds + 1):
+        order = range(1, num_alliances + 1)
+        if rnd % 2 == 0:
+            order = reversed(order)
+        slots.extend((rnd, a) for a in order)
+    return slots
+
+
+def _simulate(
+    arrays: _EventArrays,
+    slots: list[tuple[int, int]],
+    weights: tuple[float, float, float, float, float],
+    num_simulations: int,
+    temperature: float,
+    decline_rates: tuple[float, ...],
+    seed: int | None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Run the drafts in lockstep and count availability per slot.
+
+    Every simulation is a row in the state arrays, so each pick slot is a
+    handful of vectorized operations over (simulations x teams).
+    """
+    rng = np.random.default_rng(seed)
+    w_auto, w_teleop, w_endgame, w_consistency, w_synergy = weights
+    num_teams = len(arrays.epa)
+    num_alliances = arrays.num_alliances
+    sims = np.arange(num_simulations)
+
+    available = np.ones((num_simulations, num_teams), dtype=bool)
+    available[:, :num_alliances] = False
+
+    # Running per-alliance sums, seeded with the captains.
+    captains = np.arange(num_alliances)
+    auto = np.tile(arrays.auto[captains], (num_simulations, 1))
+    teleop = np.tile(arrays.teleop[captains], (num_simulations, 1))
+    endgame = np.tile(arrays.endgame[captains], (num_simulations, 1))
+    epa = np.tile(arrays.epa[captains], (num_simulations, 1))
+    consistency = np.tile(arrays.consistency[captains], (num_simulations, 1))
+    positive = np.tile(arrays.positive_mask[captains], (num_simulations, 1))
+    leaders = np.tile(arrays.leader_bit[captains], (num_simulations, 1))
+    # Alliances stay short in drafts where every candidate declined
+    sizes = np.ones((num_simulations, num_alliances), dtype=np.int64)
+
+    avail_counts = np.zeros((len(slots), num_teams), dtype=np.int64)
+    pick_counts = np.zeros((len(slots), num_teams), dtype=np.int64)
+
+    for slot_idx, (rnd, alliance_num) in enumerate(slots):
+        a = alliance_num - 1
+        avail_counts[slot_idx] = available.sum(axis=0)
+
+        size = sizes[:, a, None] + 1
+        new_epa = epa[:, a, None] + arrays.epa
+        synergy = _POPCOUNT[positive[:, a, None] | arrays.positive_mask] + 0.5 * _POPCOUNT[
+            leaders[:, a, None] | arrays.leader_bit
+        ]
+        scores = (
+            w_auto * (auto[:, a, None] + arrays.auto)
+            + w_teleop * (teleop[:, a, None] + arrays.teleop)
+            + w_endgame * (endgame[:, a, None] + arrays.endgame)
+            + w_consistency * (consistency[:, a, None] + arrays.consistency) / size * new_epa
+            + w_synergy * synergy * new_epa
+        )
+
+        decline_rate = decline_rates[rnd - 1] if rnd - 1 < len(decline_rates) else 0.0
+        picked = np.full(num_simulations, -1, dtype=np.int64)
+        pending = available.any(axis=1)
+
+        while pending.any():
+            rows = sims[pending]
+            logits = np.where(available[rows], scores[rows] / temperature, -np.inf)
+            logits -= logits.max(axis=1, keepdims=True)
+            cdf = np.cumsum(np.exp(logits), axis=1)
+            draw = rng.random(len(rows)) * cdf[:, -1]
+            choice = (cdf < draw[:, None]).sum(axis=1)
+
+            # A declining team can no longer be picked by anyone.
+            declined = rng.random(len(rows)) < decline_rate
+            available[rows, choice] = False
+            accepted = rows[~declined]
+            picked[accepted] = choice[~declined]
+
+            pending[accepted] = False
+            pending &= available.any(axis=1)
+
+        done = picked >= 0
+        rows, teams = sims[done], picked[done]
+        pick_counts[slot_idx] = np.bincount(teams, minlength=num_teams)
+        auto[rows, a] += arrays.auto[teams]
+        teleop[rows, a] += arrays.teleop[teams]
+        endgame[rows, a] += arrays.endgame[teams]
+        epa[rows, a] += arrays.epa[teams]
+        consistency[rows, a] += arrays.consistency[teams]
+        positive[rows, a] |= arrays.positive_mask[teams]
+        leaders[rows, a] |= arrays.leader_bit[teams]
+        sizes[rows, a] += 1
+
+    return avail_counts, pick_counts
+
+
+@timed("simulate_picks")
+def simulate_picks(
+    team_events: list[TeamEvent],
+    num_simulations: int = 10000,
+    num_rounds: int = 2,
+    weights: AllianceWeights | None = None,
+    temperature: float = 10.0,
+    decline_rates: list[float] | None = None,
+    seed: int | None = None,
+) -> PickSimulationResult:
+    """Monte Carlo alliance selection.
+
+    Each pick is sampled from a softmax over ``score_alliance`` of the
+    picking alliance plus the candidate; a sampled team declines with the
+    round's decline rate and is then out of the draft. Rounds past the end
+    of ``decline_rates`` never decline.
+    """
+    ordered = draft_order(team_events)
+    num_alliances = min(8, len(ordered))
+    arrays = _event_arrays(ordered, num_alliances)
+    slots = pick_slots(num_alliances, num_rounds)
+    w = weights or AllianceWeights()
+    weight_tuple = (w.auto, w.teleop, w.endgame, w.consistency, w.synergy)
+    rates = tuple(decline_rates if decline_rates is not None else DEFAULT_DECLINE_RATES)
+
+    solver_iterations.inc(num_simulations, solver="simulate_picks")
+    avail_counts, pick_counts = _simulate(
+        arrays, slots, weight_tuple, num_simulations, temperature, rates, seed
+    )
+    return PickSimulationResult(
+        team_keys=[te.team_key for te in ordered],
+        slots=slots,
+        availability=avail_counts / num_simulations,
+        pick_probability=pick_counts / num_simulations,
+        num_simulations=num_simulations,
+    )
@@ -0,0 +1,187 @@
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+
+from app.config import settings
+
+try:
+    import zstandard
+except ImportError:  # optional: fall back to gzip
+    zstandard = None
+
+_CHUNK = 64 * 1024
+
+
+class ArchiveMiss(LookupError):
+    """Offline mode asked for a URL the archive has never stored."""
+
+
+class _ObjectWriter:
+    """Hashes and compresses a body chunk by chunk into a temp file."""
+
+    def __init__(self, archive: "ResponseArchive", url: str, etag: str | None):
+        self.archive = archive
+        self.url = url
+        self.etag = etag
+        self.hash = hashlib.sha256()
+        fd, self.tmp_path = tempfile.mkstemp(dir=archive.root / "tmp")
+        self.raw = os.fdopen(fd, "wb")
+        if archive.codec == "zstd":
+            self.out = zstandard.ZstdCompressor(level=10).stream_writer(self.raw)
+        else:
+            self.out = gzip.GzipFile(fileobj=self.raw, mode="wb", mtime=0)
+
+    def write(self, chunk: bytes):
+        self.hash.update(chunk)
+        self.out.write(chunk)
+
+    def commit(self) -> str:
+        self.out.close()
+        if not self.raw.closed:
+            self.raw.close()
+        digest = self.hash.hexdigest()
+        self.archive._store_object(digest, self.tmp_path)
+        self.archive._write_ref(self.url, digest, self.etag)
+        return digest
+
+    def abort(self):
+        self.out.close()
+        if not self.raw.closed:
+            self.raw.close()
+        Path(self.tmp_path).unlink(missing_ok=True)
+
+
+class ResponseArchive:
+    """Content-addressed, compressed store of raw upstream response bodies.
+
+    objects/ab/<sha256>.<gz|zst> holds each distinct body once; refs/ maps
+    a request URL to the latest digest and its ETag. Objects are read through
+    mmap and the least recently used ones are evicted past max_bytes.
+    """
+
+    def __init__(self, root: str, max_bytes: int, codec: str | None = None):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.codec = codec or ("zstd" if zstandard else "gzip")
+        if self.codec == "zstd" and zstandard is None:
+            raise RuntimeError("zstandard is not installed")
+        self.ext = ".zst" if self.codec == "zstd" else ".gz"
+        for sub in ("objects", "refs", "tmp"):
+            (self.root / sub).mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.total_bytes = sum(p.stat().st_size for p in self._objects())
+
+    def _objects(self) -> Iterator[Path]:
+        return (self.root / "objects").glob("*/*")
+
+    def _object_path(self, digest: str) -> Path | None:
+        for ext in (".zst", ".gz"):
+            path = self.root / "objects" / digest[:2] / f"{digest}{ext}"
+            if path.exists():
+                return path
+        return None
+
+    def _ref_path(self, url: str) -> Path:
+        return self.root / "refs" / f"{hashlib.sha1(url.encode()).hexdigest()}.json"
+
+    def _store_object(self, digest: str, tmp_path: str):
+        with self._lock:
+            existing = self._object_path(digest)
+            if existing is not None:
+                # Unchanged payload: keep the one copy, mark it recently used
+                Path(tmp_path).unlink(missing_ok=True)
+                os.utime(existing)
+                return
+            path = self.root / "objects" / digest[:2] / f"{digest}{self.ext}"
+            path.parent.mkdir(exist_ok=True)
+            os.replace(tmp_path, path)
+            self.total_bytes += path.stat().st_size
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Oldest access first; keep going until 90% of the cap for headroom
+        objects = sorted(self._objects(), key=lambda p: p.stat().st_mtime)
+        target = self.max_bytes * 0.9
+        for path in objects:
+            if self.total_bytes <= target:
+                break
+            size = path.stat().st_size
+            path.unlink(missing_ok=True)
+            self.total_bytes -= size
+
+    def _write_ref(self, url: str, digest: str, etag: str | None):
+        ref = {"url": url, "digest": digest, "etag": etag, "fetched_at": time.time()}
+        tmp = self._ref_path(url).with_suffix(".tmp")
+        tmp.write_text(json.dumps(ref))
+        os.replace(tmp, self._ref_path(url))
+
+    def ref(self, url: str) -> dict | None:
+        try:
+            ref = json.loads(self._ref_path(url).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+        if self._object_path(ref["digest"]) is None:
+            return None
+        return ref
+
+    def refs(self) -> Iterator[dict]:
+        for path in (self.root / "refs").glob("*.json"):
+            try:
+                yield json.loads(path.read_text())
+            except ValueError:
+                continue
+
+    def writer(self, url: str, etag: str | None = None) -> _ObjectWriter:
+        return _ObjectWriter(self, url, etag)
+
+    def put(self, url: str, body: bytes, etag: str | None = None) -> str:
+        w = self.writer(url, etag)
+        w.write(body)
+        return w.commit()
+
+    def iter_chunks(self, url: str) -> Iterator[bytes]:
+        """Decompressed body of the latest response for url, in chunks."""
+        ref = self.ref(url)
+        path = self._object_path(ref["digest"]) if ref else None
+        if path is None:
+            raise ArchiveMiss(url)
+        try:
+            os.utime(path)
+            f = open(path, "rb")
+        except FileNotFoundError:
+            # Evicted between the ref lookup and here
+            raise ArchiveMiss(url)
+        with f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if path.suffix == ".zst":
+                reader = zstandard.ZstdDecompressor().stream_reader(mm)
+            else:
+                reader = gzip.GzipFile(fileobj=mm, mode="rb")
+            with reader:
+                while chunk := reader.read(_CHUNK):
+                    yield chunk
+
+    def get(self, url: str) -> bytes:
+        return b"".join(self.iter_chunks(url))
+
+
+_archive: ResponseArchive | None = None
+
+
+def get_archive() -> ResponseArchive | None:
+    """The process-wide archive, or None when UPSTREAM_ARCHIVE_DIR is unset."""
+    global _archive
+    if not settings.UPSTREAM_ARCHIVE_DIR:
+        return None
+    if _archive is None or str(_archive.root) != settings.UPSTREAM_ARCHIVE_DIR:
+        _archive = ResponseArchive(
+            settings.UPSTREAM_ARCHIVE_DIR, settings.UPSTREAM_ARCHIVE_MAX_BYTES
+        )
+    return _archive
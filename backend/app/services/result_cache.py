@@ -0,0 +1,119 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from pydantic import BaseModel
+
+from app.config import settings
+from app.metrics import result_cache_lookups
+from app.schemas.prediction import AllianceWeights
+
+# Data version per scope (an event key). Bumped whenever the rows a cached
+# result was computed from change, which retires every entry for the scope.
+_versions: dict[str, int] = {}
+_versions_lock = threading.Lock()
+
+
+def data_version(scope: str) -> int:
+    return _versions.get(scope, 0)
+
+
+# Called with the scope after each local bump, e.g. to tell other app nodes
+# (see app.services.invalidation)
+bump_listeners: list[Callable[[str], None]] = []
+
+
+def bump_data_version(scope: str, notify: bool = True) -> int:
+    with _versions_lock:
+        version = _versions.get(scope, 0) + 1
+        _versions[scope] = version
+    result_cache.invalidate(scope)
+    if notify:
+        for listener in bump_listeners:
+            listener(scope)
+    return version
+
+
+def normalize_weights(weights: AllianceWeights | None) -> tuple[float, ...]:
+    w = weights or AllianceWeights()
+    return tuple(round(float(v), 6) for v in w.model_dump().values())
+
+
+def _estimate_size(value: Any) -> int:
+    if isinstance(value, BaseModel):
+        return len(value.model_dump_json())
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_size(v) for v in value) + 8 * len(value)
+    return 256
+
+
+class ResultCache:
+    """LRU cache of computed responses, bounded by entry count and bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: OrderedDict[tuple, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, scope: str, key: Hashable, version: int | None = None) -> tuple:
+        return (scope, data_version(scope) if version is None else version, key)
+
+    def get(self, scope: str, key: Hashable) -> Any | None:
+        full_key = self._key(scope, key)
+        family = key[0] if isinstance(key, tuple) and key else type(key).__name__
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None:
+                self._entries.move_to_end(full_key)
+        result_cache_lookups.inc(family=str(family), result="miss" if entry is None else "hit")
+        return None if entry is None else entry[0]
+
+    def put(self, scope: str, key: Hashable, value: Any, version: int | None = None) -> None:
+        """Store value under the scope's data version as of when its inputs
+        were read (default: now).
+
+        Pass the version captured before reading: a value built across a
+        bump_data_version() would otherwise be stored, stale, under the new
+        version. Such a value is dropped instead.
+        """
+        if version is not None and version != data_version(scope):
+            return
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        full_key = self._key(scope, key, version)
+        with self._lock:
+            old = self._entries.pop(full_key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[full_key] = (value, size)
+            self.total_bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or self.total_bytes > self.max_bytes
+            ):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted
+
+    def invalidate(self, scope: str) -> None:
+        with self._lock:
+            for full_key in [k for k in self._entries if k[0] == scope]:
+                self.total_bytes -= self._entries.pop(full_key)[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+result_cache = ResultCache(
+    max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+    max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+)
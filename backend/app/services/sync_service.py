@@ -1,11 +1,72 @@
+import asyncio
 from datetime import datetime, timezone
+from typing import AsyncIterator
 
+from sqlalchemy import and_, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.models import CacheMeta, Event, Team, TeamEvent
+from app.metrics import cache_lookups, key_family
+from app.models import (
+    CacheMeta,
+    Event,
+    Match,
+    Team,
+    TeamAttendance,
+    TeamEvent,
+    TeamMatch,
+    TeamVideoSummary,
+)
+from app.services.consistency import apply_matches, apply_prior
+from app.services.epa_history import EPA_COLUMNS, record_changes
+from app.services.result_cache import bump_data_version
 from app.services.tba_client import TBAClient
 from app.services.statbotics_client import StatboticsClient
+from app.services.team_search import team_index
+from app.tracing import span
+
+
+def _parse_epa(te: dict) -> tuple[str, dict]:
+    """Statbotics team_event row -> (team_key, TeamEvent EPA columns)."""
+    team_key = f"frc{te.get('team', te.get('team_number', ''))}"
+    epa_data = te.get("epa", {})
+    total_points = epa_data.get("total_points", {})
+    breakdown = epa_data.get("breakdown", {})
+    return team_key, {
+        "epa": total_points.get("mean") if isinstance(total_points, dict) else total_points,
+        "auto_epa": breakdown.get("auto_points"),
+        "teleop_epa": breakdown.get("teleop_points"),
+        "endgame_epa": breakdown.get("endgame_points"),
+        "rp_1_epa": breakdown.get("rp_1"),
+        "rp_2_epa": breakdown.get("rp_2"),
+    }
+
+
+def _parse_match(m: dict) -> dict:
+    alliances = m.get("alliances") or {}
+    youtube = [v for v in (m.get("videos") or []) if v.get("type") == "youtube"]
+    fields = {
+        "comp_level": m.get("comp_level", ""),
+        "set_number": m.get("set_number", 1),
+        "match_number": m.get("match_number", 0),
+        "time": m.get("actual_time") or m.get("time"),
+        "youtube_key": youtube[0]["key"] if youtube else None,
+    }
+    for color in ("red", "blue"):
+        alliance = alliances.get(color) or {}
+        score = alliance.get("score")
+        # Webhook payloads use the older "teams" field name
+        team_keys = alliance.get("team_keys") or alliance.get("teams") or []
+        fields[f"{color}_teams"] = ",".join(team_keys)
+        # TBA reports -1 for unplayed matches
+        fields[f"{color}_score"] = score if score is not None and score >= 0 else None
+    return fields
+
+
+# Match fields that alliance_contributions reads
+_CONTRIBUTION_FIELDS = ("red_teams", "blue_teams", "red_score", "blue_score")
 
 
 class SyncService:
@@ -18,11 +79,14 @@ class SyncService:
     def _is_cache_fresh(self, cache_key: str) -> bool:
         meta = self.db.query(CacheMeta).get(cache_key)
         if not meta or not meta.last_fetched:
+            cache_lookups.inc(family=key_family(cache_key), result="miss")
             return False
         elapsed = (
             datetime.now(timezone.utc) - meta.last_fetched.replace(tzinfo=timezone.utc)
         ).total_seconds()
-        return elapsed < (meta.ttl_seconds or self.ttl)
+        fresh = elapsed < (meta.ttl_seconds or self.ttl)
+        cache_lookups.inc(family=key_family(cache_key), result="hit" if fresh else "stale")
+        return fresh
 
     def invalidate_cache(self, cache_key: str):
         meta = self.db.query(CacheMeta).get(cache_key)
@@ -43,18 +107,145 @@ class SyncService:
             self.db.add(meta)
         self.db.commit()
 
+    def _upsert(
+        self,
+        model,
+        rows: list[dict],
+        conflict_cols: list[str],
+        update_cols: list[str],
+    ):
+        """Insert rows in one statement, updating update_cols on conflict."""
+        if not rows:
+            return
+        dialect = self.db.get_bind().dialect.name
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_cols,
+            set_={col: stmt.excluded[col] for col in update_cols},
+        )
+        self.db.execute(stmt)
+
+    def _upsert_epa(self, rows: list[dict]):
+        """Bulk-upsert TeamEvent EPA rows, logging what changed to epa_history."""
+        if not rows:
+            return
+        columns = [getattr(TeamEvent, col) for col in EPA_COLUMNS]
+        event_keys = sorted({row["event_key"] for row in rows})
+        current = {
+            (te.team_key, te.event_key): {col: getattr(te, col) for col in EPA_COLUMNS}
+            for te in self.db.query(TeamEvent.team_key, TeamEvent.event_key, *columns)
+            .filter(TeamEvent.event_key.in_(event_keys))
+        }
+        changes = [
+            (row["team_key"], row["event_key"], current.get((row["team_key"], row["event_key"])), row)
+            for row in rows
+        ]
+        record_changes(self.db, changes)
+        self._upsert(TeamEvent, rows, ["team_key", "event_key"], list(EPA_COLUMNS))
+        self.record_attendance(rows, update_index_names=False)
+
+    def record_attendance(self, rows: list[dict], update_index_names: bool = True):
+        """Store and index (team_key, event_key, team_number, nickname) rows.
+
+        Runs inside the caller's transaction. With update_index_names=False,
+        teams already in the search index keep their indexed nickname.
+        """
+        if not rows:
+            return
+        attendance = {
+            (row["team_key"], row["event_key"]): {
+                "team_key": row["team_key"],
+                "event_key": row["event_key"],
+                "team_number": row.get("team_number"),
+                "nickname": row.get("nickname"),
+            }
+            for row in rows
+        }
+        self._upsert(
+            TeamAttendance,
+            list(attendance.values()),
+            ["team_key", "event_key"],
+            ["team_number", "nickname"],
+        )
+        for row in attendance.values():
+            if update_index_names or team_index.get_team(row["team_key"]) is None:
+                team_index.add_team(row["team_key"], row["team_number"], row["nickname"])
+            team_index.add_attendance(row["team_key"], row["event_key"])
+
+    async def _fetch_rank_map(self, event_key: str) -> dict[str, dict]:
+        rank_map: dict[str, dict] = {}
+        rankings_data = await self.tba.get_event_rankings(event_key)
+        if rankings_data and rankings_data.get("rankings"):
+            for r in rankings_data["rankings"]:
+                rank_map[r["team_key"]] = {
+                    "rank": r.get("rank"),
+                    "wins": r.get("record", {}).get("wins", 0),
+                    "losses": r.get("record", {}).get("losses", 0),
+                    "ties": r.get("record", {}).get("ties", 0),
+                }
+        return rank_map
+
     async def get_events(self, year: int) -> list[Event]:
+        await self.ensure_events(year)
+        return self.query_events(year)
+
+    def query_events(
+        self,
+        year: int,
+        fields: list[str] | None = None,
+        week: int | None = None,
+        state_prov: str | None = None,
+        event_type: int | None = None,
+        after: tuple[str | None, str] | None = None,
+        limit: int | None = None,
+    ) -> list:
+        """Events of a season ordered by (start_date, key).
+
+        fields selects only those columns (rows come back as Row tuples).
+        after is the (start_date, key) of the last event of the previous
+        page; null start dates sort first.
+        """
+        columns = [getattr(Event, f) for f in fields] if fields else [Event]
+        q = self.db.query(*columns).filter(Event.year == year)
+        if week is not None:
+            q = q.filter(Event.week == week)
+        if state_prov is not None:
+            q = q.filter(Event.state_prov == state_prov)
+        if event_type is not None:
+            q = q.filter(Event.event_type == event_type)
+        if after is not None:
+            start_date, key = after
+            if start_date is None:
+                q = q.filter(
+                    or_(
+                        Event.start_date.isnot(None),
+                        and_(Event.start_date.is_(None), Event.key > key),
+                    )
+                )
+            else:
+                q = q.filter(
+                    or_(
+                        Event.start_date > start_date,
+                        and_(Event.start_date == start_date, Event.key > key),
+                    )
+                )
+        q = q.order_by(Event.start_date.asc().nullsfirst(), Event.key)
+        if limit is not None:
+            q = q.limit(limit)
+        with span("db.read events"):
+            return q.all()
+
+    async def ensure_events(self, year: int) -> None:
+        """Refresh the season's events from TBA unless the cache is fresh.
+
+        A refresh bumps the "events_<year>" data version.
+        """
         cache_key = f"events_{year}"
         if self._is_cache_fresh(cache_key):
-            return (
-                self.db.query(Event)
-                .filter(Event.year == year)
-                .order_by(Event.start_date)
-                .all()
-            )
+            return
 
-        raw = await self.tba.get_events(year)
-        for ev in raw:
+        async for ev in self.tba.stream_events(year):
             existing = self.db.query(Event).get(ev["key"])
             if existing:
                 existing.name = ev.get("name", "")
@@ -80,144 +271,513 @@ class SyncService:
                         week=ev.get("week"),
                     )
                 )
+            team_index.add_event(ev["key"], ev.get("name", ""), year, ev.get("start_date"))
         self.db.commit()
         self._update_cache(cache_key)
-
-        return (
-            self.db.query(Event)
-            .filter(Event.year == year)
-            .order_by(Event.start_date)
-            .all()
-        )
+        bump_data_version(f"events_{year}")
 
     async def get_teams_for_event(self, event_key: str) -> list[TeamEvent]:
-        cache_key = f"team_events_{event_key}"
-        if self._is_cache_fresh(cache_key):
+        await self.ensure_teams_for_event(event_key)
+        return self.query_teams_for_event(event_key)
+
+    def query_teams_for_event(
+        self, event_key: str, fields: list[str] | None = None
+    ) -> list:
+        columns = [getattr(TeamEvent, f) for f in fields] if fields else [TeamEvent]
+        with span("db.read team_events"):
             return (
-                self.db.query(TeamEvent)
+                self.db.query(*columns)
                 .filter(TeamEvent.event_key == event_key)
                 .order_by(TeamEvent.rank.asc().nullslast())
                 .all()
             )
 
+    async def ensure_teams_for_event(self, event_key: str) -> None:
+        """Sync an event's teams, rankings, EPA and matches unless fresh.
+
+        A sync bumps the event's data version.
+        """
+        cache_key = f"team_events_{event_key}"
+        if self._is_cache_fresh(cache_key):
+            return
+
         # Fetch teams from TBA
         tba_teams = await self.tba.get_event_teams(event_key)
-        team_map: dict[str, dict] = {}
-        for t in tba_teams:
-            key = t["key"]
-            team_map[key] = t
-            existing = self.db.query(Team).get(key)
-            if not existing:
-                self.db.add(
-                    Team(
-                        key=key,
-                        team_number=t.get("team_number", 0),
-                        nickname=t.get("nickname", ""),
-                        name=t.get("name", ""),
-                        city=t.get("city"),
-                        state_prov=t.get("state_prov"),
-                        country=t.get("country"),
-                        rookie_year=t.get("rookie_year"),
-                    )
-                )
-        self.db.commit()
+        team_map = {t["key"]: t for t in tba_teams}
+        # The DB work below runs in worker threads (one at a time, so the
+        # session is never shared) to keep the event loop free for drafts
+        await asyncio.to_thread(self._store_teams, tba_teams)
 
         # Fetch rankings from TBA
         rank_map: dict[str, dict] = {}
-        try:
-            rankings_data = await self.tba.get_event_rankings(event_key)
-            if rankings_data and rankings_data.get("rankings"):
-                for r in rankings_data["rankings"]:
-                    rank_map[r["team_key"]] = {
-                        "rank": r.get("rank"),
-                        "wins": r.get("record", {}).get("wins", 0),
-                        "losses": r.get("record", {}).get("losses", 0),
-                        "ties": r.get("record", {}).get("ties", 0),
-                    }
-        except Exception:
-            pass
+        with span("rankings"):
+            try:
+                rank_map = await self._fetch_rank_map(event_key)
+            except Exception:
+                pass
 
-        # Fetch EPA from Statbotics
+        # Fetch EPA from Statbotics, unless a bulk year ingest covered it
         epa_map: dict[str, dict] = {}
-        try:
-            offset = 0
-            while True:
-                batch = await self.statbotics.get_team_events(
-                    event=event_key, limit=100, offset=offset
+        epa_cache_key = f"team_event_epa_{event_key}"
+        if self._is_cache_fresh(epa_cache_key):
+            epa_map = await asyncio.to_thread(self._stored_epa, event_key)
+        # A fresh marker with no stored rows (e.g. they were wiped) means
+        # there is nothing to reuse, so fetch anyway
+        if not epa_map:
+            with span("statbotics epa"):
+                try:
+                    offset = 0
+                    while True:
+                        count = 0
+                        async for te in self.statbotics.stream_team_events(
+                            event=event_key, limit=100, offset=offset
+                        ):
+                            team_key, epa_data = _parse_epa(te)
+                            epa_map[team_key] = epa_data
+                            count += 1
+                        offset += count
+                        if count < 100:
+                            break
+                    self._update_cache(epa_cache_key)
+                except Exception:
+                    pass
+
+        await asyncio.to_thread(
+            self._store_team_events, event_key, team_map, rank_map, epa_map
+        )
+
+        # Match-derived consistency (best-effort, like rankings and EPA)
+        with span("matches"):
+            try:
+                await self.sync_event_matches(event_key)
+            except Exception:
+                pass
+        with span("consistency"):
+            # rescore: rows added above need the event prior
+            await asyncio.to_thread(self.update_consistency, event_key, True)
+
+        bump_data_version(event_key)
+        self._update_cache(cache_key)
+
+    def _store_teams(self, tba_teams: list[dict]):
+        with span("db.upsert teams"):
+            for t in tba_teams:
+                key = t["key"]
+                existing = self.db.query(Team).get(key)
+                if not existing:
+                    self.db.add(
+                        Team(
+                            key=key,
+                            team_number=t.get("team_number", 0),
+                            nickname=t.get("nickname", ""),
+                            name=t.get("name", ""),
+                            city=t.get("city"),
+                            state_prov=t.get("state_prov"),
+                            country=t.get("country"),
+                            rookie_year=t.get("rookie_year"),
+                        )
+                    )
+            self.db.commit()
+
+    def _stored_epa(self, event_key: str) -> dict[str, dict]:
+        return {
+            te.team_key: {col: getattr(te, col) for col in EPA_COLUMNS}
+            for te in self.db.query(TeamEvent).filter(TeamEvent.event_key == event_key)
+        }
+
+    def _store_team_events(
+        self,
+        event_key: str,
+        team_map: dict[str, dict],
+        rank_map: dict[str, dict],
+        epa_map: dict[str, dict],
+    ):
+        """Merge and upsert TeamEvent rows, recording EPA history and attendance."""
+        with span("db.upsert team_events", rows=len(team_map)):
+            epa_changes = []
+            for team_key, team_data in team_map.items():
+                rank_data = rank_map.get(team_key, {})
+                # A team missing from a failed or partial EPA fetch keeps its
+                # stored EPA rather than being overwritten with None
+                has_epa = team_key in epa_map
+                epa_data = epa_map.get(team_key, {})
+
+                existing = (
+                    self.db.query(TeamEvent)
+                    .filter(
+                        TeamEvent.team_key == team_key,
+                        TeamEvent.event_key == event_key,
+                    )
+                    .first()
                 )
-                if not batch:
-                    break
-                for te in batch:
-                    team_key = f"frc{te.get('team', te.get('team_number', ''))}"
-                    epa_data = te.get("epa", {})
-                    total_points = epa_data.get("total_points", {})
-                    breakdown = epa_data.get("breakdown", {})
-                    epa_map[team_key] = {
-                        "epa": total_points.get("mean") if isinstance(total_points, dict) else total_points,
-                        "auto_epa": breakdown.get("auto_points"),
-                        "teleop_epa": breakdown.get("teleop_points"),
-                        "endgame_epa": breakdown.get("endgame_points"),
-                        "rp_1_epa": breakdown.get("rp_1"),
-                        "rp_2_epa": breakdown.get("rp_2"),
+
+                new_epa = {col: epa_data.get(col) for col in EPA_COLUMNS}
+                if existing:
+                    if has_epa:
+                        epa_changes.append(
+                            (
+                                team_key,
+                                event_key,
+                                {col: getattr(existing, col) for col in EPA_COLUMNS},
+                                new_epa,
+                            )
+                        )
+                        for col in EPA_COLUMNS:
+                            setattr(existing, col, new_epa[col])
+                    existing.rank = rank_data.get("rank")
+                    existing.wins = rank_data.get("wins", 0)
+                    existing.losses = rank_data.get("losses", 0)
+                    existing.ties = rank_data.get("ties", 0)
+                    existing.nickname = team_data.get("nickname", "")
+                else:
+                    if has_epa:
+                        epa_changes.append((team_key, event_key, None, new_epa))
+                    self.db.add(
+                        TeamEvent(
+                            team_key=team_key,
+                            event_key=event_key,
+                            team_number=team_data.get("team_number", 0),
+                            nickname=team_data.get("nickname", ""),
+                            rank=rank_data.get("rank"),
+                            wins=rank_data.get("wins", 0),
+                            losses=rank_data.get("losses", 0),
+                            ties=rank_data.get("ties", 0),
+                            epa=epa_data.get("epa"),
+                            auto_epa=epa_data.get("auto_epa"),
+                            teleop_epa=epa_data.get("teleop_epa"),
+                            endgame_epa=epa_data.get("endgame_epa"),
+                            rp_1_epa=epa_data.get("rp_1_epa"),
+                            rp_2_epa=epa_data.get("rp_2_epa"),
+                        )
+                    )
+
+            record_changes(self.db, epa_changes)
+            self.record_attendance(
+                [
+                    {
+                        "team_key": team_key,
+                        "event_key": event_key,
+                        "team_number": team_data.get("team_number", 0),
+                        "nickname": team_data.get("nickname", ""),
                     }
-                offset += len(batch)
-                if len(batch) < 100:
-                    break
-        except Exception:
-            pass
-
-        # Merge and upsert TeamEvent rows
-        for team_key, team_data in team_map.items():
-            rank_data = rank_map.get(team_key, {})
-            epa_data = epa_map.get(team_key, {})
-
-            existing = (
-                self.db.query(TeamEvent)
-                .filter(
-                    TeamEvent.team_key == team_key,
-                    TeamEvent.event_key == event_key,
-                )
-                .first()
+                    for team_key, team_data in team_map.items()
+                ]
             )
+            self.db.commit()
 
-            if existing:
-                existing.rank = rank_data.get("rank")
-                existing.wins = rank_data.get("wins", 0)
-                existing.losses = rank_data.get("losses", 0)
-                existing.ties = rank_data.get("ties", 0)
-                existing.epa = epa_data.get("epa")
-                existing.auto_epa = epa_data.get("auto_epa")
-                existing.teleop_epa = epa_data.get("teleop_epa")
-                existing.endgame_epa = epa_data.get("endgame_epa")
-                existing.rp_1_epa = epa_data.get("rp_1_epa")
-                existing.rp_2_epa = epa_data.get("rp_2_epa")
-                existing.nickname = team_data.get("nickname", "")
-            else:
-                self.db.add(
-                    TeamEvent(
-                        team_key=team_key,
-                        event_key=event_key,
-                        team_number=team_data.get("team_number", 0),
-                        nickname=team_data.get("nickname", ""),
-                        rank=rank_data.get("rank"),
-                        wins=rank_data.get("wins", 0),
-                        losses=rank_data.get("losses", 0),
-                        ties=rank_data.get("ties", 0),
-                        epa=epa_data.get("epa"),
-                        auto_epa=epa_data.get("auto_epa"),
-                        teleop_epa=epa_data.get("teleop_epa"),
-                        endgame_epa=epa_data.get("endgame_epa"),
-                        rp_1_epa=epa_data.get("rp_1_epa"),
-                        rp_2_epa=epa_data.get("rp_2_epa"),
-                    )
-                )
+    async def sync_event_matches(self, event_key: str):
+        cache_key = f"matches_{event_key}"
+        if self._is_cache_fresh(cache_key):
+            return
 
-        self.db.commit()
+        await self._ingest_match_stream(
+            event_key, self.tba.stream_event_matches(event_key)
+        )
         self._update_cache(cache_key)
 
-        return (
-            self.db.query(TeamEvent)
-            .filter(TeamEvent.event_key == event_key)
-            .order_by(TeamEvent.rank.asc().nullslast())
+    def update_consistency(self, event_key: str, rescore: bool = False) -> set[str]:
+        """Apply matches played since the last update to TeamEvent stats.
+
+        Without new matches this costs one query, unless rescore is set to
+        re-derive every team's consistency anyway (e.g. after adding teams).
+        Returns the keys of the teams whose stats or consistency changed.
+        """
+        new_matches = (
+            self.db.query(Match)
+            .filter(
+                Match.event_key == event_key,
+                Match.stats_applied.isnot(True),
+                Match.red_score.isnot(None),
+                Match.blue_score.isnot(None),
+            )
+            .order_by(Match.time, Match.key)
             .all()
         )
+        if not new_matches and not rescore:
+            return set()
+
+        team_events = {
+            te.team_key: te
+            for te in self.db.query(TeamEvent).filter(
+                TeamEvent.event_key == event_key
+            )
+        }
+        touched = apply_matches(team_events, new_matches)
+        # Every team's value moves with the event median
+        touched |= apply_prior(team_events.values())
+        self.db.commit()
+        return touched
+
+    def _reset_consistency(self, event_key: str):
+        """Forget an event's folded-in match stats so every match is re-applied.
+
+        Running stats can't take back a single match: its contributions were
+        split by the EPAs of the time, which may have changed since.
+        """
+        self.db.query(Match).filter(Match.event_key == event_key).update(
+            {Match.stats_applied: False}
+        )
+        self.db.query(TeamEvent).filter(TeamEvent.event_key == event_key).update(
+            {
+                TeamEvent.match_count: 0,
+                TeamEvent.contribution_mean: 0.0,
+                TeamEvent.contribution_m2: 0.0,
+            }
+        )
+
+    async def _ingest_match_stream(
+        self, event_key: str, raw_matches: AsyncIterator[dict], batch_size: int = 100
+    ):
+        batch = []
+        async for raw in raw_matches:
+            batch.append(raw)
+            if len(batch) >= batch_size:
+                await asyncio.to_thread(self._ingest_matches, event_key, batch)
+                batch = []
+        await asyncio.to_thread(self._ingest_matches, event_key, batch)
+
+    def _ingest_matches(
+        self, event_key: str, raw_matches: list[dict]
+    ) -> list[Match]:
+        """Upsert matches and their per-team rows; only loads the rows touched.
+
+        Returns the matches that went from unplayed to scored. A corrected
+        score or lineup on a match already folded into consistency resets the
+        event's stats, for the next update_consistency to rebuild.
+        """
+        year = int(event_key[:4])
+        keys = [raw["key"] for raw in raw_matches]
+        if not keys:
+            return []
+        matches = {
+            m.key: m for m in self.db.query(Match).filter(Match.key.in_(keys))
+        }
+        team_matches: dict[str, dict[str, TeamMatch]] = {}
+        for tm in self.db.query(TeamMatch).filter(TeamMatch.match_key.in_(keys)):
+            team_matches.setdefault(tm.match_key, {})[tm.team_key] = tm
+
+        touched: set[str] = set()
+        newly_scored: list[Match] = []
+        corrected = False
+        for raw in raw_matches:
+            fields = _parse_match(raw)
+            match = matches.get(raw["key"])
+            was_scored = match is not None and match.red_score is not None
+            if match is None:
+                match = Match(key=raw["key"], event_key=event_key, year=year)
+                self.db.add(match)
+                matches[match.key] = match
+            elif match.stats_applied and any(
+                getattr(match, name) != fields[name] for name in _CONTRIBUTION_FIELDS
+            ):
+                corrected = True
+            for name, value in fields.items():
+                setattr(match, name, value)
+            if not was_scored and match.red_score is not None:
+                newly_scored.append(match)
+
+            rows = team_matches.setdefault(match.key, {})
+            listed: set[str] = set()
+            for color, opponent in (("red", "blue"), ("blue", "red")):
+                for team_key in filter(None, fields[f"{color}_teams"].split(",")):
+                    listed.add(team_key)
+                    tm = rows.get(team_key)
+                    if tm is None:
+                        tm = TeamMatch(
+                            team_key=team_key,
+                            year=year,
+                            match_key=match.key,
+                            event_key=event_key,
+                        )
+                        self.db.add(tm)
+                        rows[team_key] = tm
+                    tm.comp_level = match.comp_level
+                    tm.match_number = match.match_number
+                    tm.alliance_color = color
+                    tm.alliance_score = fields[f"{color}_score"]
+                    tm.opponent_score = fields[f"{opponent}_score"]
+                    tm.youtube_key = match.youtube_key
+                    touched.add(team_key)
+            # Teams swapped out of the match (e.g. a replacement)
+            for team_key in rows.keys() - listed:
+                self.db.delete(rows.pop(team_key))
+                touched.add(team_key)
+
+        self.db.flush()
+        if corrected:
+            self._reset_consistency(event_key)
+        self._refresh_video_summaries(touched, year)
+        self.db.commit()
+        return newly_scored
+
+    def _refresh_video_summaries(self, team_keys: set[str], year: int):
+        if not team_keys:
+            return
+        rows = (
+            self.db.query(TeamMatch)
+            .filter(
+                TeamMatch.team_key.in_(team_keys),
+                TeamMatch.year == year,
+                TeamMatch.youtube_key.isnot(None),
+                TeamMatch.alliance_score.isnot(None),
+            )
+            .order_by(TeamMatch.id)
+            .all()
+        )
+        by_team: dict[str, list[TeamMatch]] = {}
+        for tm in rows:
+            by_team.setdefault(tm.team_key, []).append(tm)
+
+        for team_key in team_keys:
+            videos = by_team.get(team_key, [])
+            summary = self.db.get(TeamVideoSummary, (team_key, year))
+            if summary is None:
+                summary = TeamVideoSummary(team_key=team_key, year=year)
+                self.db.add(summary)
+            summary.video_count = len(videos)
+            summary.best_match_id = (
+                max(videos, key=lambda tm: tm.alliance_score).id if videos else None
+            )
+            summary.worst_match_id = (
+                min(videos, key=lambda tm: tm.alliance_score).id if videos else None
+            )
+
+    async def apply_match_result(self, event_key: str, raw_match: dict) -> set[str]:
+        """Apply one pushed match result to only the rows it affects.
+
+        Returns the keys of the TeamEvent rows that changed.
+        """
+        newly_scored = self._ingest_matches(event_key, [raw_match])
+        touched = self.update_consistency(event_key)
+
+        for match in newly_scored:
+            if match.comp_level != "qm":
+                continue
+            red = [t for t in match.red_teams.split(",") if t]
+            blue = [t for t in match.blue_teams.split(",") if t]
+            rows = {
+                te.team_key: te
+                for te in self.db.query(TeamEvent).filter(
+                    TeamEvent.event_key == event_key,
+                    TeamEvent.team_key.in_(red + blue),
+                )
+            }
+            for teams, ours, theirs in (
+                (red, match.red_score, match.blue_score),
+                (blue, match.blue_score, match.red_score),
+            ):
+                field = "wins" if ours > theirs else "losses" if ours < theirs else "ties"
+                for team_key in teams:
+                    te = rows.get(team_key)
+                    if te is not None:
+                        setattr(te, field, (getattr(te, field) or 0) + 1)
+                        touched.add(team_key)
+        self.db.commit()
+
+        if touched or newly_scored:
+            bump_data_version(event_key)
+        return touched
+
+    async def refresh_event_matches(self, event_key: str):
+        """Re-pull an event's schedule, ignoring the TTL."""
+        await self._ingest_match_stream(
+            event_key, self.tba.stream_event_matches(event_key)
+        )
+        self.update_consistency(event_key)
+        self._update_cache(f"matches_{event_key}")
+        bump_data_version(event_key)
+
+    async def refresh_rankings(self, event_key: str) -> set[str]:
+        """Update rank and record on only the TeamEvent rows that changed."""
+        rank_map = await self._fetch_rank_map(event_key)
+        touched = set()
+        for te in self.db.query(TeamEvent).filter(TeamEvent.event_key == event_key):
+            data = rank_map.get(te.team_key)
+            if data is None:
+                continue
+            if (te.rank, te.wins, te.losses, te.ties) != (
+                data["rank"],
+                data["wins"],
+                data["losses"],
+                data["ties"],
+            ):
+                te.rank = data["rank"]
+                te.wins = data["wins"]
+                te.losses = data["losses"]
+                te.ties = data["ties"]
+                touched.add(te.team_key)
+        self.db.commit()
+        if touched:
+            bump_data_version(event_key)
+        return touched
+
+    def _mark_epa_fresh(self, meta_rows: list[dict]):
+        for start in range(0, len(meta_rows), 300):
+            self._upsert(
+                CacheMeta,
+                meta_rows[start : start + 300],
+                ["cache_key"],
+                ["last_fetched", "ttl_seconds"],
+            )
+        self.db.commit()
+
+    async def ingest_year_epa(self, year: int, page_size: int = 1000) -> dict:
+        """Bulk-load every team-event EPA row for a season.
+
+        Pages through Statbotics /team_events?year= in large pages and
+        upserts each page in one transaction. Afterwards each event's EPA is
+        marked fresh, so get_teams_for_event skips its own Statbotics calls.
+        """
+        events: set[str] = set()
+        rows_written = 0
+        requests = 0
+        offset = 0
+        while True:
+            count = 0
+            rows = []
+            async for raw in self.statbotics.stream_team_events_year(
+                year, limit=page_size, offset=offset
+            ):
+                count += 1
+                event_key = raw.get("event")
+                if not event_key:
+                    continue
+                team_key, epa_data = _parse_epa(raw)
+                rows.append(
+                    {
+                        "team_key": team_key,
+                        "event_key": event_key,
+                        "team_number": raw.get("team", 0),
+                        "nickname": raw.get("team_name", ""),
+                        **epa_data,
+                    }
+                )
+                events.add(event_key)
+                # SQLite caps bound parameters per statement
+                if len(rows) >= 500:
+                    await asyncio.to_thread(self._upsert_epa, rows)
+                    rows_written += len(rows)
+                    rows = []
+            requests += 1
+            await asyncio.to_thread(self._upsert_epa, rows)
+            rows_written += len(rows)
+            await asyncio.to_thread(self.db.commit)
+
+            offset += count
+            if count < page_size:
+                break
+
+        now = datetime.now(timezone.utc)
+        meta_rows = [
+            {
+                "cache_key": f"team_event_epa_{event_key}",
+                "last_fetched": now,
+                "ttl_seconds": self.ttl,
+            }
+            for event_key in sorted(events)
+        ]
+        await asyncio.to_thread(self._mark_epa_fresh, meta_rows)
+
+        for event_key in events:
+            bump_data_version(event_key)
+        return {"rows": rows_written, "events": len(events), "requests": requests}
@@ -1,24 +1,22 @@
-import httpx
+from typing import AsyncIterator
 
 from app.config import settings
+from app.services.upstream import UpstreamClient
 
 
-class TBAClient:
+class TBAClient(UpstreamClient):
+    service = "tba"
+
     def __init__(self):
         self.base_url = settings.TBA_BASE_URL
         self.headers = {"X-TBA-Auth-Key": settings.TBA_API_KEY}
 
-    async def _get(self, path: str) -> list | dict:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(
-                f"{self.base_url}{path}", headers=self.headers
-            )
-            resp.raise_for_status()
-            return resp.json()
-
     async def get_events(self, year: int) -> list[dict]:
         return await self._get(f"/events/{year}")
 
+    def stream_events(self, year: int) -> AsyncIterator[dict]:
+        return self._stream(f"/events/{year}")
+
     async def get_event(self, event_key: str) -> dict:
         return await self._get(f"/event/{event_key}")
 
@@ -34,5 +32,14 @@ class TBAClient:
     async def get_event_matches(self, event_key: str) -> list[dict]:
         return await self._get(f"/event/{event_key}/matches")
 
+    def stream_event_matches(self, event_key: str) -> AsyncIterator[dict]:
+        return self._stream(f"/event/{event_key}/matches")
+
+    async def get_team_event_keys(self, team_key: str, year: int) -> list[str]:
+        return await self._get(f"/team/{team_key}/events/{year}/keys")
+
     async def get_team_matches_year(self, team_key: str, year: int) -> list[dict]:
         return await self._get(f"/team/{team_key}/matches/{year}")
+
+    def stream_team_matches_year(self, team_key: str, year: int) -> AsyncIterator[dict]:
+        return self._stream(f"/team/{team_key}/matches/{year}")
@@ -0,0 +1,209 @@
+"""In-memory team search: prefix tries plus a team -> events inverted index.
+
+A team's number tokens ("254", "frc254") go into one character trie and the
+words of its normalized nickname into another. Each trie node holds the
+teams below it plus a lazily built list of them sorted by team number, so a
+one-word autocomplete walks down the trie and reads the first few entries. A
+second map records the events each team attends. The index is rebuilt from
+the database at startup (attendance from team_attendance, which is never
+reset) and kept current by SyncService as it writes teams, events and
+team-event rows.
+"""
+import itertools
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from app.models import Event, Team, TeamAttendance, TeamEvent
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: str) -> list[str]:
+    """Lowercase, accent-free alphanumeric tokens: "Cheesy Poofs!" -> [cheesy, poofs]."""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode()
+    return [t for t in _NON_ALNUM.split(text.lower()) if t]
+
+
+class _Node:
+    __slots__ = ("children", "teams", "ranked")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.teams: set[str] = set()
+        self.ranked: list[tuple[int, str]] | None = None  # (number, key), sorted
+
+
+@dataclass
+class IndexedTeam:
+    key: str
+    number: int
+    nickname: str
+    tokens: frozenset[str]
+
+
+@dataclass
+class IndexedEvent:
+    key: str
+    name: str
+    year: int | None
+    start_date: str | None
+
+
+def _number_tokens(number: int) -> frozenset[str]:
+    return frozenset([str(number), f"frc{number}"])
+
+
+class TeamIndex:
+    def __init__(self):
+        self._numbers = _Node()
+        self._names = _Node()
+        self._teams: dict[str, IndexedTeam] = {}
+        self._events: dict[str, IndexedEvent] = {}
+        self._attends: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    # --- writes ---
+
+    @staticmethod
+    def _insert(root: _Node, token: str, team_key: str):
+        node = root
+        for ch in token:
+            node = node.children.setdefault(ch, _Node())
+            node.teams.add(team_key)
+            node.ranked = None
+
+    @staticmethod
+    def _remove(root: _Node, token: str, team_key: str):
+        node = root
+        for ch in token:
+            node = node.children.get(ch)
+            if node is None:
+                return
+            node.teams.discard(team_key)
+            node.ranked = None
+
+    def add_team(self, team_key: str, number: int | None, nickname: str | None):
+        if not number:
+            suffix = team_key.removeprefix("frc")
+            number = int(suffix) if suffix.isdigit() else 0
+        nickname = nickname or ""
+        names = frozenset(normalize(nickname))
+        with self._lock:
+            old = self._teams.get(team_key)
+            if old is not None and old.number == number and old.tokens == names:
+                return
+            if old is not None:
+                # The number is part of every sort key, so reinsert everything
+                for token in _number_tokens(old.number):
+                    self._remove(self._numbers, token, team_key)
+                for token in old.tokens:
+                    self._remove(self._names, token, team_key)
+            for token in _number_tokens(number):
+                self._insert(self._numbers, token, team_key)
+            for token in names:
+                self._insert(self._names, token, team_key)
+            self._teams[team_key] = IndexedTeam(team_key, number, nickname, names)
+
+    def add_attendance(self, team_key: str, event_key: str):
+        with self._lock:
+            self._attends.setdefault(team_key, set()).add(event_key)
+
+    def add_event(self, event_key: str, name: str, year: int | None, start_date: str | None):
+        with self._lock:
+            self._events[event_key] = IndexedEvent(event_key, name, year, start_date)
+
+    def rebuild(self, db: Session):
+        fresh = TeamIndex()
+        for key, number, nickname in db.query(Team.key, Team.team_number, Team.nickname):
+            fresh.add_team(key, number, nickname)
+        # TeamEvent covers rows synced before team_attendance existed
+        for model in (TeamAttendance, TeamEvent):
+            for team_key, event_key, number, nickname in db.query(
+                model.team_key, model.event_key, model.team_number, model.nickname
+            ):
+                if team_key not in fresh._teams:
+                    fresh.add_team(team_key, number, nickname)
+                fresh.add_attendance(team_key, event_key)
+        for key, name, year, start_date in db.query(
+            Event.key, Event.name, Event.year, Event.start_date
+        ):
+            fresh.add_event(key, name, year, start_date)
+        with self._lock:
+            self._numbers, self._names, self._teams = fresh._numbers, fresh._names, fresh._teams
+            self._events, self._attends = fresh._events, fresh._attends
+
+    # --- reads ---
+
+    @staticmethod
+    def _find(root: _Node, token: str) -> _Node | None:
+        node = root
+        for ch in token:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node
+
+    def _ranked(self, node: _Node | None) -> list[tuple[int, str]]:
+        if node is None:
+            return []
+        if node.ranked is None:
+            node.ranked = sorted((self._teams[k].number, k) for k in node.teams)
+        return node.ranked
+
+    def search(self, query: str, limit: int = 10, year: int | None = None) -> list[IndexedTeam]:
+        """Teams matching every query token as a prefix, best matches first.
+
+        Team-number matches come before nickname matches (so an exact number
+        is first), each group in team number order.
+        """
+        tokens = normalize(query)
+        if not tokens:
+            return []
+        with self._lock:
+            nodes = [(self._find(self._numbers, t), self._find(self._names, t)) for t in tokens]
+            first_numbers, first_names = nodes[0]
+            # Candidates in rank order; further tokens must each match somewhere
+            candidates = itertools.chain(self._ranked(first_numbers), self._ranked(first_names))
+            rest = [
+                (num.teams if num else set(), name.teams if name else set())
+                for num, name in nodes[1:]
+            ]
+            prefix = str(year) if year is not None else None
+            results: list[IndexedTeam] = []
+            seen: set[str] = set()
+            for _, key in candidates:
+                if key in seen:
+                    continue
+                seen.add(key)
+                if any(key not in nums and key not in names for nums, names in rest):
+                    continue
+                if prefix and not any(e.startswith(prefix) for e in self._attends.get(key, ())):
+                    continue
+                results.append(self._teams[key])
+                if len(results) == limit:
+                    break
+        return results
+
+    def get_team(self, team_key: str) -> IndexedTeam | None:
+        return self._teams.get(team_key)
+
+    def event_count(self, team_key: str) -> int:
+        return len(self._attends.get(team_key, ()))
+
+    def events_for_team(self, team_key: str, year: int | None = None) -> list[IndexedEvent]:
+        with self._lock:
+            keys = self._attends.get(team_key, set())
+            if year is not None:
+                keys = {k for k in keys if k.startswith(str(year))}
+            events = [self._events.get(k) or IndexedEvent(k, k, None, None) for k in keys]
+        return sorted(events, key=lambda e: (e.start_date or "", e.key))
+
+    def __len__(self) -> int:
+        return len(self._teams)
+
+
+team_index = TeamIndex()
@@ -0,0 +1,259 @@
+import codecs
+import itertools
+import json
+import time
+from typing import AsyncIterator, Iterator
+from urllib.parse import urlencode
+
+import httpx
+
+from app.config import settings
+from app.metrics import endpoint_template, upstream_duration, upstream_requests
+from app.services.response_archive import ArchiveMiss, ResponseArchive, get_archive
+from app.services.upstream_fixtures import FixtureWriter
+from app.tracing import record_span, span
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator:
+    """Yield the elements of a top-level JSON array as its bytes arrive.
+
+    Only the unparsed tail of the body is buffered, so memory stays at
+    roughly one element plus one network chunk however long the array is.
+    """
+    text = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    started = False
+    eof = False
+    chunk_iter = chunks.__aiter__()
+
+    while True:
+        # Skip separators between elements
+        while pos < len(buf) and (buf[pos] in _WHITESPACE or (started and buf[pos] == ",")):
+            pos += 1
+
+        if pos < len(buf):
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                item, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A bare number is only complete once a delimiter follows it
+                if (
+                    isinstance(item, (dict, list, str))
+                    or eof
+                    or (end < len(buf) and buf[end] in _DELIMITERS)
+                ):
+                    yield item
+                    pos = end
+                    continue
+
+        if eof:
+            raise ValueError("Unexpected end of JSON array")
+        try:
+            chunk = await chunk_iter.__anext__()
+        except StopAsyncIteration:
+            eof = True
+            buf = buf[pos:] + text.decode(b"", final=True)
+        else:
+            buf = buf[pos:] + text.decode(chunk)
+        pos = 0
+
+
+async def _aiter(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+def _archived_chunks(archive: ResponseArchive, url: str) -> Iterator[bytes] | None:
+    """The archived body for url, or None if it was evicted after its ETag
+    went out with the request."""
+    chunks = archive.iter_chunks(url)
+    try:
+        first = next(chunks)
+    except ArchiveMiss:
+        return None
+    except StopIteration:
+        return iter(())
+    return itertools.chain([first], chunks)
+
+
+class UpstreamClient:
+    """Shared HTTP plumbing for the TBA and Statbotics clients.
+
+    When the response archive is enabled every body is archived, requests
+    revalidate with If-None-Match and a 304 is served from the archive. With
+    UPSTREAM_OFFLINE set, responses come only from the archive. With
+    UPSTREAM_RECORD_DIR set, every fresh body is also saved as a fixture for
+    the local stand-in server.
+    """
+
+    service: str = ""
+    base_url: str = ""
+    headers: dict[str, str] = {}
+    timeout: float = 30.0
+
+    def _url(self, path: str, params: dict | None) -> str:
+        url = f"{self.base_url}{path}"
+        if params:
+            url += "?" + urlencode(sorted(params.items()))
+        return url
+
+    def _request_headers(
+        self, archive: ResponseArchive | None, url: str, conditional: bool = True
+    ) -> dict:
+        headers = dict(self.headers)
+        ref = archive.ref(url) if archive and conditional else None
+        if ref and ref.get("etag"):
+            headers["If-None-Match"] = ref["etag"]
+        return headers
+
+    def _observe(self, path: str, status: int | str, start: float):
+        endpoint = endpoint_template(path)
+        upstream_requests.inc(service=self.service, endpoint=endpoint, status=str(status))
+        upstream_duration.observe(
+            time.perf_counter() - start, service=self.service, endpoint=endpoint
+        )
+        record_span(
+            f"upstream {self.service} {endpoint}",
+            start,
+            **{"http.url": f"{self.base_url}{path}", "http.status_code": str(status)},
+        )
+
+    def _sinks(
+        self,
+        archive: ResponseArchive | None,
+        url: str,
+        path: str,
+        params: dict | None,
+        etag: str | None,
+    ) -> list:
+        sinks = []
+        if archive is not None:
+            sinks.append(archive.writer(url, etag))
+        if settings.UPSTREAM_RECORD_DIR:
+            try:
+                sinks.append(
+                    FixtureWriter(settings.UPSTREAM_RECORD_DIR, self.service, path, params)
+                )
+            except ValueError:
+                # Paths built from client input (e.g. an event key of "..")
+                # are fetched but never recorded outside the fixture tree
+                pass
+        return sinks
+
+    async def _get(
+        self, path: str, params: dict | None = None, conditional: bool = True
+    ) -> list | dict:
+        archive = get_archive()
+        url = self._url(path, params)
+        if settings.UPSTREAM_OFFLINE:
+            if archive is None:
+                raise ArchiveMiss(url)
+            upstream_requests.inc(
+                service=self.service, endpoint=endpoint_template(path), status="offline"
+            )
+            return json.loads(archive.get(url))
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            start = time.perf_counter()
+            try:
+                resp = await client.get(
+                    f"{self.base_url}{path}",
+                    params=params or {},
+                    headers=self._request_headers(archive, url, conditional),
+                )
+            except httpx.HTTPError:
+                self._observe(path, "error", start)
+                raise
+            self._observe(path, resp.status_code, start)
+            if resp.status_code == 304 and archive is not None:
+                cached = _archived_chunks(archive, url)
+                if cached is None:
+                    return await self._get(path, params, conditional=False)
+                return json.loads(b"".join(cached))
+            resp.raise_for_status()
+            for sink in self._sinks(archive, url, path, params, resp.headers.get("ETag")):
+                sink.write(resp.content)
+                sink.commit()
+            with span("parse", bytes=len(resp.content)):
+                return resp.json()
+
+    async def _stream(
+        self, path: str, params: dict | None = None, conditional: bool = True
+    ) -> AsyncIterator[dict]:
+        """Yield records from a JSON array response without loading it whole."""
+        archive = get_archive()
+        url = self._url(path, params)
+        if settings.UPSTREAM_OFFLINE:
+            if archive is None:
+                raise ArchiveMiss(url)
+            upstream_requests.inc(
+                service=self.service, endpoint=endpoint_template(path), status="offline"
+            )
+            async for item in iter_json_array(_aiter(archive.iter_chunks(url))):
+                yield item
+            return
+
+        start = time.perf_counter()
+        status: int | str = "error"
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                async with client.stream(
+                    "GET",
+                    f"{self.base_url}{path}",
+                    params=params or {},
+                    headers=self._request_headers(archive, url, conditional),
+                ) as resp:
+                    status = resp.status_code
+                    if resp.status_code == 304 and archive is not None:
+                        cached = _archived_chunks(archive, url)
+                        if cached is None:
+                            retry = self._stream(path, params, conditional=False)
+                        else:
+                            retry = iter_json_array(_aiter(cached))
+                        async for item in retry:
+                            yield item
+                        return
+                    resp.raise_for_status()
+
+                    # Tee the body into the archive/fixtures while decoding it
+                    sinks = self._sinks(
+                        archive, url, path, params, resp.headers.get("ETag")
+                    )
+
+                    async def tee() -> AsyncIterator[bytes]:
+                        async for chunk in resp.aiter_bytes():
+                            for sink in sinks:
+                                sink.write(chunk)
+                            yield chunk
+
+                    body = tee()
+                    try:
+                        async for item in iter_json_array(body):
+                            yield item
+                        # The array may close before the last bytes (e.g. a newline)
+                        async for _ in body:
+                            pass
+                    except BaseException:
+                        for sink in sinks:
+                            sink.abort()
+                        raise
+                    for sink in sinks:
+                        sink.commit()
+        finally:
+            # Covers the whole body, since callers consume it as it streams
+            self._observe(path, status, start)
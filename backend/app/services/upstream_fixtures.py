@@ -0,0 +1,43 @@
+import os
+import re
+import tempfile
+from pathlib import Path
+from urllib.parse import urlencode
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9._=&-]")
+
+
+def fixture_path(root: str | Path, service: str, path: str, params: dict | None) -> Path:
+    """Where a recorded response lives: <root>/<service>/<path>[__<query>].json
+
+    Raises ValueError for a path with "." or ".." segments, which would
+    otherwise resolve outside <root>/<service>.
+    """
+    name = path.strip("/") or "index"
+    if any(p in (".", "..") for p in name.split("/")):
+        raise ValueError(f"Unsafe fixture path: {path}")
+    if params:
+        name += "__" + urlencode(sorted((k, str(v)) for k, v in params.items()))
+    parts = [_UNSAFE.sub("_", p) for p in name.split("/")]
+    return Path(root, service, *parts[:-1], parts[-1] + ".json")
+
+
+class FixtureWriter:
+    """Records one response body to its fixture file, atomically."""
+
+    def __init__(self, root: str, service: str, path: str, params: dict | None):
+        self.target = fixture_path(root, service, path, params)
+        self.target.parent.mkdir(parents=True, exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(dir=self.target.parent)
+        self.out = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes):
+        self.out.write(chunk)
+
+    def commit(self):
+        self.out.close()
+        os.replace(self.tmp_path, self.target)
+
+    def abort(self):
+        self.out.close()
+        Path(self.tmp_path).unlink(missing_ok=True)
@@ -0,0 +1,242 @@
+from dataclasses import dataclass
+from itertools import combinations, product
+from math import prod
+
+import numpy as np
+
+from app.metrics import solver_iterations, timed
+from app.models.team_event import TeamEvent
+from app.schemas.prediction import AllianceWeights
+from app.services.alliance_optimizer import TeamScore, score_team
+
+_POPCOUNT = np.array([0, 1, 1, 2, 1, 2, 2, 3], dtype=np.float64)
+
+# Cap on (candidate combos x weight vectors) scored in one matrix product.
+_MAX_BLOCK = 4_000_000
+
+
+@dataclass
+class SweepResult:
+    weights: AllianceWeights
+    alliances: list[list[TeamScore]]
+    scores: list[float]
+
+
+def _weight_matrix(weights: list[AllianceWeights]) -> np.ndarray:
+    return np.array(
+        [[w.auto, w.teleop, w.endgame, w.consistency, w.synergy] for w in weights],
+        dtype=np.float64,
+    ).reshape(-1, 5)
+
+
+def expand_weight_grid(
+    grid: dict[str, list[float]], limit: int | None = None
+) -> list[AllianceWeights]:
+    """Cartesian product of per-field values; missing fields use defaults.
+
+    Raises ValueError before building anything if the product would hold
+    more than limit weight vectors.
+    """
+    fields = list(grid)
+    unknown = [f for f in fields if f not in AllianceWeights.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown weight fields: {', '.join(unknown)}")
+    if limit is not None and prod(len(v) for v in grid.values()) > limit:
+        raise ValueError(f"Grid expands to more than {limit} weight vectors")
+    return [
+        AllianceWeights(**dict(zip(fields, values)))
+        for values in product(*(grid[f] for f in fields))
+    ]
+
+
+def _alliance_features(
+    captains: list[TeamScore], pool: list[TeamScore], combos: np.ndarray
+) -> np.ndarray:
+    """Score features for every (captain, partner combo) alliance.
+
+    score_alliance is linear in the weights over five features (component
+    sums, avg consistency x EPA, synergy x EPA), so one feature table serves
+    every weight vector. Returns shape (captains, combos, 5).
+    """
+
+    def arrays(teams: list[TeamScore]):
+        comps = np.array(
+            [[t.auto_epa, t.teleop_epa, t.endgame_epa] for t in teams],
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        positive = (comps > 0).astype(np.int64)
+        return (
+            comps,
+            np.array([t.epa for t in teams], dtype=np.float64),
+            np.array([t.consistency for t in teams], dtype=np.float64),
+            positive[:, 0] | positive[:, 1] << 1 | positive[:, 2] << 2,
+            1 << np.argmax(comps, axis=1),
+        )
+
+    c_comps, c_epa, c_cons, c_pos, c_lead = arrays(captains)
+    p_comps, p_epa, p_cons, p_pos, p_lead = arrays(pool)
+
+    comp_sum = c_comps[:, None, :] + p_comps[combos].sum(axis=1)[None, :, :]
+    epa_sum = c_epa[:, None] + p_epa[combos].sum(axis=1)[None, :]
+    size = combos.shape[1] + 1
+    avg_cons = (c_cons[:, None] + p_cons[combos].sum(axis=1)[None, :]) / size
+
+    pos = np.bitwise_or.reduce(p_pos[combos], axis=1)
+    lead = np.bitwise_or.reduce(p_lead[combos], axis=1)
+    synergy = _POPCOUNT[c_pos[:, None] | pos[None, :]] + 0.5 * _POPCOUNT[
+        c_lead[:, None] | lead[None, :]
+    ]
+
+    return np.concatenate(
+        [
+            comp_sum,
+            (avg_cons * epa_sum)[:, :, None],
+            (synergy * epa_sum)[:, :, None],
+        ],
+        axis=2,
+    )
+
+
+def _greedy(
+    features: np.ndarray,
+    combos: np.ndarray,
+    weight_matrix: np.ndarray,
+    order: list[int],
+    pool_size: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Greedy captain-by-captain assignment for all weight vectors at once.
+
+    Returns the chosen combo per (weight, captain) and the total score per
+    weight vector.
+    """
+    num_weights = len(weight_matrix)
+    chosen = np.zeros((num_weights, features.shape[0]), dtype=np.int64)
+    totals = np.zeros(num_weights)
+    used = np.zeros((num_weights, pool_size), dtype=bool)
+    rows = np.arange(num_weights)
+    block = max(1, _MAX_BLOCK // max(len(combos), 1))
+
+    for c in order:
+        for start in range(0, num_weights, block):
+            w_rows = rows[start : start + block]
+            scores = (features[c] @ weight_matrix[w_rows].T).T
+            blocked = used[w_rows][:, combos].any(axis=2)
+            scores[blocked] = -np.inf
+            best = np.argmax(scores, axis=1)
+            chosen[w_rows, c] = best
+            totals[w_rows] += scores[np.arange(len(w_rows)), best]
+            used[w_rows[:, None], combos[best]] = True
+
+    return chosen, totals
+
+
+def _local_search(
+    alliance_scores: list[list[float]],
+    combo_index: dict[tuple[int, ...], int],
+    members: list[tuple[int, ...]],
+) -> list[tuple[int, ...]]:
+    """Swap partners between alliances until no single swap improves.
+
+    Deterministic counterpart to AllianceOptimizer._local_search; every swap
+    keeps captains in place, so each candidate alliance is a table lookup.
+    """
+    members = list(members)
+    improved = True
+    while improved:
+        improved = False
+        for a1 in range(len(members)):
+            for a2 in range(a1 + 1, len(members)):
+                current = (
+                    alliance_scores[a1][combo_index[members[a1]]]
+                    + alliance_scores[a2][combo_index[members[a2]]]
+                )
+                for p1 in members[a1]:
+                    for p2 in members[a2]:
+                        new1 = tuple(sorted(p2 if p == p1 else p for p in members[a1]))
+                        new2 = tuple(sorted(p1 if p == p2 else p for p in members[a2]))
+                        swapped = (
+                            alliance_scores[a1][combo_index[new1]]
+                            + alliance_scores[a2][combo_index[new2]]
+                        )
+                        if swapped > current + 1e-9:
+                            members[a1], members[a2] = new1, new2
+                            current = swapped
+                            improved = True
+                            break
+                    else:
+                        continue
+                    break
+    return members
+
+
+@timed("weight_sweep")
+def sweep_weights(
+    team_events: list[TeamEvent],
+    weights: list[AllianceWeights],
+    alliance_size: int = 3,
+) -> list[SweepResult]:
+    """Optimal alliances for many weight vectors over one event snapshot.
+
+    Runs the same greedy (top-down and bottom-up) + swap search as
+    AllianceOptimizer, but scores every candidate alliance once and reuses
+    the feature table for all weight vectors.
+    """
+    scores = [
+        score_team(te) for te in team_events if te.epa is not None and te.epa > 0
+    ]
+    scores.sort(key=lambda t: t.epa, reverse=True)
+
+    if len(scores) < 2 * alliance_size or not weights:
+        return [SweepResult(weights=w, alliances=[], scores=[]) for w in weights]
+
+    num_alliances = min(8, len(scores) // alliance_size)
+    captains = scores[:num_alliances]
+    pool = scores[num_alliances:]
+
+    combos = np.array(
+        list(combinations(range(len(pool)), alliance_size - 1)), dtype=np.int64
+    )
+    combo_index = {tuple(c): i for i, c in enumerate(combos.tolist())}
+    features = _alliance_features(captains, pool, combos)
+    weight_matrix = _weight_matrix(weights)
+
+    top_down, td_total = _greedy(
+        features, combos, weight_matrix, list(range(num_alliances)), len(pool)
+    )
+    bottom_up, bu_total = _greedy(
+        features, combos, weight_matrix, list(range(num_alliances - 1, -1, -1)), len(pool)
+    )
+    chosen = np.where((td_total >= bu_total)[:, None], top_down, bottom_up)
+
+    solver_iterations.inc(len(weights), solver="weight_sweep")
+    results = []
+    for w_idx, w in enumerate(weights):
+        alliance_scores = (features @ weight_matrix[w_idx]).tolist()
+        members = [tuple(combos[m].tolist()) for m in chosen[w_idx]]
+        members = _local_search(alliance_scores, combo_index, members)
+
+        alliances = []
+        totals = []
+        for c, partners in enumerate(members):
+            alliances.append([captains[c]] + [pool[p] for p in partners])
+            totals.append(alliance_scores[c][combo_index[partners]])
+        ranked = sorted(range(num_alliances), key=lambda i: totals[i], reverse=True)
+        results.append(
+            SweepResult(
+                weights=w,
+                alliances=[alliances[i] for i in ranked],
+                scores=[totals[i] for i in ranked],
+            )
+        )
+    return results
+
+
+def captain_assignments(results: list[SweepResult]) -> dict[str, list[str | None]]:
+    """For each team, the captain whose alliance it joined under each weight."""
+    assignments: dict[str, list[str | None]] = {}
+    for i, result in enumerate(results):
+        for alliance in result.alliances:
+            captain = alliance[0].team_key
+            for t in alliance:
+                assignments.setdefault(t.team_key, [None] * len(results))[i] = captain
+    return assignments
@@ -0,0 +1,51 @@
+"""Build offline event bundles and optionally write them out for sideloading.
+
+    python -m app.tools.export_bundles 2024casj 2024cur --out ./bundles
+
+Writes <event>.v<N>.json.gz for the latest version and
+<event>.v<M>-v<N>.diff.json.gz for every kept diff, so tablets can be
+updated from a USB stick when the venue network is down.
+"""
+import argparse
+import asyncio
+from pathlib import Path
+
+from app.database import SessionLocal, sync_schema
+from app.models import EventBundleDiff
+from app.services.bundles import build_bundle
+
+
+async def export(event_keys: list[str], out: Path | None) -> list[dict]:
+    sync_schema()
+    db = SessionLocal()
+    results = []
+    try:
+        for event_key in event_keys:
+            bundle, created = await build_bundle(db, event_key)
+            results.append(
+                {"event_key": event_key, "version": bundle.version, "created": created}
+            )
+            if out is None:
+                continue
+            out.mkdir(parents=True, exist_ok=True)
+            (out / f"{event_key}.v{bundle.version}.json.gz").write_bytes(bundle.data)
+            diffs = db.query(EventBundleDiff).filter(EventBundleDiff.event_key == event_key)
+            for d in diffs:
+                name = f"{event_key}.v{d.from_version}-v{d.to_version}.diff.json.gz"
+                (out / name).write_bytes(d.data)
+    finally:
+        db.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("event_keys", nargs="+")
+    parser.add_argument("--out", type=Path)
+    args = parser.parse_args()
+    for result in asyncio.run(export(args.event_keys, args.out)):
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Drive mixed scout traffic against the backend and report latency.
+
+Each virtual user loops over weighted scenarios (event browsing, team
+lists, optimal-alliance POSTs, complement lookups and draft sessions with
+picks) until the duration ends. Results are JSON: throughput plus
+p50/p95/p99 latency and error rate per route.
+
+Typical run against the upstream stand-in:
+
+    python -m app.tools.synthetic_fixtures ./fixtures --year 2099
+    python -m app.tools.upstream_standin ./fixtures --port 9000 &
+    TBA_BASE_URL=http://localhost:9000/tba/api/v3 \
+    STATBOTICS_BASE_URL=http://localhost:9000/statbotics/v3 \
+        uvicorn app.main:app --port 8000 &
+    python -m app.tools.loadtest --url http://localhost:8000 --year 2099 \
+        --users 50 --duration 60 --output results.json
+
+Without --url the app is driven in-process (no network hop to the backend).
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import httpx
+
+DEFAULT_MIX = {
+    "browse_events": 0.2,
+    "team_list": 0.3,
+    "optimal_alliances": 0.15,
+    "complement": 0.15,
+    "draft": 0.2,
+}
+
+
+@dataclass
+class LoadStats:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    statuses: dict[str, dict[int, int]] = field(
+        default_factory=lambda: defaultdict(lambda: defaultdict(int))
+    )
+
+    def record(self, route: str, elapsed: float, status: int):
+        self.latencies[route].append(elapsed)
+        self.statuses[route][status] += 1
+        if status == 0 or status >= 400:
+            self.errors[route] += 1
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(stats: LoadStats, elapsed: float) -> dict:
+    routes = {}
+    total = 0
+    errors = 0
+    for route in sorted(stats.latencies):
+        values = sorted(stats.latencies[route])
+        count = len(values)
+        total += count
+        errors += stats.errors[route]
+        routes[route] = {
+            "requests": count,
+            "errors": stats.errors[route],
+            "error_rate": round(stats.errors[route] / count, 4),
+            "throughput_rps": round(count / elapsed, 2),
+            "mean_ms": round(sum(values) / count * 1000, 2),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2),
+            "status_codes": {str(k): v for k, v in sorted(stats.statuses[route].items())},
+        }
+    return {
+        "duration_s": round(elapsed, 2),
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "routes": routes,
+    }
+
+
+class VirtualUser:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        stats: LoadStats,
+        year: int,
+        event_keys: list[str],
+        rng: random.Random,
+    ):
+        self.client = client
+        self.stats = stats
+        self.year = year
+        self.event_keys = event_keys
+        self.rng = rng
+
+    async def request(self, method: str, route: str, url: str, **kwargs) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            resp = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(route, time.perf_counter() - start, 0)
+            return None
+        self.stats.record(route, time.perf_counter() - start, resp.status_code)
+        return resp
+
+    async def browse_events(self):
+        await self.request("GET", "GET /api/events", "/api/events", params={"year": self.year})
+
+    async def team_list(self):
+        event_key = self.rng.choice(self.event_keys)
+        await self.request(
+            "GET", "GET /api/events/{event_key}/teams", f"/api/events/{event_key}/teams"
+        )
+
+    async def optimal_alliances(self):
+        weights = {
+            "auto": round(self.rng.uniform(0.5, 2.0), 1),
+            "teleop": 1.0,
+            "endgame": round(self.rng.uniform(0.5, 2.0), 1),
+        }
+        await self.request(
+            "POST",
+            "POST /api/predict/optimal-alliances",
+            "/api/predict/optimal-alliances",
+            json={"event_key": self.rng.choice(self.event_keys), "weights": weights},
+        )
+
+    async def complement(self):
+        event_key = self.rng.choice(self.event_keys)
+        resp = await self.request(
+            "GET", "GET /api/events/{event_key}/teams", f"/api/events/{event_key}/teams"
+        )
+        if resp is None or resp.status_code != 200 or not resp.json():
+            return
+        team_key = self.rng.choice(resp.json())["team_key"]
+        await self.request(
+            "GET",
+            "GET /api/complement/{event_key}/{team_key}",
+            f"/api/complement/{event_key}/{team_key}",
+        )
+
+    async def draft(self):
+        resp = await self.request(
+            "POST",
+            "POST /api/draft/start",
+            "/api/draft/start",
+            json={"event_key": self.rng.choice(self.event_keys)},
+        )
+        if resp is None or resp.status_code != 200:
+            return
+        state = resp.json()
+        session = {"session_id": state["session_id"]}
+
+        # A scout makes a few manual picks, leans on auto-pick, then finishes
+        for _ in range(self.rng.randint(2, 6)):
+            if state["is_complete"] or not state["available_teams"]:
+                break
+            if self.rng.random() < 0.6:
+                team = self.rng.choice(state["available_teams"])
+                resp = await self.request(
+                    "POST",
+                    "POST /api/draft/pick",
+                    "/api/draft/pick",
+                    json={**session, "team_key": team["team_key"]},
+                )
+            else:
+                resp = await self.request(
+                    "POST", "POST /api/draft/auto-pick", "/api/draft/auto-pick", json=session
+                )
+            if resp is None or resp.status_code != 200:
+                return
+            state = resp.json()
+
+        if state["can_undo"] and self.rng.random() < 0.3:
+            await self.request("POST", "POST /api/draft/undo", "/api/draft/undo", json=session)
+        await self.request(
+            "GET", "GET /api/draft/{session_id}", f"/api/draft/{session['session_id']}"
+        )
+        await self.request(
+            "POST", "POST /api/draft/auto-complete", "/api/draft/auto-complete", json=session
+        )
+
+    async def run(self, deadline: float, mix: dict[str, float], think_time: float):
+        names = list(mix)
+        weights = [mix[n] for n in names]
+        while time.perf_counter() < deadline:
+            await getattr(self, self.rng.choices(names, weights)[0])()
+            if think_time:
+                await asyncio.sleep(self.rng.expovariate(1 / think_time))
+
+
+async def _warm_up(client: httpx.AsyncClient, year: int, event_keys: list[str] | None) -> list[str]:
+    """Load the season and every event's teams so upstream fetches aren't timed."""
+    resp = await client.get("/api/events", params={"year": year})
+    resp.raise_for_status()
+    keys = event_keys or [ev["key"] for ev in resp.json()]
+    if not keys:
+        raise SystemExit(f"No events for {year}; is the upstream stand-in running?")
+    for key in keys:
+        (await client.get(f"/api/events/{key}/teams")).raise_for_status()
+    return keys
+
+
+async def run_load(
+    url: str | None = None,
+    year: int = 2099,
+    users: int = 20,
+    duration: float = 30.0,
+    mix: dict[str, float] | None = None,
+    event_keys: list[str] | None = None,
+    think_time: float = 0.0,
+    seed: int = 0,
+) -> dict:
+    """Run the load test; in-process against app.main when url is None."""
+    mix = mix or DEFAULT_MIX
+    unknown = [name for name in mix if name not in DEFAULT_MIX]
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(unknown)}")
+
+    if url:
+        transport = None
+        base_url = url
+    else:
+        from app.database import sync_schema
+        from app.main import app
+
+        sync_schema()
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(
+        transport=transport, base_url=base_url, limits=limits, timeout=60.0
+    ) as client:
+        keys = await _warm_up(client, year, event_keys)
+
+        stats = LoadStats()
+        rng = random.Random(seed)
+        vus = [
+            VirtualUser(client, stats, year, keys, random.Random(rng.random()))
+            for _ in range(users)
+        ]
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(vu.run(deadline, mix, think_time) for vu in vus))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "config": {
+            "url": url or "in-process",
+            "year": year,
+            "users": users,
+            "duration_s": duration,
+            "think_time_s": think_time,
+            "mix": mix,
+            "events": keys,
+            "seed": seed,
+        },
+        **summarize(stats, elapsed),
+    }
+
+
+def _parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Base URL of a running backend")
+    parser.add_argument("--year", type=int, default=2099)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds")
+    parser.add_argument(
+        "--mix", type=_parse_mix, help="e.g. team_list=3,draft=1 (default: built-in mix)"
+    )
+    parser.add_argument("--events", nargs="*", help="Restrict to these event keys")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean seconds between scenarios")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run_load(
+            args.url,
+            args.year,
+            args.users,
+            args.duration,
+            args.mix,
+            args.events,
+            args.think_time,
+            args.seed,
+        )
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Rebuild the database from the upstream response archive, with no network.
+
+Replays every archived /events/{year} and /event/{key}/teams response
+through SyncService in offline mode, so the DB ends up as the archived
+upstream data would have made it.
+
+    UPSTREAM_ARCHIVE_DIR=./data/archive python -m app.tools.rebuild_from_archive
+"""
+import argparse
+import asyncio
+import re
+
+from app.config import settings
+from app.database import SessionLocal, sync_schema
+from app.models import CacheMeta
+from app.services.response_archive import get_archive
+from app.services.sync_service import SyncService
+
+_EVENTS_RE = re.compile(r"/events/(\d{4})$")
+_TEAMS_RE = re.compile(r"/event/([^/]+)/teams$")
+
+
+async def rebuild(years: set[int] | None = None) -> dict:
+    archive = get_archive()
+    if archive is None:
+        raise SystemExit("UPSTREAM_ARCHIVE_DIR is not set")
+    settings.UPSTREAM_OFFLINE = True
+
+    event_years: set[int] = set()
+    event_keys: set[str] = set()
+    for ref in archive.refs():
+        path = ref["url"].split("?")[0]
+        if m := _EVENTS_RE.search(path):
+            event_years.add(int(m.group(1)))
+        elif m := _TEAMS_RE.search(path):
+            event_keys.add(m.group(1))
+    if years:
+        event_years &= years
+        event_keys = {k for k in event_keys if int(k[:4]) in years}
+
+    sync_schema()
+    db = SessionLocal()
+    try:
+        # Force every sync below to read through to the (offline) clients
+        db.query(CacheMeta).delete()
+        db.commit()
+        svc = SyncService(db)
+        for year in sorted(event_years):
+            await svc.get_events(year)
+        for event_key in sorted(event_keys):
+            await svc.get_teams_for_event(event_key)
+    finally:
+        db.close()
+    return {"years": sorted(event_years), "events": len(event_keys)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--year", type=int, action="append")
+    args = parser.parse_args()
+    print(asyncio.run(rebuild(set(args.year) if args.year else None)))
+
+
+if __name__ == "__main__":
+    main()
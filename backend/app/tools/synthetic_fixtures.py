@@ -0,0 +1,219 @@
+"""Generate a synthetic fixture tree for the upstream stand-in.
+
+Writes a season of TBA events, team lists, rankings and qualification
+matches plus the matching Statbotics team_event pages, in the layout
+upstream_standin serves, so load tests don't need recorded data. The EPA
+helpers are shared with the benchmark suite's synthetic events.
+
+    python -m app.tools.synthetic_fixtures ./fixtures --year 2099 \
+        --events 8 --teams 40
+"""
+import argparse
+import json
+import math
+import random
+from pathlib import Path
+
+from app.services.upstream_fixtures import fixture_path
+
+STATBOTICS_PAGE = 100
+MATCHES_PER_TEAM = 12
+
+DISTRIBUTIONS = ("normal", "lognormal", "bimodal")
+
+
+def draw_epa(
+    rng: random.Random, distribution: str = "normal", mean: float = 40.0, spread: float = 12.0
+) -> float:
+    """One team's EPA from the given distribution, at least 1.0."""
+    if distribution == "normal":
+        epa = rng.gauss(mean, spread)
+    elif distribution == "lognormal":
+        # Long right tail: a few powerhouse teams over a weaker field
+        sigma = math.sqrt(math.log(1 + (spread / mean) ** 2))
+        epa = rng.lognormvariate(math.log(mean) - sigma**2 / 2, sigma)
+    elif distribution == "bimodal":
+        # Veteran and rookie clusters, as at championship divisions
+        if rng.random() < 0.35:
+            epa = rng.gauss(mean + spread, spread / 2)
+        else:
+            epa = rng.gauss(mean - spread / 2, spread / 2)
+    else:
+        raise ValueError(f"Unknown distribution: {distribution}")
+    return max(1.0, epa)
+
+
+def split_epa(rng: random.Random, epa: float) -> tuple[float, float, float]:
+    """(auto, teleop, endgame) from a random profile, so pools mix specialists."""
+    profile = [rng.uniform(0.1, 1.0) for _ in range(3)]
+    total = sum(profile)
+    auto, teleop, endgame = (epa * p / total for p in profile)
+    return auto, teleop, endgame
+
+
+def _write(root: Path, service: str, path: str, body, params: dict | None = None):
+    target = fixture_path(root, service, path, params)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(body))
+
+
+def _qual_schedule(rng: random.Random, team_keys: list[str]) -> list[list[str]]:
+    """Six-team match lineups giving every team roughly MATCHES_PER_TEAM plays."""
+    num_matches = max(1, len(team_keys) * MATCHES_PER_TEAM // 6)
+    lineups = []
+    queue: list[str] = []
+    while len(lineups) < num_matches:
+        if len(queue) < 6:
+            queue += rng.sample(team_keys, len(team_keys))
+        lineup, queue = queue[:6], queue[6:]
+        if len(set(lineup)) == 6:
+            lineups.append(lineup)
+    return lineups
+
+
+def generate(
+    root: str | Path,
+    year: int = 2099,
+    num_events: int = 8,
+    teams_per_event: int = 40,
+    seed: int = 0,
+) -> list[str]:
+    """Write the fixture tree and return the generated event keys."""
+    root = Path(root)
+    rng = random.Random(seed)
+    team_pool = list(range(1, max(teams_per_event * 3, 200) + 1))
+    skill = {n: draw_epa(rng) for n in team_pool}
+
+    events = []
+    for e in range(num_events):
+        event_key = f"{year}syn{e + 1}"
+        week = e % 6 + 1
+        events.append(
+            {
+                "key": event_key,
+                "name": f"Synthetic Regional {e + 1}",
+                "event_type": 0,
+                "city": "Testville",
+                "state_prov": "TS",
+                "country": "USA",
+                "start_date": f"{year}-03-{week * 4:02d}",
+                "end_date": f"{year}-03-{week * 4 + 2:02d}",
+                "week": week - 1,
+            }
+        )
+
+        numbers = sorted(rng.sample(team_pool, min(teams_per_event, len(team_pool))))
+        team_keys = [f"frc{n}" for n in numbers]
+        _write(
+            root,
+            "tba",
+            f"/event/{event_key}/teams",
+            [
+                {
+                    "key": f"frc{n}",
+                    "team_number": n,
+                    "nickname": f"Team {n}",
+                    "name": f"Synthetic Team {n}",
+                    "city": "Testville",
+                    "state_prov": "TS",
+                    "country": "USA",
+                    "rookie_year": 2000 + n % 25,
+                }
+                for n in numbers
+            ],
+        )
+
+        rows = []
+        for n in numbers:
+            epa = max(1.0, skill[n] + rng.gauss(0, 4))
+            auto, teleop, endgame = split_epa(rng, epa)
+            rows.append(
+                {
+                    "team": n,
+                    "event": event_key,
+                    "year": year,
+                    "epa": {
+                        "total_points": {"mean": round(epa, 2)},
+                        "breakdown": {
+                            "auto_points": round(auto, 2),
+                            "teleop_points": round(teleop, 2),
+                            "endgame_points": round(endgame, 2),
+                            "rp_1": round(rng.uniform(0, 1), 3),
+                            "rp_2": round(rng.uniform(0, 1), 3),
+                        },
+                    },
+                }
+            )
+        for offset in range(0, len(rows) + 1, STATBOTICS_PAGE):
+            _write(
+                root,
+                "statbotics",
+                "/team_events",
+                rows[offset : offset + STATBOTICS_PAGE],
+                {"event": event_key, "limit": STATBOTICS_PAGE, "offset": offset},
+            )
+
+        epa = {f"frc{r['team']}": r["epa"]["total_points"]["mean"] for r in rows}
+        record = {k: {"wins": 0, "losses": 0, "ties": 0} for k in team_keys}
+        matches = []
+        for i, lineup in enumerate(_qual_schedule(rng, team_keys), start=1):
+            red, blue = lineup[:3], lineup[3:]
+            red_score = round(sum(epa[k] for k in red) + rng.gauss(0, 10))
+            blue_score = round(sum(epa[k] for k in blue) + rng.gauss(0, 10))
+            for side, other, keys in ((red_score, blue_score, red), (blue_score, red_score, blue)):
+                result = "wins" if side > other else "losses" if side < other else "ties"
+                for k in keys:
+                    record[k][result] += 1
+            matches.append(
+                {
+                    "key": f"{event_key}_qm{i}",
+                    "event_key": event_key,
+                    "comp_level": "qm",
+                    "set_number": 1,
+                    "match_number": i,
+                    "time": 1_700_000_000 + i * 420,
+                    "alliances": {
+                        "red": {"team_keys": red, "score": max(0, red_score)},
+                        "blue": {"team_keys": blue, "score": max(0, blue_score)},
+                    },
+                    "videos": [],
+                }
+            )
+        _write(root, "tba", f"/event/{event_key}/matches", matches)
+
+        standings = sorted(
+            team_keys,
+            key=lambda k: (record[k]["wins"] * 2 + record[k]["ties"], epa[k]),
+            reverse=True,
+        )
+        _write(
+            root,
+            "tba",
+            f"/event/{event_key}/rankings",
+            {
+                "rankings": [
+                    {"team_key": k, "rank": rank, "record": record[k]}
+                    for rank, k in enumerate(standings, start=1)
+                ]
+            },
+        )
+
+    _write(root, "tba", f"/events/{year}", events)
+    return [ev["key"] for ev in events]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("root")
+    parser.add_argument("--year", type=int, default=2099)
+    parser.add_argument("--events", type=int, default=8)
+    parser.add_argument("--teams", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for key in generate(args.root, args.year, args.events, args.teams, args.seed):
+        print(key)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Local stand-in for the TBA and Statbotics APIs, served from fixtures.
+
+Fixtures are the files written with UPSTREAM_RECORD_DIR set. Point the
+backend at the stand-in with
+
+    TBA_BASE_URL=http://localhost:9000/tba/api/v3
+    STATBOTICS_BASE_URL=http://localhost:9000/statbotics/v3
+
+and start it with
+
+    python -m app.tools.upstream_standin ./fixtures --port 9000 \
+        --latency-ms 120 --jitter-ms 40 --error-rate 0.01
+
+Latency, error rate and ETag/304 behaviour are configurable so production
+sync load can be reproduced deterministically (fixed --seed).
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from fastapi import FastAPI, Request, Response
+
+from app.services.upstream_fixtures import fixture_path
+
+SERVICES = {"tba": "/tba/api/v3", "statbotics": "/statbotics/v3"}
+
+
+@dataclass
+class StandinConfig:
+    fixtures: Path
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    etags: bool = True
+    seed: int | None = None
+    stats: dict[str, int] = field(default_factory=dict)
+
+
+def create_app(config: StandinConfig) -> FastAPI:
+    app = FastAPI(title="Upstream stand-in")
+    rng = random.Random(config.seed)
+    etag_cache: dict[Path, str] = {}
+
+    def count(name: str):
+        config.stats[name] = config.stats.get(name, 0) + 1
+
+    async def serve(service: str, path: str, request: Request) -> Response:
+        count("requests")
+        delay = config.latency_ms + rng.uniform(-1, 1) * config.jitter_ms
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if config.error_rate and rng.random() < config.error_rate:
+            count("errors")
+            return Response(status_code=config.error_status)
+
+        try:
+            target = fixture_path(
+                config.fixtures, service, f"/{path}", dict(request.query_params)
+            )
+        except ValueError:
+            target = None
+        if target is None or not target.exists():
+            count("missing")
+            return Response(status_code=404)
+
+        body = target.read_bytes()
+        headers = {}
+        if config.etags:
+            etag = etag_cache.get(target)
+            if etag is None:
+                etag = etag_cache[target] = f'"{hashlib.sha1(body).hexdigest()}"'
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                count("not_modified")
+                return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    def handler_for(service: str):
+        # Bound here rather than as a default argument, which FastAPI would
+        # expose as a ?service= query parameter
+        async def handler(path: str, request: Request):
+            return await serve(service, path, request)
+
+        return handler
+
+    for service, prefix in SERVICES.items():
+        app.add_api_route(f"{prefix}/{{path:path}}", handler_for(service), methods=["GET"])
+
+    @app.get("/_standin/stats")
+    async def stats():
+        return config.stats
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fixtures")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--no-etags", action="store_true", help="Never answer 304")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    config = StandinConfig(
+        fixtures=Path(args.fixtures),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        etags=not args.no_etags,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
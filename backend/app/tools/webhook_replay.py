@@ -0,0 +1,95 @@
+"""Replay recorded TBA webhook payloads against the webhook endpoint.
+
+Reads the JSONL written when TBA_WEBHOOK_RECORD_PATH is set (or a JSONL of
+bare ``{"message_type": ..., "message_data": ...}`` objects), re-signs each
+body with TBA_WEBHOOK_SECRET and posts it in order.
+
+    python -m app.tools.webhook_replay payloads.jsonl
+    python -m app.tools.webhook_replay payloads.jsonl --url http://localhost:8000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from app.config import settings
+from app.routers.webhooks import sign_payload
+
+WEBHOOK_PATH = "/api/webhooks/tba"
+
+
+def load_payloads(path: str) -> list[bytes]:
+    payloads = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            body = record["body"] if "body" in record else json.dumps(record)
+            payloads.append(body.encode())
+    return payloads
+
+
+async def replay(
+    payloads: list[bytes],
+    url: str | None = None,
+    secret: str | None = None,
+    delay: float = 0.0,
+) -> list[dict]:
+    """Post each payload; in-process against app.main when url is None."""
+    secret = secret or settings.TBA_WEBHOOK_SECRET
+    if url:
+        transport = None
+        base_url = url
+    else:
+        from app.database import sync_schema
+        from app.main import app
+
+        sync_schema()
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://replay"
+
+    results = []
+    async with httpx.AsyncClient(transport=transport, base_url=base_url) as client:
+        for body in payloads:
+            start = time.perf_counter()
+            resp = await client.post(
+                WEBHOOK_PATH,
+                content=body,
+                headers={
+                    "Content-Type": "application/json",
+                    "X-TBA-HMAC": sign_payload(secret, body),
+                },
+            )
+            results.append(
+                {
+                    "status": resp.status_code,
+                    "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+                    "response": resp.json() if resp.content else None,
+                }
+            )
+            if delay:
+                await asyncio.sleep(delay)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--url", help="Base URL of a running backend")
+    parser.add_argument("--secret", help="Defaults to TBA_WEBHOOK_SECRET")
+    parser.add_argument("--delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        replay(load_payloads(args.path), args.url, args.secret, args.delay)
+    )
+    for r in results:
+        print(json.dumps(r))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+"""Lightweight per-request tracing.
+
+TracingMiddleware opens a trace for each sampled HTTP request; span() and
+record_span() add child spans for the phases inside it (upstream calls,
+parsing, DB reads/writes, scoring, serialization). Each span also counts the
+SQL statements issued while it was current. Finished traces are exported
+from a background thread to TRACE_JSONL_PATH and/or TRACE_OTLP_ENDPOINT
+(OTLP/HTTP JSON, e.g. http://collector:4318/v1/traces).
+
+When no exporter is configured and no profile was requested, no trace is
+created and span() is a no-op.
+"""
+import functools
+import hmac
+import inspect
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+import httpx
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+from app.config import settings
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start: float  # epoch seconds
+    duration: float = 0.0
+    attributes: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+        }
+
+
+class Trace:
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: list[Span] = []
+        self.endpoint_end: float | None = None  # perf_counter
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+
+_trace: ContextVar[Trace | None] = ContextVar("trace", default=None)
+_current: ContextVar[Span | None] = ContextVar("span", default=None)
+
+
+def _new_span(trace: Trace, name: str, attributes: dict) -> Span:
+    parent = _current.get()
+    return Span(
+        name=name,
+        trace_id=trace.trace_id,
+        span_id=os.urandom(8).hex(),
+        parent_id=parent.span_id if parent else None,
+        start=time.time(),
+        attributes=attributes,
+    )
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time a block as a child of the current span (no-op outside a trace)."""
+    trace = _trace.get()
+    if trace is None:
+        yield None
+        return
+    s = _new_span(trace, name, attributes)
+    token = _current.set(s)
+    start = time.perf_counter()
+    try:
+        yield s
+    except BaseException as e:
+        s.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        s.duration = time.perf_counter() - start
+        _current.reset(token)
+        trace.add(s)
+
+
+def record_span(name: str, started: float, **attributes):
+    """Add a finished span that began at perf_counter() value started.
+
+    For work that can't be wrapped in span(), e.g. a streamed response whose
+    body is consumed by the caller between yields.
+    """
+    trace = _trace.get()
+    if trace is None:
+        return
+    duration = time.perf_counter() - started
+    s = _new_span(trace, name, attributes)
+    s.start -= duration
+    s.duration = duration
+    trace.add(s)
+
+
+def traced(name: str):
+    """Decorator running a function inside span(name)."""
+
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+
+            return functools.update_wrapper(async_wrapper, fn)
+
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return functools.update_wrapper(wrapper, fn)
+
+    return decorate
+
+
+def instrument_engine(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        s = _current.get()
+        if s is not None:
+            s.attributes["db.statements"] = s.attributes.get("db.statements", 0) + 1
+
+
+class TracedRoute(APIRoute):
+    """APIRoute that traces the endpoint call and response serialization.
+
+    The endpoint span ends when the handler returns; everything between that
+    and the Response being built (response_model validation and JSON
+    encoding) is recorded as a serialize span.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, endpoint, **kwargs)
+        call = self.dependant.call
+        name = f"endpoint {self.name}"
+
+        def done():
+            trace = _trace.get()
+            if trace is not None:
+                trace.endpoint_end = time.perf_counter()
+
+        if inspect.iscoroutinefunction(call):
+
+            async def traced_call(**values):
+                try:
+                    with span(name):
+                        return await call(**values)
+                finally:
+                    done()
+
+        else:
+
+            def traced_call(**values):
+                try:
+                    with span(name):
+                        return call(**values)
+                finally:
+                    done()
+
+        self.dependant.call = traced_call
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def traced_handler(request):
+            response = await handler(request)
+            trace = _trace.get()
+            if trace is not None and trace.endpoint_end is not None:
+                record_span("serialize", trace.endpoint_end)
+            return response
+
+        return traced_handler
+
+
+class _Exporter:
+    """Ships finished traces off the request path on a daemon thread."""
+
+    def __init__(self):
+        self._queue: queue.Queue[list[Span]] = queue.Queue(maxsize=1000)
+        self._thread: threading.Thread | None = None
+
+    def submit(self, spans: list[Span]):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            pass  # drop rather than slow requests down
+
+    def _run(self):
+        while True:
+            spans = self._queue.get()
+            try:
+                export(spans)
+            except Exception:
+                pass
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: list[Span]) -> dict:
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": "frc-alliance-scout"}}
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "app.tracing"},
+                        "spans": [
+                            {
+                                "traceId": s.trace_id,
+                                "spanId": s.span_id,
+                                "parentSpanId": s.parent_id or "",
+                                "name": s.name,
+                                "kind": 2 if s.parent_id is None else 1,
+                                "startTimeUnixNano": str(int(s.start * 1e9)),
+                                "endTimeUnixNano": str(int((s.start + s.duration) * 1e9)),
+                                "attributes": [
+                                    {"key": k, "value": _otlp_value(v)}
+                                    for k, v in s.attributes.items()
+                                ],
+                            }
+                            for s in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def export(spans: list[Span]):
+    if settings.TRACE_JSONL_PATH:
+        with open(settings.TRACE_JSONL_PATH, "a") as f:
+            for s in spans:
+                f.write(json.dumps(s.to_dict()) + "\n")
+    if settings.TRACE_OTLP_ENDPOINT:
+        httpx.post(settings.TRACE_OTLP_ENDPOINT, json=to_otlp(spans), timeout=5.0)
+
+
+_exporter = _Exporter()
+
+
+def tracing_enabled() -> bool:
+    return bool(settings.TRACE_JSONL_PATH or settings.TRACE_OTLP_ENDPOINT)
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware opening a trace per sampled request.
+
+    With ADMIN_TOKEN set, a request carrying ``X-Profile: 1`` and a matching
+    ``X-Admin-Token`` is also run under the sampling profiler; its response
+    is replaced by a JSON report with the spans and the profile.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        profile = headers.get(b"x-profile") == b"1" and bool(settings.ADMIN_TOKEN)
+        if profile and not hmac.compare_digest(
+            headers.get(b"x-admin-token", b""), settings.ADMIN_TOKEN.encode()
+        ):
+            body = b'{"detail":"Invalid admin token"}'
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 403,
+                    "headers": [(b"content-type", b"application/json")],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        sampled = tracing_enabled() and random.random() < settings.TRACE_SAMPLE_RATE
+        if not (sampled or profile):
+            return await self.app(scope, receive, send)
+
+        trace = Trace()
+        trace_token = _trace.set(trace)
+        root = _new_span(trace, f"{scope['method']} {scope['path']}", {})
+        span_token = _current.set(root)
+        status = 500
+        captured: list[bytes] = []
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if not profile:
+                    await send(message)
+            elif profile:
+                captured.append(message.get("body", b""))
+            else:
+                await send(message)
+
+        profiler = None
+        if profile:
+            from app.profiler import SamplingProfiler
+
+            profiler = SamplingProfiler()
+            profiler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            root.duration = time.perf_counter() - start
+            if profiler is not None:
+                profiler.stop()
+            _current.reset(span_token)
+            _trace.reset(trace_token)
+            route = scope.get("route")
+            if route is not None:
+                root.name = f"{scope['method']} {route.path}"
+            root.attributes.update(
+                {"http.method": scope["method"], "http.target": scope["path"], "http.status_code": status}
+            )
+            trace.add(root)
+            if sampled:
+                _exporter.submit(list(trace.spans))
+
+        if profiler is not None:
+            spans = sorted(trace.spans, key=lambda s: s.start)
+            report = json.dumps(
+                {
+                    "status_code": status,
+                    "elapsed_ms": round(root.duration * 1000, 3),
+                    "response_bytes": sum(len(c) for c in captured),
+                    "spans": [s.to_dict() for s in spans],
+                    "profile": profiler.report(),
+                }
+            ).encode()
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(report)).encode()),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": report})
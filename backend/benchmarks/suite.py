@@ -0,0 +1,330 @@
+"""Micro-benchmarks for the scoring services, with stored baselines.
+
+Times compute_optimal_alliances (3- and 4-robot alliances), _local_search,
+auto_pick, auto_complete, to_response and find_complements over synthetic
+events (see PRESETS in benchmarks.synthetic) and compares each to
+benchmarks/baselines.json.
+
+Run from backend/:
+
+    python -m benchmarks.suite                    # compare to baselines
+    python -m benchmarks.suite --stress           # include 600-team cases
+    python -m benchmarks.suite --save             # record new baselines
+    python -m benchmarks.suite -k auto_ --threshold 0.5
+
+Each sample is paired with a fixed calibration workload timed just before
+it, and cases are compared by their best sample/calibration ratio, so a
+slower machine, or one that is busy for part of the run, doesn't read as a
+regression. Fast cases are looped timeit-autorange style, so each sample
+covers at least MIN_SAMPLE_SECONDS.
+
+Exits 1 when any case's ratio is above baseline * (1 + threshold) and its
+time by at least the noise floor. A case whose samples spread widely (in
+this run or in its baseline) gets a proportionally wider threshold instead
+of failing on its own noise; the threshold applied is printed per case.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+from app.services.alliance_optimizer import AllianceOptimizer, score_team
+from app.services.complement_finder import ComplementFinder
+from app.services.draft_simulator import DraftPhase, DraftSession
+from benchmarks.synthetic import preset_event
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+DEFAULT_THRESHOLD = 0.25
+# Slowdowns smaller than this are timer and scheduler noise, whatever the ratio
+DEFAULT_NOISE_FLOOR_MS = 0.5
+# Calls faster than this are repeated until a sample takes MIN_SAMPLE_SECONDS
+LOOP_BELOW_MS = 10.0
+MIN_SAMPLE_SECONDS = 0.2
+# A case's threshold is at least this many times its relative sample spread
+SPREAD_FACTOR = 3.0
+
+# Setup returns the zero-argument callable to time; setup itself is untimed.
+Setup = Callable[[list], Callable[[], object]]
+
+
+@dataclass
+class Case:
+    name: str
+    preset: str
+    setup: Setup
+    repeat: int = 7
+    # False when the timed callable mutates state (one call per setup)
+    reusable: bool = True
+
+
+def _optimal_alliances(teams, alliance_size: int = 3):
+    def run():
+        # Seeded so every run does the same local-search work
+        return AllianceOptimizer(seed=0).compute_optimal_alliances(teams, alliance_size)
+
+    return run
+
+
+def _local_search(teams):
+    optimizer = AllianceOptimizer()
+    scores = sorted(
+        (score_team(te) for te in teams if te.epa), key=lambda t: t.epa, reverse=True
+    )
+    captains, pool = scores[:8], scores[8:]
+    start = optimizer._greedy_assign(captains, pool)
+
+    def run():
+        optimizer.rng = random.Random(0)
+        return optimizer._local_search([list(a) for a in start])
+
+    return run
+
+
+def _auto_pick(teams):
+    session = DraftSession("2099bench", teams)
+    return session.auto_pick
+
+
+def _auto_complete(teams):
+    session = DraftSession("2099bench", teams)
+
+    def run():
+        while session.phase != DraftPhase.COMPLETE:
+            session.auto_pick()
+
+    return run
+
+
+def _to_response(teams):
+    session = DraftSession("2099bench", teams)
+    for _ in range(session.snapshot.num_alliances):
+        session.auto_pick()
+    return session.to_response
+
+
+def _find_complements(teams):
+    target, available = teams[0], teams[1:]
+    finder = ComplementFinder()
+    return lambda: finder.find_complements(target, available)
+
+
+def _find_all_complements(teams):
+    finder = ComplementFinder()
+    return lambda: finder.find_all_complements(teams)
+
+
+CASES = [
+    Case("compute_optimal_alliances", "district", _optimal_alliances),
+    Case("compute_optimal_alliances", "regional", _optimal_alliances),
+    Case("compute_optimal_alliances", "division", _optimal_alliances),
+    Case("compute_optimal_alliances", "stress", _optimal_alliances, repeat=2),
+    Case("compute_optimal_alliances_k4", "district", partial(_optimal_alliances, alliance_size=4)),
+    Case("compute_optimal_alliances_k4", "division", partial(_optimal_alliances, alliance_size=4)),
+    Case("_local_search", "district", _local_search),
+    Case("_local_search", "division", _local_search),
+    Case("auto_pick", "district", _auto_pick, reusable=False),
+    Case("auto_pick", "regional", _auto_pick, reusable=False),
+    Case("auto_pick", "division", _auto_pick, reusable=False),
+    Case("auto_pick", "stress", _auto_pick, repeat=1, reusable=False),
+    Case("auto_complete", "district", _auto_complete, reusable=False),
+    Case("auto_complete", "division", _auto_complete, repeat=5, reusable=False),
+    Case("to_response", "district", _to_response),
+    Case("to_response", "division", _to_response),
+    Case("to_response", "stress", _to_response),
+    Case("find_complements", "division", _find_complements),
+    Case("find_complements", "stress", _find_complements),
+    Case("find_all_complements", "regional", _find_all_complements),
+    Case("find_all_complements", "division", _find_all_complements),
+    Case("find_all_complements", "stress", _find_all_complements, repeat=2),
+]
+
+
+def case_id(case: Case) -> str:
+    return f"{case.name}[{case.preset}]"
+
+
+def _sample(case: Case, teams: list) -> tuple[float, int]:
+    """(seconds per call, calls timed) for one sample."""
+    # Fresh setup each time: auto_pick/auto_complete mutate the session
+    fn = case.setup(teams)
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    if not case.reusable or elapsed * 1000 >= LOOP_BELOW_MS:
+        return elapsed, 1
+    timer = timeit.Timer(fn)
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= MIN_SAMPLE_SECONDS:
+            return elapsed / loops, loops
+        loops *= 10 if elapsed < MIN_SAMPLE_SECONDS / 10 else 2
+
+
+def time_case(case: Case) -> dict:
+    teams = preset_event(case.preset)
+    samples, gauges, ratios = [], [], []
+    loops = 1
+    for _ in range(case.repeat):
+        gauge = calibrate(1)
+        per_call, loops = _sample(case, teams)
+        samples.append(per_call)
+        gauges.append(gauge)
+        ratios.append(per_call * 1000 / gauge)
+    best = min(ratios)
+    return {
+        "teams": len(teams),
+        "repeat": case.repeat,
+        "loops": loops,
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "min_ms": round(min(samples) * 1000, 3),
+        "calibration_ms": round(min(gauges), 3),
+        # Best sample over its calibration, and how far the typical ratio
+        # sits above it
+        "ratio": round(best, 6),
+        "spread": round(statistics.median(ratios) / best - 1, 4),
+    }
+
+
+def calibrate(repeat: int = 5) -> float:
+    """Best ms of a fixed pure-Python workload, as a machine speed gauge."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rng = random.Random(0)
+        values = sorted(rng.random() for _ in range(200_000))
+        sum(v * v for v in values)
+        samples.append(time.perf_counter() - start)
+    return min(samples) * 1000
+
+
+def slowdown(result: dict, base: dict, scale: float = 1.0) -> float:
+    """Relative slowdown against the baseline, adjusted for machine speed.
+
+    Compares calibration ratios; baselines recorded before ratios fall back
+    to the best time rescaled by the calibration (or run-wide scale).
+    """
+    if result.get("ratio") and base.get("ratio"):
+        return result["ratio"] / base["ratio"] - 1
+    if result.get("calibration_ms") and base.get("calibration_ms"):
+        scale = result["calibration_ms"] / base["calibration_ms"]
+    return result["min_ms"] / (base["min_ms"] * scale) - 1
+
+
+def case_threshold(result: dict, base: dict, threshold: float) -> float:
+    """threshold, widened to SPREAD_FACTOR times the larger spread of the
+    run and the baseline."""
+    spread = max(result.get("spread", 0.0), base.get("spread", 0.0))
+    return max(threshold, SPREAD_FACTOR * spread)
+
+
+def compare(
+    results: dict,
+    baselines: dict,
+    threshold: float,
+    scale: float = 1.0,
+    noise_floor_ms: float = DEFAULT_NOISE_FLOOR_MS,
+) -> list[str]:
+    """Case ids slower than their baseline by more than their threshold.
+
+    Best samples are compared rather than medians: they are the least
+    disturbed by other load on the machine. Slowdowns under noise_floor_ms
+    never count, so sub-millisecond cases can't fail on jitter alone.
+    """
+    regressions = []
+    for cid, result in results.items():
+        base = baselines.get(cid)
+        if not base:
+            continue
+        change = slowdown(result, base, scale)
+        expected = result["min_ms"] / (1 + change)
+        if (
+            change > case_threshold(result, base, threshold)
+            and result["min_ms"] - expected >= noise_floor_ms
+        ):
+            regressions.append(cid)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", help="Only cases whose id contains this")
+    parser.add_argument("--stress", action="store_true", help="Include 600-team cases")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--noise-floor",
+        type=float,
+        default=DEFAULT_NOISE_FLOOR_MS,
+        help="Ignore slowdowns smaller than this many ms",
+    )
+    parser.add_argument("--save", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    cases = [
+        c
+        for c in CASES
+        if (args.stress or c.preset != "stress") and (not args.k or args.k in case_id(c))
+    ]
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    baselines = stored.get("cases", {})
+    # Run-wide scale, for baselines recorded without per-case calibration
+    before = calibrate()
+    results = {case_id(c): time_case(c) for c in cases}
+    calibration = min(before, calibrate())
+    scale = calibration / stored["calibration_ms"] if stored.get("calibration_ms") else 1.0
+
+    if not args.json:
+        for cid, result in results.items():
+            base = baselines.get(cid)
+            delta = (
+                f"{slowdown(result, base, scale) * 100:+7.1f}%"
+                f" (limit {case_threshold(result, base, args.threshold):.0%})"
+                if base
+                else "     new"
+            )
+            print(
+                f"{cid:<44} {result['min_ms']:10.2f} ms"
+                f" (median {result['median_ms']:.2f})  {delta}"
+            )
+
+    if args.save:
+        baselines.update(results)
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "calibration_ms": round(calibration, 3),
+                    "cases": dict(sorted(baselines.items())),
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        return
+
+    regressions = compare(results, baselines, args.threshold, scale, args.noise_floor)
+    if args.json:
+        print(
+            json.dumps(
+                {"scale": round(scale, 3), "results": results, "regressions": regressions},
+                indent=2,
+            )
+        )
+    elif regressions:
+        print(f"\nRegressions beyond their limits: {', '.join(regressions)}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import random
+
+from app.models.team_event import TeamEvent
+from app.tools.synthetic_fixtures import draw_epa, split_epa
+
+# name -> (num_teams, distribution); district events through stress pools
+PRESETS = {
+    "district": (36, "normal"),
+    "regional": (50, "lognormal"),
+    "division": (75, "bimodal"),
+    "stress": (600, "lognormal"),
+}
+
+
+def synthetic_event(
+    num_teams: int,
+    event_key: str = "2099synth",
+    seed: int = 0,
+    mean_epa: float = 40.0,
+    spread: float = 12.0,
+    distribution: str = "normal",
+    consistency: bool = False,
+) -> list[TeamEvent]:
+    """Unsaved TeamEvent rows with EPA drawn from the given distribution
+    (see app.tools.synthetic_fixtures.DISTRIBUTIONS).
+
+    Each team's EPA is split across auto/teleop/endgame with a random
+    profile, so the pool has a realistic mix of specialists. With
+    consistency set, teams also get a match-derived consistency score.
+    """
+    rng = random.Random(seed)
+    teams = []
+    for i in range(num_teams):
+        epa = draw_epa(rng, distribution, mean_epa, spread)
+        auto, teleop, endgame = split_epa(rng, epa)
+        teams.append(
+            TeamEvent(
+                team_key=f"frc{1000 + i}",
+                event_key=event_key,
+                team_number=1000 + i,
+                nickname=f"Synthetic {i}",
+                rank=i + 1,
+                wins=0,
+                losses=0,
+                ties=0,
+                epa=epa,
+                auto_epa=auto,
+                teleop_epa=teleop,
+                endgame_epa=endgame,
+                rp_1_epa=rng.uniform(0, 1),
+                rp_2_epa=rng.uniform(0, 1),
+                consistency=rng.uniform(0.4, 1.0) if consistency else None,
+            )
+        )
+    rng.shuffle(teams)
+    for rank, te in enumerate(sorted(teams, key=lambda t: -t.epa), start=1):
+        te.rank = rank
+    return teams
+
+
+def preset_event(name: str, seed: int = 0) -> list[TeamEvent]:
+    num_teams, distribution = PRESETS[name]
+    return synthetic_event(
+        num_teams,
+        event_key=f"2099{name}",
+        seed=seed,
+        distribution=distribution,
+        consistency=True,
+    )
@@ -0,0 +1,76 @@
+import type { QueryClient } from "@tanstack/react-query";
+import api from "./client";
+import { DEFAULT_WEIGHTS } from "./predictions";
+import type { DashboardRequest, DashboardSection, TeamEvent } from "../types";
+
+// Streams the composite dashboard as NDJSON, calling onSection for each
+// section as soon as the server finishes it. Uses fetch because axios can't
+// read a response body incrementally in the browser.
+export async function streamDashboard(
+  eventKey: string,
+  req: DashboardRequest,
+  onSection: (section: DashboardSection) => void
+): Promise<void> {
+  const res = await fetch(`${api.defaults.baseURL}/api/events/${eventKey}/dashboard`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ ...req, stream: true }),
+  });
+  if (!res.ok || !res.body) {
+    throw new Error(`Dashboard request failed: ${res.status}`);
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = "";
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffered += decoder.decode(value, { stream: true });
+    const lines = buffered.split("\n");
+    buffered = lines.pop() ?? "";
+    for (const line of lines) {
+      if (line.trim()) onSection(JSON.parse(line));
+    }
+  }
+  if (buffered.trim()) onSection(JSON.parse(buffered));
+}
+
+// One round trip for the event page: resolves with the teams as soon as they
+// arrive (first paint), then seeds the predictions and complement queries so
+// navigating to those pages needs no further requests.
+export function loadEventDashboard(
+  queryClient: QueryClient,
+  eventKey: string
+): Promise<TeamEvent[]> {
+  return new Promise((resolve, reject) => {
+    let resolved = false;
+    streamDashboard(
+      eventKey,
+      { sections: ["teams", "alliances", "complements"] },
+      (s) => {
+        if ("error" in s) {
+          if (s.section === "teams") reject(new Error(s.error));
+          return;
+        }
+        if (s.section === "teams") {
+          resolved = true;
+          resolve(s.data);
+        } else if (s.section === "alliances") {
+          queryClient.setQueryData(["predictions", eventKey, DEFAULT_WEIGHTS], s.data);
+        } else if (s.section === "complements") {
+          for (const c of s.data) {
+            queryClient.setQueryData(["complement", eventKey, c.target_team.team_key], c);
+          }
+        }
+      }
+    ).then(
+      () => {
+        if (!resolved) reject(new Error("Dashboard returned no teams"));
+      },
+      (e) => {
+        if (!resolved) reject(e);
+      }
+    );
+  });
+}
@@ -43,3 +43,24 @@ export async function getDraftState(
   const { data } = await api.get<DraftState>(`/api/draft/${sessionId}`);
   return data;
 }
+
+export async function forkDraft(sessionId: string): Promise<DraftState> {
+  const { data } = await api.post<DraftState>("/api/draft/fork", {
+    session_id: sessionId,
+  });
+  return data;
+}
+
+export async function undoPick(sessionId: string): Promise<DraftState> {
+  const { data } = await api.post<DraftState>("/api/draft/undo", {
+    session_id: sessionId,
+  });
+  return data;
+}
+
+export async function redoPick(sessionId: string): Promise<DraftState> {
+  const { data } = await api.post<DraftState>("/api/draft/redo", {
+    session_id: sessionId,
+  });
+  return data;
+}
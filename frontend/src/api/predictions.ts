@@ -5,6 +5,14 @@ import type {
   ComplementResponse,
 } from "../types";
 
+export const DEFAULT_WEIGHTS: AllianceWeights = {
+  auto: 1.0,
+  teleop: 1.0,
+  endgame: 1.0,
+  consistency: 0.5,
+  synergy: 0.3,
+};
+
 export async function predictAlliances(
   eventKey: string,
   weights?: AllianceWeights
@@ -25,3 +33,14 @@ export async function fetchComplements(
   );
   return data;
 }
+
+export async function fetchAllComplements(
+  eventKey: string,
+  topN: number = 10
+): Promise<ComplementResponse[]> {
+  const { data } = await api.get<ComplementResponse[]>(
+    `/api/complement/${eventKey}`,
+    { params: { top_n: topN } }
+  );
+  return data;
+}
@@ -1,7 +1,7 @@
 import { useState } from "react";
 import { useParams, Link } from "react-router-dom";
-import { useQuery } from "@tanstack/react-query";
-import { fetchTeamsForEvent } from "../api/events";
+import { useQuery, useQueryClient } from "@tanstack/react-query";
+import { loadEventDashboard } from "../api/dashboard";
 import { fetchMatchVideo } from "../api/matches";
 import type { TeamEvent } from "../types";
 
@@ -67,10 +67,13 @@ export default function EventPage() {
   const [sortAsc, setSortAsc] = useState(false);
 
   const year = yearFromEventKey(eventKey ?? "");
+  const queryClient = useQueryClient();
 
+  // Teams, alliances and complements arrive in one streamed request; the
+  // latter two prefill the Predictions and Complement pages.
   const { data: teams, isLoading, error } = useQuery({
     queryKey: ["teams", eventKey],
-    queryFn: () => fetchTeamsForEvent(eventKey!),
+    queryFn: () => loadEventDashboard(queryClient, eventKey!),
     enabled: !!eventKey,
   });
 
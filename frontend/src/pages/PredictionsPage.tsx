@@ -1,7 +1,7 @@
 import { useState } from "react";
 import { useParams, Link } from "react-router-dom";
 import { useQuery } from "@tanstack/react-query";
-import { predictAlliances } from "../api/predictions";
+import { DEFAULT_WEIGHTS, predictAlliances } from "../api/predictions";
 import type { AllianceWeights, PredictedAlliance } from "../types";
 
 const ALLIANCE_COLORS = [
@@ -17,13 +17,7 @@ const ALLIANCE_COLORS = [
 
 export default function PredictionsPage() {
   const { eventKey } = useParams<{ eventKey: string }>();
-  const [weights, setWeights] = useState<AllianceWeights>({
-    auto: 1.0,
-    teleop: 1.0,
-    endgame: 1.0,
-    consistency: 0.5,
-    synergy: 0.3,
-  });
+  const [weights, setWeights] = useState<AllianceWeights>(DEFAULT_WEIGHTS);
 
   const { data, isLoading, error, refetch } = useQuery({
     queryKey: ["predictions", eventKey, weights],
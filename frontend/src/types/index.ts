@@ -26,6 +26,7 @@ export interface TeamEvent {
   endgame_epa: number | null;
   rp_1_epa: number | null;
   rp_2_epa: number | null;
+  consistency: number | null;
 }
 
 export interface PredictedAlliance {
@@ -68,6 +69,9 @@ export interface DraftState {
   available_teams: TeamEvent[];
   pick_history: DraftPick[];
   is_complete: boolean;
+  parent_session_id: string | null;
+  can_undo: boolean;
+  can_redo: boolean;
 }
 
 export interface ComplementCandidate {
@@ -83,3 +87,24 @@ export interface ComplementResponse {
   target_team: TeamEvent;
   complements: ComplementCandidate[];
 }
+
+export type DashboardSectionName =
+  | "teams"
+  | "alliances"
+  | "complements"
+  | "complement";
+
+export interface DashboardRequest {
+  sections: DashboardSectionName[];
+  team_key?: string;
+  weights?: AllianceWeights;
+  alliance_size?: number;
+  top_n?: number;
+}
+
+export type DashboardSection =
+  | { section: "teams"; data: TeamEvent[] }
+  | { section: "alliances"; data: OptimalAlliancesResponse }
+  | { section: "complements"; data: ComplementResponse[] }
+  | { section: "complement"; data: ComplementResponse }
+  | { section: DashboardSectionName; error: string };